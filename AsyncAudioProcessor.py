@@ -0,0 +1,353 @@
+import asyncio
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Union, Any, AsyncIterator, Callable
+
+from AudioProcessor import AudioProcessor
+from ChannelSplitter import ChannelSplitter, SplitEngine, RawFormat, OutputFormat, SilencePolicy
+from JobSpec import JobSpec
+from Progress import ProgressMode
+from RunReport import RunReport, RunResult
+from Utils import Utils
+
+
+class AsyncAudioProcessor(AudioProcessor):
+    """
+    asyncio variant of AudioProcessor.
+    GStreamer, SoX and FFmpeg run as asyncio subprocesses and their output is parsed by
+    coroutines instead of blocking readline() loops, so one event loop can supervise
+    many pipelines at once. Commands, metadata handling and output naming are shared
+    with AudioProcessor; the native splitter runs in a worker thread.
+    """
+
+    async def run(self,
+                  input_file: Path,
+                  output_file: Path,
+                  keep_raw: bool = True,
+                  no_numbers: bool = False,
+                  bits: int = 24,
+                  delay: int = 0,
+                  volume: float = 0,
+                  loudness_target: Optional[float] = None,
+                  duration: float = 0,
+                  channels_filter: List[str] = [],
+                  engine: str = SplitEngine.NATIVE,
+                  audio_info: Optional[Dict[str, Union[str, int, float, None]]] = None,
+                  stage_gates: Optional[Dict[str, Any]] = None,
+                  progress: Optional[Callable[[str, float, Optional[float]], None]] = None,
+                  split_jobs: int = 1,
+                  decode_segments: int = 1,
+                  output_format: str = OutputFormat.WAV,
+                  silent_channels: str = SilencePolicy.KEEP,
+                  silence_threshold: float = SilencePolicy.DEFAULT_THRESHOLD,
+                  progress_mode: str = ProgressMode.AUTO
+                  ) -> int:
+        """
+        Coroutine version of AudioProcessor.run, same arguments and RunResult.
+        Stage gates, if given, must be asyncio primitives (e.g. asyncio.Semaphore).
+        Child resource usage is not reported, asyncio reaps the children itself.
+        """
+        params = locals().copy()
+        params.pop("self")
+        runner = self._AsyncRunner(self, **params)
+        code = await runner.run()
+        runner.report.save()
+        return RunResult(code, runner.report)
+
+    async def run_job(self, job: JobSpec, **kwargs) -> int:
+        """Coroutine version of AudioProcessor.run_job."""
+        return await super().run_job(job, **kwargs)
+
+    async def run_all(self, jobs: List[Union[JobSpec, Dict[str, Any]]], decode_jobs: int = 1,
+                      encode_jobs: int = 1) -> List[int]:
+        """
+        Run many jobs (JobSpecs or dicts of run() arguments) concurrently on the current event loop,
+        with at most decode_jobs decodes and encode_jobs split stages at a time.
+        Returns:
+            List[int]: Return code of every job, in order
+        """
+        gates = {"decode": asyncio.Semaphore(decode_jobs), "encode": asyncio.Semaphore(encode_jobs)}
+        return list(await asyncio.gather(*(
+            self.run_job(job, stage_gates=gates) if isinstance(job, JobSpec)
+            else self.run(**{**job, "stage_gates": gates})
+            for job in jobs)))
+
+    # ---------------------------
+    # Private Processor
+    # ---------------------------
+    class _AsyncRunner(AudioProcessor._Runner):
+        LINE_SPLIT = re.compile(r"[\r\n]")
+
+        async def run(self) -> int:
+            if not self.input_file.exists() and not self.temp_raw_file.exists():
+                Utils.Console.cprint(f'\nFile not found:\n {self.input_file}', 'red')
+                return 1
+            if self.output_format == OutputFormat.FLAC and RawFormat.from_bits(self.bits) == RawFormat.F32LE:
+                Utils.Console.cprint('\nFLAC output supports 16 and 24 bits only.', 'red')
+                return 1
+
+            # probing may spawn eac3to / mediainfo and the tool registry may spawn gst-inspect
+            with self.report.stage("probe"):
+                await asyncio.to_thread(self.prepare_audio_info)
+            if self.parent.pcm_cache is not None:
+                with self.report.stage("cache_restore"):
+                    await asyncio.to_thread(self._restore_cached_raw)
+            if not self.temp_raw_file.exists() and (missing := await asyncio.to_thread(
+                    self._missing_gstreamer_elements)):
+                Utils.Console.cprint(f"\nGStreamer elements not found: {', '.join(missing)}", 'red')
+                return 1
+
+            if self._can_stream():
+                async with self._stage_gate("decode"), self._stage_gate("encode"):
+                    with self.report.stage("stream", engine=self.engine) as stage:
+                        code = await self.run_streaming()
+                        stage.update(bytes_in=RunReport.size(self.input_file),
+                                     bytes_out=RunReport.size(self._output_files), audio_seconds=self._seconds_split)
+            else:
+                async with self._stage_gate("decode"):
+                    with self.report.stage("decode") as stage:
+                        code = await self.run_gstreamer()
+                        stage.update(bytes_in=RunReport.size(self.input_file),
+                                     bytes_out=RunReport.size(self.temp_raw_file),
+                                     audio_seconds=self.get_audio_info("duration"))
+                if code == 0 and self.loudness_target is not None:
+                    with self.report.stage("loudness"):
+                        await asyncio.to_thread(self._ensure_loudness)
+                if code == 0 and self._cache_key is not None:
+                    with self.report.stage("cache_store"):
+                        await asyncio.to_thread(self._store_cached_raw)
+                if code == 0:
+                    async with self._stage_gate("encode"):
+                        with self.report.stage("split", engine=self.engine) as stage:
+                            code = await self.run_split()
+                            stage.update(bytes_in=RunReport.size(self.temp_raw_file),
+                                         bytes_out=RunReport.size(self._output_files),
+                                         audio_seconds=self._seconds_split)
+            if code == 0 and self.silent_channels != SilencePolicy.KEEP:
+                self._write_channel_manifest()
+            if code == 0 and not self.keep_raw:
+                with self.report.stage("cleanup"):
+                    print(f'\nRemoving raw file\n')
+                    Utils.IO.delete_files([self.temp_raw_file, self.temp_raw_info_file])
+            return code
+
+        # ------------------ GStreamer Processor ------------------
+        async def run_gstreamer(self) -> int:
+            """Run GStreamer TrueHD/EAC3 → PCM into temp_raw_file, progress sampled from its growing size."""
+            print("\nGStreamer started...\n")
+            total_duration = self.get_audio_info("duration")
+
+            # verifying / resuming an existing .raw reads it in full, keep that off the event loop
+            if (code := await asyncio.to_thread(self._reuse_raw)) is not None:
+                if code == 0:
+                    self._report_progress(start_time=None, percent_done=100, seconds_passed=total_duration,
+                                          total_duration=total_duration, stage="decode")
+                    sys.stdout.write("\n")
+                    print("\nGStreamer finished successfully.")
+                return code
+            # the parts are pumped (and metered) by threads, only the coordination moves off the event loop
+            if (code := await asyncio.to_thread(self.run_gstreamer_segmented)) is not None:
+                return code
+
+            gst_cmd = self._build_gstreamer_command()
+            self._start_raw()
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *gst_cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT)
+            except OSError as e:
+                Utils.Console.cprint(f"GStreamer failed to start: {e}", 'red')
+                return 1
+
+            start_time = time.time()
+            # the log only holds state changes and errors, it is closed when GStreamer exits
+            stderr_task = asyncio.create_task(self._collect(proc.stdout))
+            try:
+                while not stderr_task.done():
+                    await asyncio.wait({stderr_task}, timeout=self.parent.PROGRESS_INTERVAL)
+                    self._report_decoded(start_time, RunReport.size(self.temp_raw_file) or 0, total_duration)
+                stderr = stderr_task.result()
+                await proc.wait()
+            except asyncio.CancelledError:
+                # the partial .raw is kept, marked incomplete, and resumed by the next run
+                stderr_task.cancel()
+                await self._terminate(proc)
+                raise
+
+            if proc.returncode == 0:
+                self._finish_progress("decode")
+            sys.stdout.write("\n")
+            if proc.returncode == 0:
+                self.audio_info["duration"] = self._pcm_seconds(RunReport.size(self.temp_raw_file) or 0)
+                await asyncio.to_thread(self._finish_raw)
+                print("\nGStreamer finished successfully.")
+            else:
+                Utils.IO.delete_files([self.temp_raw_file, self.temp_raw_info_file])
+                Utils.Console.cprint(f"GStreamer failed with code {proc.returncode}", 'red')
+                Utils.Console.cprint(''.join(stderr), 'darkgray')
+            return proc.returncode
+
+        # ------------------ Streaming GStreamer → split ------------------
+        async def run_streaming(self) -> int:
+            """Run GStreamer into an OS pipe read by the split engine, no .raw intermediate."""
+            print("\nGStreamer streaming started...")
+            read_fd, write_fd = os.pipe()
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *self._build_gstreamer_command(to_pipe=True),
+                    stdout=write_fd,
+                    stderr=asyncio.subprocess.PIPE)
+            except OSError as e:
+                os.close(read_fd)
+                Utils.Console.cprint(f"GStreamer failed to start: {e}", 'red')
+                return 1
+            finally:
+                os.close(write_fd)  # the decoder holds its own copy, EOF reaches the reader when it exits
+
+            stderr_task = asyncio.create_task(self._collect(proc.stderr))
+            try:
+                code = await self.run_split(source_fd=read_fd)
+            except asyncio.CancelledError:
+                Utils.IO.delete_files(self._output_files)
+                await self._terminate(proc)
+                raise
+
+            await proc.wait()
+            stderr = await stderr_task
+            if proc.returncode != 0 and not (code == 0 and self._is_split_complete()):
+                Utils.Console.cprint(f"GStreamer failed with code {proc.returncode}", 'red')
+                Utils.Console.cprint(''.join(stderr), 'darkgray')
+                Utils.IO.delete_files(self._output_files)
+                code = proc.returncode
+            return code
+
+        # ------------------ Channel split ------------------
+        async def run_split(self, source_fd: Optional[int] = None) -> int:
+            """
+            Split temp_raw_file, or the decoder pipe given as source_fd (closed here), with the selected engine.
+            Channel groups of a .raw file run in worker processes / pipelines driven from a thread.
+            """
+            if (code := await asyncio.to_thread(self._scan_silence)) is not None:
+                if source_fd is not None:
+                    os.close(source_fd)
+                return code
+            groups = self._split_groups() if source_fd is None else []
+            if self.engine == SplitEngine.NATIVE:
+                if ChannelSplitter.is_available():
+                    if len(groups) > 1:
+                        return await asyncio.to_thread(self.run_native_split_parallel, groups)
+                    if source_fd is None:
+                        return await asyncio.to_thread(self.run_native_split)
+
+                    def _split_pipe() -> int:
+                        # the worker thread owns the pipe, it must not be closed under a blocked read
+                        with open(source_fd, "rb", buffering=0) as stream:
+                            return self.run_native_split(stream)
+                    return await asyncio.to_thread(_split_pipe)
+                Utils.Console.cprint("Warning. NumPy is not installed, falling back to SoX → FFmpeg.", "blue")
+            if len(groups) > 1:
+                return await asyncio.to_thread(self.run_sox_ffmpeg_parallel, groups)
+            return await self.run_sox_ffmpeg(source_fd=source_fd)
+
+        async def run_sox_ffmpeg(self, source_fd: Optional[int] = None) -> int:
+            """SoX → FFmpeg connected by an OS pipe (FFmpeg alone if SoX is not needed), progress from FFmpeg '-progress'."""
+            sox_cmd, ffmpeg_cmd = self._build_split_commands(self.channels_filter, piped=source_fd is not None)
+            if not ffmpeg_cmd:
+                if source_fd is not None:
+                    os.close(source_fd)
+                return 1
+
+            print("\nFFmpeg started...\n")
+            # without SoX, FFmpeg reads the decoder pipe (or temp_raw_file) itself
+            read_fd, write_fd = os.pipe() if sox_cmd else (source_fd, None)
+            source_fd = source_fd if sox_cmd else None
+            sox_proc = ffmpeg_proc = None
+            try:
+                if sox_cmd:
+                    sox_proc = await asyncio.create_subprocess_exec(
+                        *sox_cmd, stdin=source_fd, stdout=write_fd, stderr=asyncio.subprocess.PIPE)
+                ffmpeg_proc = await asyncio.create_subprocess_exec(
+                    *ffmpeg_cmd, stdin=read_fd if read_fd is not None else asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            except OSError as e:
+                await self._terminate(sox_proc)
+                Utils.Console.cprint(f"FFmpeg failed to start: {e}", 'red')
+                return 1
+            finally:
+                for fd in (read_fd, write_fd, source_fd):
+                    if fd is not None:
+                        os.close(fd)
+
+            sox_task = asyncio.create_task(self._collect(sox_proc.stderr)) if sox_proc else None
+            stderr_task = asyncio.create_task(self._collect(ffmpeg_proc.stderr))
+            start_time = time.time()
+
+            def _progress(progress: AudioProcessor._FFmpegProgress) -> None:
+                self._seconds_split = progress.seconds
+                if self.duration:
+                    self._report_progress(start_time=start_time,
+                                          percent_done=min(progress.seconds / self.duration * 100, 100),
+                                          seconds_passed=progress.seconds, total_duration=self.duration,
+                                          stage="split")
+
+            progress = AudioProcessor._FFmpegProgress(on_update=_progress)
+            try:
+                async for line in self._iter_lines(ffmpeg_proc.stdout):
+                    progress.feed(line)
+                stderr = await stderr_task
+
+                await ffmpeg_proc.wait()
+                if sox_proc:
+                    await sox_proc.wait()
+                    await sox_task
+                if ffmpeg_proc.returncode == 0:
+                    self._finish_progress("split")
+                sys.stdout.write("\n")
+                sys.stdout.flush()
+            except asyncio.CancelledError:
+                Utils.IO.delete_files(self._output_files)
+                await self._terminate(ffmpeg_proc, sox_proc)
+                raise
+            self.report.note(ffmpeg_speed=progress.speed, ffmpeg_total_size=progress.total_size)
+
+            if ffmpeg_proc.returncode == 0:
+                print("\nFFmpeg finished successfully.")
+            else:
+                Utils.Console.cprint(f'FFmpeg failed with code {ffmpeg_proc.returncode}.', 'red')
+                Utils.Console.cprint(''.join(stderr), 'darkgray')
+                Utils.IO.delete_files(self._output_files)
+            return ffmpeg_proc.returncode
+
+        # ------------------ Helpers ------------------
+        @classmethod
+        async def _iter_lines(cls, stream: asyncio.StreamReader) -> AsyncIterator[str]:
+            """
+            Yield decoded lines split on both '\\n' and '\\r', as status lines rewritten in place
+            end with carriage returns.
+            """
+            pending = ""
+            while chunk := await stream.read(1 << 16):
+                *lines, pending = cls.LINE_SPLIT.split(pending + chunk.decode(errors="replace"))
+                for line in lines:
+                    yield line
+            if pending:
+                yield pending
+
+        @classmethod
+        async def _collect(cls, stream: asyncio.StreamReader) -> List[str]:
+            """Drain a stream so the child never blocks on a full pipe, keep its lines for error output."""
+            return [line + "\n" async for line in cls._iter_lines(stream) if line]
+
+        @staticmethod
+        async def _terminate(*procs: Union[asyncio.subprocess.Process, None]) -> None:
+            for proc in procs:
+                if proc is not None and proc.returncode is None:
+                    try:
+                        proc.terminate()
+                        await proc.wait()
+                    except (ProcessLookupError, OSError):
+                        pass
@@ -4,6 +4,9 @@ import subprocess
 from pathlib import Path
 from typing import Optional, Dict, Union, List
 
+from BitstreamParser import BitstreamParser
+from ProbeCache import ProbeCache
+from ToolRegistry import ToolRegistry
 from Utils import Utils
 
 
@@ -12,6 +15,9 @@ class AudioFormat:
     EAC3 = "EAC3"
     TRUEHD = "THD"
     DTS = "DTS"
+    DTSHD_MA = "DTSHD_MA"
+    DTSHD_HRA = "DTSHD_HRA"
+    DTS_EXPRESS = "DTS_EXPRESS"
     AAC = "AAC"
     WAV = "WAV"
     W64 = "W64"
@@ -21,18 +27,26 @@ class AudioInfo:
     """
     Parses audio files using flexible parser configuration.
     Each property is normalized via setters.
+    Results can be kept in a persistent ProbeCache, so unchanged files are not re-probed.
     """
 
     class Parser:
         MEDIAINFO = "mediainfo"
         EAC3TO = "eac3to"
+        AC3 = "ac3"  # native AC-3 / E-AC-3 header parser
+        TRUEHD = "truehd"  # native TrueHD major sync parser
+        DTS = "dts"  # native DTS core / DTS-HD extension substream parser
+
+        NATIVE = (AC3, TRUEHD, DTS)  # parsers without external binary
 
     def __init__(self,
                  parsers: Dict[str, Union[str, Path]],
-                 parser_priority: Dict[str, List[str]]) -> None:
+                 parser_priority: Dict[str, List[str]],
+                 cache: Optional[ProbeCache] = None) -> None:
         self.parsers = {k: Utils.IO.absolute_self(v) for k, v in parsers.items()}
         self.parser_priority = parser_priority
         self.parser_launch: Optional[Path] = None
+        self.cache: Optional[ProbeCache] = cache
 
         # internal normalized fields
         self._format: Optional[str] = None
@@ -41,6 +55,8 @@ class AudioInfo:
         self._bitrate: Optional[int] = None
         self._freq: Optional[int] = None
         self._dialnorm: Optional[int] = None
+        self._atmos: Optional[bool] = None
+        self._core: Optional[str] = None
         self._parser_used: Optional[str] = None
 
         self._error: Optional[str] = None
@@ -106,6 +122,23 @@ class AudioInfo:
     def dialnorm(self, value: Optional[Union[str, int]]) -> None:
         self._dialnorm = Utils.Format.to_int(value)
 
+    @property
+    def atmos(self) -> Optional[bool]:
+        return self._atmos
+
+    @atmos.setter
+    def atmos(self, value: Optional[Union[str, int, bool]]) -> None:
+        self._atmos = value if value is None or isinstance(value, bool) else bool(Utils.Format.to_int(value))
+
+    @property
+    def core(self) -> Optional[str]:
+        """Core substream description of DTS-HD streams, e.g. 'DTS, 5.1 channels, 1509kbps, 48kHz'."""
+        return self._core
+
+    @core.setter
+    def core(self, value: Optional[str]) -> None:
+        self._core = Utils.Format.to_str(value, True)
+
     @property
     def parser_used(self) -> Optional[str]:
         return self._parser_used
@@ -121,22 +154,37 @@ class AudioInfo:
         input_file = Path(input_file).absolute()
         if not input_file.is_file():
             self.error = FileNotFoundError(f"Input file {input_file} not found")
+        elif self.cache and (cached := self.cache.get(input_file)):
+            self.from_dict(cached)
         else:
             audio_format = self._detect_magic_bytes(input_file)
             if audio_format is None:
                 self.error = RuntimeError(f"No available parser found for format {audio_format}")
             else:
-                parser_name = next(
-                    (p for p in self.parser_priority.get(audio_format, [])
-                     if self.parsers.get(p) and Utils.IO.is_executable_exists(self.parsers[p])),
-                    None
-                )
-                if not parser_name:
-                    self.error = RuntimeError("Unknown source file format")
-                else:
+                # Try available parsers by priority until one recognizes the stream
+                for parser_name in self.parser_priority.get(audio_format, []):
+                    if parser_name not in self.Parser.NATIVE and not (
+                            self.parsers.get(parser_name) and ToolRegistry.exists(self.parsers[parser_name])):
+                        continue
                     self.parser_used = parser_name
-                    self.parser_launch = self.parsers[parser_name]
+                    self.parser_launch = self.parsers.get(parser_name)
                     getattr(self, f"_by_{parser_name}")(input_file)
+                    if self.format:
+                        break
+
+                if not self.parser_used:
+                    self.error = RuntimeError("Unknown source file format")
+                elif not self.format:
+                    self.error = RuntimeError(f"Failed to parse {input_file}")
+                elif self.cache:
+                    self.cache.put(input_file, self.as_dict())
+        return self
+
+    def from_dict(self, data: Dict[str, Optional[Union[str, int, float]]]) -> "AudioInfo":
+        """Load metadata produced by as_dict(), normalized via setters."""
+        for key in self.as_dict():
+            if key in data:
+                setattr(self, key, data[key])
         return self
 
     def as_dict(self) -> Dict[str, Optional[Union[str, int, float]]]:
@@ -148,6 +196,8 @@ class AudioInfo:
             "bitrate": self.bitrate,
             "freq": self.freq,
             "dialnorm": self.dialnorm,
+            "atmos": self.atmos,
+            "core": self.core,
             "parser_used": self.parser_used
         }
 
@@ -177,6 +227,21 @@ class AudioInfo:
         except (subprocess.CalledProcessError, json.JSONDecodeError, KeyboardInterrupt):
             pass
 
+    def _by_ac3(self, input_file: Path) -> None:
+        """Parse AC-3 / E-AC-3 syncinfo and BSI natively, duration by walking frame sizes."""
+        if info := BitstreamParser.AC3.parse(input_file):
+            self.from_dict(info)
+
+    def _by_truehd(self, input_file: Path) -> None:
+        """Parse TrueHD major sync headers natively, duration by counting access units."""
+        if info := BitstreamParser.TrueHD.parse(input_file):
+            self.from_dict(info)
+
+    def _by_dts(self, input_file: Path) -> None:
+        """Parse DTS core and DTS-HD extension substream headers natively, duration by walking frames."""
+        if info := BitstreamParser.DTS.parse(input_file):
+            self.from_dict(info)
+
     def _by_eac3to(self, input_file: Path) -> None:
         """Parse audio info using eac3to."""
         try:
@@ -187,10 +252,6 @@ class AudioInfo:
                 check=True
             ).stdout
 
-            # TODO: parse DTS with core
-            # DTS Master Audio, 5.0 channels, 24 bits, 48kHz
-            # (core: DTS, 5.0 channels, 1509kbps, 48kHz)
-
             pattern = (
                 r"^(?P<format>[^,]+?),\s*"
                 r"(?P<channels>[\d\.]+)\s*channels\b"
@@ -202,11 +263,16 @@ class AudioInfo:
 
             if match := re.search(pattern, output, flags=re.I | re.S):
                 self.format = match.group("format")
+                self.atmos = "Atmos" in match.group("format") if self.format == AudioFormat.TRUEHD else None
                 self.channels = match.group("channels")
                 self.duration = Utils.Format.to_seconds(match.group("duration"))
                 self.bitrate = match.group("bitrate")
                 self.freq = match.group("freq")
                 self.dialnorm = match.group("dialnorm")
+            # DTS Master Audio, 5.0 channels, 24 bits, 48kHz
+            # (core: DTS, 5.0 channels, 1509kbps, 48kHz)
+            if match := re.search(r"\(core:\s*(?P<core>[^)]+)\)", output, flags=re.I):
+                self.core = match.group("core")
 
         except (subprocess.CalledProcessError, ValueError, KeyboardInterrupt):
             pass
@@ -222,9 +288,10 @@ class AudioInfo:
             header = file.open("rb").read(32)
             if header.startswith(b"\x0B\x77"):
                 result = AudioFormat.AC3
-            elif header.startswith(b"\xF8\x72\x6F\xBA"):
+            elif header[4:8] == b"\xF8\x72\x6F\xBA" or header.startswith(b"\xF8\x72\x6F\xBA"):
+                # the major sync follows the 4-byte access unit header
                 result = AudioFormat.TRUEHD
-            elif header.startswith(b"\x7F\xFE\x80\x01"):
+            elif header.startswith((b"\x7F\xFE\x80\x01", b"\x64\x58\x20\x25")):  # core / ExSS without core
                 result = AudioFormat.DTS
             elif header.startswith((b"\xFF\xF1", b"\xFF\xF9")):
                 result = AudioFormat.AAC
@@ -249,11 +316,20 @@ class AudioInfo:
             # eac3to
             "AC3": AudioFormat.AC3,
             "E-AC3": AudioFormat.EAC3,
+            "TrueHD": AudioFormat.TRUEHD,
             "TrueHD (Atmos)": AudioFormat.TRUEHD,
             "WAV": AudioFormat.WAV,
+            "DTS": AudioFormat.DTS,
+            "DTS-ES": AudioFormat.DTS,
+            "DTS Master Audio": AudioFormat.DTSHD_MA,
+            "DTS Hi-Res": AudioFormat.DTSHD_HRA,
+            "DTS Express": AudioFormat.DTS_EXPRESS,
             # common
             "AAC": AudioFormat.AAC,
             AudioFormat.EAC3: AudioFormat.EAC3,
-            AudioFormat.TRUEHD: AudioFormat.TRUEHD
+            AudioFormat.TRUEHD: AudioFormat.TRUEHD,
+            AudioFormat.DTSHD_MA: AudioFormat.DTSHD_MA,
+            AudioFormat.DTSHD_HRA: AudioFormat.DTSHD_HRA,
+            AudioFormat.DTS_EXPRESS: AudioFormat.DTS_EXPRESS
         }.get(fmt, default)
 
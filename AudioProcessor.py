@@ -1,18 +1,34 @@
-import re
+import contextlib
+import json
+import math
+import os
 import subprocess
 import sys
+import threading
 import time
 from pathlib import Path
-from typing import Optional, List, Dict, Union, Any
+from typing import Optional, List, Dict, Union, Any, Tuple, Callable, BinaryIO
 
 from AudioInfo import AudioInfo, AudioFormat
+from BitstreamParser import BitstreamParser
+from ChannelSplitter import ChannelSplitter, SplitEngine, RawFormat, OutputFormat, SilencePolicy
+from JobSpec import JobSpec
+from Loudness import LoudnessMeter
+from PcmCache import PcmCache
+from Progress import ProgressMode, ProgressRenderer
+from ProbeCache import ProbeCache
+from RunReport import RunReport, RunResult
+from ToolRegistry import ToolRegistry
 from Utils import Utils
 
+multiprocessing = Utils.Import.lazy("multiprocessing")  # only for parallel channel groups
+
 
 class AudioProcessor:
     """
     AudioProcessor handles TrueHD/AC3 → PCM decoding via GStreamer,
-    channel selection, and final encoding with SoX + FFmpeg.
+    channel selection, and final encoding with the native NumPy splitter
+    or SoX + FFmpeg.
     """
 
     def __init__(self,
@@ -21,7 +37,10 @@ class AudioProcessor:
                  ffmpeg_launch: Path,
                  eac3to_launch: Path,
                  mediainfo_launch: Path,
-                 channels: Dict
+                 channels: Dict,
+                 probe_cache: Optional[Path] = None,
+                 pcm_cache: Optional[Path] = None,
+                 pcm_cache_size: int = PcmCache.DEFAULT_MAX_BYTES
                  ):
 
         """
@@ -33,19 +52,44 @@ class AudioProcessor:
             eac3to_launch: Path to FFmpeg executable
             mediainfo_launch: Path to FFmpeg executable
             channels: Dict with 'id' and 'names'
+            probe_cache: SQLite file of the persistent metadata cache, None disables caching
+            pcm_cache: Directory of the shared decoded-PCM cache, None disables caching
+            pcm_cache_size: Byte budget of the decoded-PCM cache
         """
         self.THD = AudioFormat.TRUEHD
         self.AC3 = AudioFormat.AC3
 
         self.GST_DELAY_THD = 32  # GStreamer adds 32 samples at start at True HD decoding
         self.GST_DELAY_AC3 = -224  # GStreamer removes 224 samples at start at E-AC3 decoding
-
+        self.THD_PRESENTATION = 16  # TrueHD presentation decoded by dlbaudiodecbin
+
+        self.RESUME_MARGIN = 2 * 48000  # samples dropped from the end of a partial .raw (possibly torn write)
+        self.RESUME_WARMUP = 48000  # samples decoded and discarded before the resume position
+        self.SEGMENT_MIN = 30 * 48000  # shortest part of a segmented (parallel) decode, in samples
+        self.PROGRESS_INTERVAL = 0.25  # seconds between two decode progress samples of the decoded bytes
+        self.TRUE_PEAK_CEILING = -1.0  # dBTP, EBU R128 maximum a loudness target gain may reach
+
+        self.PARSER_PRIORITY: Dict[str, List[str]] = {
+            AudioFormat.TRUEHD: [AudioInfo.Parser.TRUEHD, AudioInfo.Parser.EAC3TO, AudioInfo.Parser.MEDIAINFO],
+            AudioFormat.AC3: [AudioInfo.Parser.AC3, AudioInfo.Parser.MEDIAINFO, AudioInfo.Parser.EAC3TO],
+            AudioFormat.DTS: [AudioInfo.Parser.DTS, AudioInfo.Parser.EAC3TO, AudioInfo.Parser.MEDIAINFO],
+        }
+
+        # constructor arguments, run_job() only runs jobs built for the same ones
+        self._args: Dict[str, Any] = {
+            "gst_launch": gst_launch, "sox_launch": sox_launch, "ffmpeg_launch": ffmpeg_launch,
+            "eac3to_launch": eac3to_launch, "mediainfo_launch": mediainfo_launch, "channels": channels,
+            "probe_cache": probe_cache, "pcm_cache": pcm_cache, "pcm_cache_size": pcm_cache_size
+        }
         self.gst_launch: Path = gst_launch
         self.sox_launch: Path = sox_launch
         self.ffmpeg_launch: Path = ffmpeg_launch
         self.mediainfo_launch: Path = mediainfo_launch
         self.eac3to_launch: Path = eac3to_launch
 
+        self.probe_cache: Optional[ProbeCache] = ProbeCache(probe_cache) if probe_cache else None
+        self.pcm_cache: Optional[PcmCache] = PcmCache(pcm_cache, pcm_cache_size) if pcm_cache else None
+
         self.channels_config_id: Dict = channels.get('id')
         self.channels_layout: List = channels.get('names')
         self.channels_count: int = len(channels.get('names'))
@@ -53,6 +97,17 @@ class AudioProcessor:
     def get_delay_fix(self, input_format: str) -> int:
         return self.GST_DELAY_THD if input_format == self.THD else self.GST_DELAY_AC3
 
+    def probe(self, input_file: Path) -> Dict[str, Union[str, int, float, None]]:
+        """Parse input file metadata with the configured parsers."""
+        return AudioInfo(
+            parsers={
+                AudioInfo.Parser.MEDIAINFO: self.mediainfo_launch,
+                AudioInfo.Parser.EAC3TO: self.eac3to_launch
+            },
+            parser_priority=self.PARSER_PRIORITY,
+            cache=self.probe_cache
+        ).parse(input_file).as_dict()
+
     def run(self,
             input_file: Path,
             output_file: Path,
@@ -61,15 +116,66 @@ class AudioProcessor:
             bits: int = 24,
             delay: int = 0,
             volume: float = 0,
+            loudness_target: Optional[float] = None,
             duration: float = 0,
-            channels_filter: List[str] = []
+            channels_filter: List[str] = [],
+            engine: str = SplitEngine.NATIVE,
+            audio_info: Optional[Dict[str, Union[str, int, float, None]]] = None,
+            stage_gates: Optional[Dict[str, Any]] = None,
+            progress: Optional[Callable[[str, float, Optional[float]], None]] = None,
+            split_jobs: int = 1,
+            decode_segments: int = 1,
+            output_format: str = OutputFormat.WAV,
+            silent_channels: str = SilencePolicy.KEEP,
+            silence_threshold: float = SilencePolicy.DEFAULT_THRESHOLD,
+            progress_mode: str = ProgressMode.AUTO
             ) -> int:
+        """
+        Decode input_file and write the selected channels next to output_file.
+        Args:
+            volume: Gain in dB, None for the dialnorm gain
+            loudness_target: Integrated loudness (LUFS) to normalize to, overrides volume. Loudness is measured
+                             (BS.1770 / EBU R128) while decoding and recorded in the .txt sidecar for re-runs
+            audio_info: Already probed metadata (e.g. by a batch probe stage), skips parsing
+            stage_gates: Optional {'decode': lock, 'encode': lock} limiting concurrent stages across jobs
+            progress: Optional callback(stage, percent_done, seconds_passed) replacing the console progress bar
+            split_jobs: Channel groups split in parallel from the .raw intermediate (0 = one per CPU core);
+                        1 by default, as library callers usually run several jobs at once
+            decode_segments: Parts of the input decoded by parallel GStreamer processes (1 = serial decode)
+            output_format: OutputFormat of the per-channel files (wav, flac, w64 or rf64)
+            silent_channels: SilencePolicy (keep, mark or skip) of the selected channels whose peak never exceeds
+                             silence_threshold (dBFS); mark and skip list them in <output>.channels.json
+            progress_mode: ProgressMode of the console progress when no callback is given (auto, bar, plain,
+                           json or none); auto draws the bar on a terminal only
+        Returns:
+            RunResult: Return code (an int) with the per-stage RunReport as .report,
+            which is also saved next to the outputs as <output>.report.json
+        """
 
         params = locals().copy()
         params.pop("self")
         # Utils.Console.cls()
-        code = self._Runner(self, **params).run()
-        return code
+        runner = self._Runner(self, **params)
+        code = runner.run()
+        runner.report.save()
+        return RunResult(code, runner.report)
+
+    @classmethod
+    def from_job(cls, job: JobSpec) -> "AudioProcessor":
+        """Processor with the tool paths, channel layout and caches of a job."""
+        return cls(**job.processor_args())
+
+    def run_job(self, job: JobSpec, **kwargs) -> int:
+        """
+        Run a JobSpec with this processor (see from_job), e.g. one of many queued jobs sharing its caches.
+        Args:
+            kwargs: Further run() arguments not part of the job (stage_gates, progress, audio_info, duration)
+        Raises:
+            ValueError: The job has other tools, channel layout or caches than the processor
+        """
+        if job.processor_key() != JobSpec.args_key(self._args):
+            raise ValueError(f"{job} needs a processor with its own tools, channel layout and caches (see from_job)")
+        return self.run(**job.run_args(), **kwargs)
 
     # ---------------------------
     # Private Processor
@@ -88,11 +194,26 @@ class AudioProcessor:
             self.bits: int = kwargs.get('bits')
 
             self.channels_filter: List[str] = kwargs.get('channels_filter')
+            self.engine: str = kwargs.get('engine') or SplitEngine.NATIVE
+            self.split_jobs: int = kwargs.get('split_jobs') or os.cpu_count() or 1
+            self.decode_segments: int = kwargs.get('decode_segments') or 1
+            self.output_format: str = kwargs.get('output_format') or OutputFormat.WAV
+            self.silent_channels: str = kwargs.get('silent_channels') or SilencePolicy.KEEP
+            self.silence_threshold: float = Utils.Format.to_float(kwargs.get('silence_threshold'))
+            if self.silence_threshold is None:
+                self.silence_threshold = SilencePolicy.DEFAULT_THRESHOLD
+            self.stage_gates: Dict[str, Any] = kwargs.get('stage_gates') or {}
+            self.progress: Optional[Callable[[str, float, Optional[float]], None]] = kwargs.get('progress')
+            self.renderer: Optional[ProgressRenderer] = ProgressRenderer(
+                kwargs.get('progress_mode') or ProgressMode.AUTO, label=self.input_file.name
+            ) if self.progress is None else None
+            self._probed_audio_info: Optional[Dict[str, Union[str, int, float, None]]] = kwargs.get('audio_info')
 
             # Set/get by methods
             self._duration: Union[int, float] = Utils.Format.to_float(kwargs.get('duration', 0))
             self._delay: int = Utils.Format.to_int(kwargs.get('delay', 0))
             self._volume: float = Utils.Format.to_float(kwargs.get('volume'))
+            self.loudness_target: Optional[float] = Utils.Format.to_float(kwargs.get('loudness_target'))
 
             self.audio_info: Optional[Dict[str, Union[str, int, None]]] = {
                 "format": None,
@@ -100,9 +221,26 @@ class AudioProcessor:
                 "channels": None,
                 "freq": None,
                 "dialnorm": None,
-                "parser_used": None
+                "atmos": None,
+                "parser_used": None,
+                "raw_format": None,
+                # completion marker of temp_raw_file, written once the decode has finished
+                "raw_complete": None,
+                "raw_samples": None,
+                "raw_bytes": None,
+                "raw_crc32": None,
+                # measured while decoding, belongs to temp_raw_file like the completion marker
+                "loudness_integrated": None,
+                "loudness_true_peak": None,
+                "loudness_channels": None
             }
             self._output_files: Optional[List[Path]] = None
+            self._channel_peaks: Dict[str, float] = {}  # sample peak of the selected channels, by name
+            self._seconds_split: Optional[float] = None
+            # stage -> last reported (start_time, percent_done, seconds_passed, total_duration)
+            self._last_progress: Dict[str, Tuple[Optional[float], float, Optional[float], Optional[float]]] = {}
+            self._cache_key: Optional[str] = None
+            self.report: RunReport = RunReport(self.input_file, self.output_file)
 
         @property
         def delay(self) -> int:
@@ -117,7 +255,13 @@ class AudioProcessor:
         def input_format(self) -> Optional[str]:
             fmt = self.get_audio_info("format")
             fmt = fmt.upper() if isinstance(fmt, str) else None
-            return self.parent.THD if fmt == AudioFormat.TRUEHD else self.parent.AC3 if fmt == AudioFormat.AC3 else None
+            return self.parent.THD if fmt == AudioFormat.TRUEHD \
+                else self.parent.AC3 if fmt in (AudioFormat.AC3, AudioFormat.EAC3) else None
+
+        @property
+        def raw_format(self) -> str:
+            """Sample format of the .raw intermediate as recorded at decode time (F32LE before it was recorded)."""
+            return self.get_audio_info("raw_format") or RawFormat.F32LE
 
         @property
         def duration(self) -> Optional[Union[int, float]]:
@@ -136,7 +280,9 @@ class AudioProcessor:
         def volume(self) -> Union[int, float]:
             dialnorm = self.get_audio_info("dialnorm")
             volume = getattr(self, "_volume", 0)
-            if volume is None:
+            if (gain := self.loudness_gain) is not None:
+                volume = gain
+            elif volume is None:
                 if dialnorm is None:
                     volume = 0
                 else:
@@ -148,24 +294,92 @@ class AudioProcessor:
             """ fix GST initial THD/E-AC3 delay """
             self._volume = key
 
+        @property
+        def loudness_gain(self) -> Optional[float]:
+            """Gain (dB) reaching loudness_target, limited to TRUE_PEAK_CEILING; None without a measurement."""
+            integrated = self.get_audio_info("loudness_integrated")
+            if self.loudness_target is None or integrated is None:
+                return None
+            gain = self.loudness_target - integrated
+            if (true_peak := self.get_audio_info("loudness_true_peak")) is not None:
+                gain = min(gain, self.parent.TRUE_PEAK_CEILING - true_peak)
+            return round(gain, 2)
+
         def run(self) -> int:
-            if not self.input_file.exists() and not self.temp_raw_file.exists:
+            if not self.input_file.exists() and not self.temp_raw_file.exists():
                 Utils.Console.cprint(f'\nFile not found:\n {self.input_file}', 'red')
                 return 1
+            if self.output_format == OutputFormat.FLAC and RawFormat.from_bits(self.bits) == RawFormat.F32LE:
+                Utils.Console.cprint('\nFLAC output supports 16 and 24 bits only.', 'red')
+                return 1
 
-            self.prepare_audio_info()
+            with self.report.stage("probe"):
+                self.prepare_audio_info()
+            if self.parent.pcm_cache is not None:
+                with self.report.stage("cache_restore"):
+                    self._restore_cached_raw()
 
-            # Run GStreamer first
-            code = self.run_gstreamer()
+            if not self.temp_raw_file.exists() and (missing := self._missing_gstreamer_elements()):
+                Utils.Console.cprint(f"\nGStreamer elements not found: {', '.join(missing)}", 'red')
+                return 1
 
-            if code == 0:
-                # Run SoX → FFmpeg only if GStreamer succeeded
-                code = self.run_sox_ffmpeg()
+            if self._can_stream():
+                # Decode and split concurrently, no intermediate .raw on disk
+                with self._stage_gate("decode"), self._stage_gate("encode"), \
+                        self.report.stage("stream", engine=self.engine) as stage:
+                    code = self.run_streaming()
+                    stage.update(bytes_in=RunReport.size(self.input_file), bytes_out=RunReport.size(self._output_files),
+                                 audio_seconds=self._seconds_split)
+            else:
+                # Run GStreamer first
+                with self._stage_gate("decode"), self.report.stage("decode") as stage:
+                    code = self.run_gstreamer()
+                    stage.update(bytes_in=RunReport.size(self.input_file), bytes_out=RunReport.size(self.temp_raw_file),
+                                 audio_seconds=self.get_audio_info("duration"))
+                if code == 0 and self.loudness_target is not None:
+                    with self.report.stage("loudness"):
+                        self._ensure_loudness()
+                if code == 0 and self._cache_key is not None:
+                    with self.report.stage("cache_store"):
+                        self._store_cached_raw()
+
+                if code == 0:
+                    # Split channels only if GStreamer succeeded
+                    with self._stage_gate("encode"), self.report.stage("split", engine=self.engine) as stage:
+                        code = self.run_split()
+                        stage.update(bytes_in=RunReport.size(self.temp_raw_file),
+                                     bytes_out=RunReport.size(self._output_files), audio_seconds=self._seconds_split)
+            if code == 0 and self.silent_channels != SilencePolicy.KEEP:
+                self._write_channel_manifest()
             if code == 0 and not self.keep_raw:
-                print(f'\nRemoving raw file\n')
-                Utils.IO.delete_files([self.temp_raw_file, self.temp_raw_info_file])
+                with self.report.stage("cleanup"):
+                    print(f'\nRemoving raw file\n')
+                    Utils.IO.delete_files([self.temp_raw_file, self.temp_raw_info_file])
             return code
 
+        def _can_stream(self) -> bool:
+            """
+            True if decode and split can run concurrently without a .raw intermediate.
+            Loudness targets and segmented decodes need the .raw, and so does silence detection
+            when the SoX → FFmpeg engine splits (only the native splitter scans while writing).
+            """
+            return not self.keep_raw and not self.temp_raw_file.exists() and self._cache_key is None \
+                and self.decode_segments < 2 and self.loudness_target is None \
+                and (self.silent_channels == SilencePolicy.KEEP
+                     or self.engine == SplitEngine.NATIVE and ChannelSplitter.is_available())
+
+        def _stage_gate(self, stage: str) -> Any:
+            """Concurrency gate of a stage shared between jobs (no-op for single runs)."""
+            return self.stage_gates.get(stage) or contextlib.nullcontext()
+
+        def _missing_gstreamer_elements(self) -> List[str]:
+            """Decoder elements that the tool registry knows to be missing (unknown counts as present)."""
+            elements = ["dlbtruehdparse" if self.input_format == self.parent.THD else "dlbac3parse", "dlbaudiodecbin"]
+            if RawFormat.from_bits(self.bits) != RawFormat.F32LE:
+                elements.append("audioconvert")
+            return [element for element in elements
+                    if ToolRegistry.has(self.parent.gst_launch, "elements", element) is False]
+
         # ------------------ GStreamer Processor ------------------
         def run_gstreamer(self) -> int:
             """
@@ -178,21 +392,18 @@ class AudioProcessor:
 
             total_duration = self.get_audio_info("duration")
 
-            if self.temp_raw_file.exists():
-                Utils.update_progress_bar(start_time=time.time(), percent_done=100,
-                                          seconds_passed=total_duration, total_duration=total_duration)
-                sys.stdout.write("\n")
-                print("\nGStreamer finished successfully.")
-                return 0
+            if (code := self._reuse_raw()) is not None:
+                if code == 0:
+                    self._report_progress(start_time=None, percent_done=100, seconds_passed=total_duration,
+                                          total_duration=total_duration, stage="decode")
+                    sys.stdout.write("\n")
+                    print("\nGStreamer finished successfully.")
+                return code
+            if (code := self.run_gstreamer_segmented()) is not None:
+                return code
 
-            if self.input_format == self.parent.THD:
-                gst_cmd = self._build_gstreamer_thd_command()
-            elif self.input_format == self.parent.AC3:
-                gst_cmd = self._build_gstreamer_ac3_command()
-            else:
-                raise ValueError(Utils.Format.colorize(f"Unsupported input_format: {self.input_format}", 'red'))
-
-            seconds_passed = None
+            gst_cmd = self._build_gstreamer_command()
+            self._start_raw()
 
             try:
                 proc = subprocess.Popen(
@@ -204,28 +415,26 @@ class AudioProcessor:
                     shell=False
                 )
                 start_time = time.time()
+                # the log only holds state changes and errors, drained so GStreamer never blocks on it;
+                # progress is sampled from the growing temp_raw_file until GStreamer closes the log
                 stderr: list = []
-                while True:
-                    line = proc.stdout.readline()
-                    if not line and proc.poll() is not None:
-                        break
-                    if line:
-                        if (_sp := self._parse_gstreamer_output_line(
-                                line=line.strip(), start_time=start_time, total_duration=total_duration)) is not None:
-                            seconds_passed = _sp
-                        else:
-                            stderr.append(line)
+                reader = threading.Thread(target=lambda: stderr.extend(proc.stdout), daemon=True)
+                reader.start()
+                while reader.is_alive():
+                    reader.join(self.parent.PROGRESS_INTERVAL)
+                    self._report_decoded(start_time, RunReport.size(self.temp_raw_file) or 0, total_duration)
             except KeyboardInterrupt:
-                Utils.Proc.handle_interrupt(proc, process_name="GStreamer")
-                Utils.IO.delete_files([self.temp_raw_file, self.temp_raw_info_file])
-                return 1
+                # the partial .raw is kept, marked incomplete, and resumed by the next run
+                return Utils.Proc.handle_interrupt(proc, process_name="GStreamer")
 
-            proc.wait()
+            self.report.child("gstreamer", Utils.Proc.wait(proc))
+            if proc.returncode == 0:
+                self._finish_progress("decode")
             sys.stdout.write("\n")
             if proc.returncode == 0:
                 # Save track length for FFmpeg progress (non-critical)
-                self.audio_info["duration"] = seconds_passed
-                self._put_raw_audio_info(self.audio_info)
+                self.audio_info["duration"] = self._pcm_seconds(RunReport.size(self.temp_raw_file) or 0)
+                self._finish_raw()
                 print("\nGStreamer finished successfully.")
             else:
                 Utils.IO.delete_files([self.temp_raw_file, self.temp_raw_info_file])
@@ -233,58 +442,681 @@ class AudioProcessor:
                 Utils.Console.cprint(''.join(stderr), 'darkgray')
             return proc.returncode
 
-        # ------------------ SoX / FFmpeg  Processor ------------------
-        def run_sox_ffmpeg(self) -> int:
+        # ------------------ Raw intermediate integrity / resume ------------------
+        def _reuse_raw(self) -> Optional[int]:
             """
-            Convert intermediate PCM with SoX and encode selected channels with FFmpeg.
-            Shows live progress based on FFmpeg stderr, optionally with progress bar if total duration is known.
+            Check an existing temp_raw_file before decoding.
+            Returns:
+                0 if it is complete (or was completed by resuming), 1 if resuming was interrupted,
+                None if a full decode is needed (a corrupt or unresumable file is removed)
             """
-            sox_cmd = self._build_sox_command(self.bits, self.delay, self.volume)
-            ffmpeg_cmd = self._build_ffmpeg_command(self.bits, self.no_numbers, self.duration, self.channels_filter)
+            if not self.temp_raw_file.exists():
+                return None
+            if self.get_audio_info("raw_complete"):
+                if self._is_raw_complete():
+                    return 0
+                Utils.Console.cprint("Warning. Raw file does not match its completion record, decoding again.",
+                                     "blue")
+            elif (code := self._resume_gstreamer()) is not None:
+                return code
+            else:
+                Utils.Console.cprint("Warning. Incomplete raw file cannot be resumed, decoding again.", "blue")
+            Utils.IO.delete_files(self.temp_raw_file)
+            return None
+
+        def _is_raw_complete(self) -> bool:
+            """True if temp_raw_file matches the completion marker (size, sample count and CRC-32) of the sidecar."""
+            if not self.get_audio_info("raw_complete"):
+                return False
+            size = RunReport.size(self.temp_raw_file)
+            frame_size = RawFormat.SIZES[self.raw_format] * self.parent.channels_count
+            return (size is not None and size == self.get_audio_info("raw_bytes")
+                    and size == (self.get_audio_info("raw_samples") or 0) * frame_size
+                    and Utils.IO.crc32(self.temp_raw_file) == self.get_audio_info("raw_crc32"))
+
+        def _set_loudness(self, result: Dict[str, Any]) -> None:
+            """Record a LoudnessMeter result of temp_raw_file in audio_info."""
+            self.audio_info.update({
+                "loudness_integrated": None if result["integrated"] is None else round(result["integrated"], 2),
+                "loudness_true_peak": None if result["true_peak"] is None else round(result["true_peak"], 2),
+                "loudness_channels": ",".join(
+                    f"{name}:{'-inf' if lufs is None else f'{lufs:.2f}'}:{'-inf' if peak is None else f'{peak:.2f}'}"
+                    for name, (lufs, peak) in result["channels"].items())
+            })
+
+        def _ensure_loudness(self) -> None:
+            """Measure temp_raw_file unless its loudness is already known, and report the resulting gain."""
+            if self.get_audio_info("loudness_integrated") is None and self.temp_raw_file.exists():
+                if not LoudnessMeter.is_available():
+                    Utils.Console.cprint("Warning. NumPy is required to measure loudness, keeping the volume.", "blue")
+                    return
+                print("Measuring loudness...")
+                meter = LoudnessMeter(self.parent.channels_layout, self.input_frequency, self.raw_format)
+                meter.add_file(self.temp_raw_file)
+                self._set_loudness(meter.result())
+                self._put_raw_audio_info(self.audio_info)
+            integrated = self.get_audio_info("loudness_integrated")
+            true_peak = self.get_audio_info("loudness_true_peak")
+            if (gain := self.loudness_gain) is None:
+                Utils.Console.cprint("Warning. Programme is silent, keeping the volume.", "blue")
+                return
+            print(f"Loudness {integrated:.2f} LUFS, true peak {true_peak:.2f} dBTP, gain {gain:+.2f} dB")
+            if gain < round(self.loudness_target - integrated, 2):
+                print(f"Gain limited by the {self.parent.TRUE_PEAK_CEILING:g} dBTP true peak ceiling.")
+
+        def _start_raw(self) -> None:
+            """Mark temp_raw_file as being written, dropping the completion marker and loudness of the old one."""
+            self.audio_info.update({"raw_complete": 0, "loudness_integrated": None, "loudness_true_peak": None,
+                                    "loudness_channels": None})
+            self._put_raw_audio_info(self.audio_info)
 
-            print("\nFFmpeg started...\n")
+        def _finish_raw(self) -> None:
+            """Record the completion marker of the decoded temp_raw_file in the sidecar."""
+            size = RunReport.size(self.temp_raw_file) or 0
+            self.audio_info.update({
+                "raw_complete": 1,
+                "raw_bytes": size,
+                "raw_samples": size // (RawFormat.SIZES[self.raw_format] * self.parent.channels_count),
+                "raw_crc32": Utils.IO.crc32(self.temp_raw_file)
+            })
+            self._put_raw_audio_info(self.audio_info)
+
+        def _pcm_cache_key(self) -> Optional[str]:
+            """Key of the decoded input in the shared PCM cache, None if the input cannot be hashed."""
+            if self.parent.pcm_cache is None or self.input_format is None or not self.input_file.is_file():
+                return None
+            return self.parent.pcm_cache.key(
+                self.input_file,
+                decoder=self.input_format,
+                channels_config_id=self.parent.channels_config_id,
+                presentation=self.parent.THD_PRESENTATION if self.input_format == self.parent.THD else None,
+                raw_format=RawFormat.from_bits(self.bits)
+            )
+
+        def _restore_cached_raw(self) -> None:
+            """Link a cached decode of the input as temp_raw_file unless a complete local one exists."""
+            self._cache_key = self._pcm_cache_key()
+            if self._cache_key is None or (self.temp_raw_file.exists() and self.get_audio_info("raw_complete")):
+                return
+            if marker := self.parent.pcm_cache.restore(self._cache_key, self.temp_raw_file):
+                self.audio_info.update(marker)
+                self._put_raw_audio_info(self.audio_info)
+                print("\nDecoded PCM found in cache.")
+
+        def _store_cached_raw(self) -> None:
+            """Publish the complete temp_raw_file with its completion marker to the shared PCM cache."""
+            if self._cache_key is not None and self.get_audio_info("raw_complete"):
+                self.parent.pcm_cache.put(self._cache_key, self.temp_raw_file, {
+                    k: self.get_audio_info(k)
+                    for k in ("duration", "raw_format", "raw_complete", "raw_samples", "raw_bytes", "raw_crc32",
+                              "loudness_integrated", "loudness_true_peak", "loudness_channels")
+                })
+
+        def _restart_point(self, sample: int) -> Optional[Tuple[int, int]]:
+            """(input byte offset, sample position) where the decoder can restart at or before sample."""
+            parser = BitstreamParser.TrueHD if self.input_format == self.parent.THD \
+                else BitstreamParser.AC3 if self.input_format == self.parent.AC3 else None
+            return parser.restart_point(self.input_file, sample) if parser and self.input_file.exists() else None
+
+        def _resume_gstreamer(self) -> Optional[int]:
+            """
+            Continue an interrupted decode of temp_raw_file.
+            GStreamer restarts from the last bitstream restart point RESUME_WARMUP samples before the
+            resume position (the end of the partial file minus RESUME_MARGIN); the overlap is dropped
+            and the rest appended. A restarted decoder delays / drops the same samples at its start
+            as a full decode, so decoded sample N lands at .raw sample (restart point + N).
+            Returns:
+                0 if the file was completed, 1 if interrupted, None if it cannot be resumed
+            """
+            frame_size = RawFormat.SIZES[self.raw_format] * self.parent.channels_count
+            target = self.temp_raw_file.stat().st_size // frame_size - self.parent.RESUME_MARGIN
+            if target <= self.parent.RESUME_WARMUP or not (point := self._restart_point(
+                    target - self.parent.RESUME_WARMUP)):
+                return None
+            offset, start = point
+            to_skip = (target - start) * frame_size
+            total_duration = self.get_audio_info("duration")
+
+            print(f"\nGStreamer resuming at {Utils.Format.to_human_time(target / self.input_frequency)}...\n")
+            self._start_raw()
+            with self.input_file.open("rb") as source, self.temp_raw_file.open("r+b") as raw:
+                source.seek(offset)
+                raw.truncate(target * frame_size)
+                raw.seek(target * frame_size)
+                try:
+                    proc = subprocess.Popen(
+                        self._build_gstreamer_command(to_pipe=True, from_stdin=True),
+                        stdin=source,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL,
+                        bufsize=0,
+                        shell=False
+                    )
+                except OSError:
+                    return None
+
+                start_time = time.time()
+                written = 0
+                try:
+                    while chunk := proc.stdout.read(1 << 20):
+                        if to_skip:
+                            skipped = min(to_skip, len(chunk))
+                            chunk, to_skip = chunk[skipped:], to_skip - skipped
+                        raw.write(chunk)
+                        written += len(chunk)
+                        self._report_decoded(start_time, target * frame_size + written, total_duration)
+                except KeyboardInterrupt:
+                    return Utils.Proc.handle_interrupt(proc, process_name="GStreamer")
+
+            self.report.child("gstreamer", Utils.Proc.wait(proc))
+            sys.stdout.write("\n")
+            if proc.returncode != 0 or to_skip:
+                return None
+            self._finish_raw()
+            return 0
+
+        def run_gstreamer_segmented(self) -> Optional[int]:
+            """
+            Decode the input as decode_segments parts in parallel GStreamer processes, or as a single
+            piped part when only the loudness of the decoded stream is to be measured on the way.
+            Every part but the first restarts at the bitstream restart point (TrueHD major sync /
+            AC-3 frame) RESUME_WARMUP samples before its boundary, exactly as a resume does: the
+            warm-up is dropped and the part written at its position in temp_raw_file. A restarted
+            decoder delays / drops the same GST_DELAY_THD / GST_DELAY_AC3 samples as the first part,
+            so the parts join sample-accurately into the output of a serial decode.
+            Returns:
+                0 on success, 1 if interrupted, None to decode serially instead
+            """
+            if not (plan := self._piped_decode_plan()):
+                return None
+            gst_cmd = self._build_gstreamer_command(to_pipe=True)
+            frame_size = RawFormat.SIZES[self.raw_format] * self.parent.channels_count
+            total_duration = self.get_audio_info("duration")
+            if len(plan) > 1:
+                print(f"GStreamer decoding {len(plan)} segments in parallel...\n")
+            self._start_raw()
+            self.temp_raw_file.open("wb").close()
+
+            written = [0] * len(plan)
+            complete = [False] * len(plan)
+            meters = [LoudnessMeter(self.parent.channels_layout, self.input_frequency, self.raw_format, position)
+                      for _, _, position, _ in plan] if self.loudness_target is not None else []
+
+            def _pump(index: int, proc: subprocess.Popen, position: int, skip: int, keep: Optional[int]) -> None:
+                to_skip, left = skip * frame_size, keep * frame_size if keep is not None else None
+                with self.temp_raw_file.open("r+b") as raw:
+                    raw.seek(position * frame_size)
+                    while left != 0 and (chunk := proc.stdout.read(1 << 20)):
+                        if to_skip:
+                            skipped = min(to_skip, len(chunk))
+                            if meters:
+                                # the warm-up primes the K-weighting and true peak filters
+                                meters[index].add_bytes(chunk[:skipped], measure=False)
+                            chunk, to_skip = chunk[skipped:], to_skip - skipped
+                        if left is not None:
+                            chunk = chunk[:left]
+                            left -= len(chunk)
+                        if meters:
+                            meters[index].add_bytes(chunk)
+                        raw.write(chunk)
+                        written[index] += len(chunk)
+                # a part ends once it reaches the next boundary, the last one at the end of the stream
+                complete[index] = not to_skip and (left == 0 if keep is not None else proc.wait() == 0)
+                proc.stdout.close()
+                if proc.poll() is None:
+                    proc.terminate()
+
+            procs: List[subprocess.Popen] = []
+            sources: List[BinaryIO] = []
+            workers: List[threading.Thread] = []
+            start_time = time.time()
+            try:
+                for index, (offset, skip, position, keep) in enumerate(plan):
+                    if offset is None:
+                        proc = subprocess.Popen(gst_cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                                bufsize=0, shell=False)
+                    else:
+                        sources.append(source := self.input_file.open("rb"))
+                        source.seek(offset)
+                        proc = subprocess.Popen(self._build_gstreamer_command(to_pipe=True, from_stdin=True),
+                                                stdin=source, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                                bufsize=0, shell=False)
+                    procs.append(proc)
+                    workers.append(threading.Thread(target=_pump, args=(index, proc, position, skip, keep),
+                                                    name=f"gstreamer.{index}", daemon=True))
+                    workers[-1].start()
+                while alive := [worker for worker in workers if worker.is_alive()]:
+                    alive[0].join(self.parent.PROGRESS_INTERVAL)
+                    self._report_decoded(start_time, sum(written), total_duration)
+            except KeyboardInterrupt:
+                # the parts leave holes in the .raw, which therefore cannot be resumed
+                code = Utils.Proc.handle_interrupt(*procs, process_name="GStreamer")
+                Utils.IO.delete_files(self.temp_raw_file)
+                return code
+            except OSError as e:
+                Utils.Console.cprint(f"GStreamer failed to start: {e}", 'red')
+                for proc in procs:
+                    proc.terminate()
+                for worker in workers:
+                    worker.join()
+                complete = [False]
+            finally:
+                for source in sources:
+                    source.close()
+
+            for index, proc in enumerate(procs):
+                self.report.child(f"gstreamer.{index}", Utils.Proc.wait(proc))
+            if all(complete):
+                self._finish_progress("decode")
+            sys.stdout.write("\n")
+            if not all(complete):
+                Utils.Console.cprint("Warning. Segmented decoding failed, decoding serially.", "blue")
+                Utils.IO.delete_files(self.temp_raw_file)
+                return None
+            self.audio_info["duration"] = self._pcm_seconds(RunReport.size(self.temp_raw_file) or 0)
+            if meters:
+                for meter in meters[1:]:
+                    meters[0].merge(meter)
+                self._set_loudness(meters[0].result())
+            self._finish_raw()
+            print("\nGStreamer finished successfully.")
+            return 0
+
+        def _piped_decode_plan(self) -> Optional[List[Tuple[Optional[int], int, int, Optional[int]]]]:
+            """Parts of a decode piped through Python: the segments, or the whole stream to meter its loudness."""
+            if self.decode_segments > 1 and (plan := self._segment_plan()):
+                return plan
+            if self.loudness_target is not None and LoudnessMeter.is_available():
+                return [(None, 0, 0, None)]
+            return None
+
+        def _segment_plan(self) -> Optional[List[Tuple[Optional[int], int, int, Optional[int]]]]:
+            """
+            Parts of a segmented decode as (input byte offset or None for the whole file, warm-up samples
+            to drop, .raw sample position, samples to keep or None up to the end), None if the stream is
+            too short or has no restart points.
+            """
+            total = int((self.get_audio_info("duration") or 0) * self.input_frequency)
+            count = min(self.decode_segments, total // self.parent.SEGMENT_MIN)
+            if count < 2:
+                return None
+            bounds = [total * index // count for index in range(count)] + [None]
+            plan: List[Tuple[Optional[int], int, int, Optional[int]]] = [(None, 0, 0, bounds[1])]
+            for boundary, following in zip(bounds[1:-1], bounds[2:]):
+                if not (point := self._restart_point(boundary - self.parent.RESUME_WARMUP)):
+                    return None
+                offset, start = point
+                plan.append((offset, boundary - start, boundary,
+                             following - boundary if following is not None else None))
+            return plan
+
+        # ------------------ Streaming GStreamer → split ------------------
+        def run_streaming(self) -> int:
+            """
+            Run GStreamer with fdsink and feed its stdout straight into the split engine.
+            Decode and split run concurrently, so no .raw intermediate is written and the
+            total latency is max(decode, split) instead of their sum.
+            Returns:
+                int: 0 if both decoder and split succeeded
+            """
+            gst_cmd = self._build_gstreamer_command(to_pipe=True)
+
+            print("\nGStreamer streaming started...")
             try:
-                sox_proc = subprocess.Popen(
-                    sox_cmd,
+                proc = subprocess.Popen(
+                    gst_cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
                     bufsize=0,
                     shell=False
                 )
+            except OSError as e:
+                Utils.Console.cprint(f"GStreamer failed to start: {e}", 'red')
+                return 1
+
+            # Drain stderr concurrently so the decoder never blocks on a full pipe
+            stderr: list = []
+            reader = threading.Thread(
+                target=lambda: stderr.extend(line.decode(errors="replace") for line in proc.stderr),
+                daemon=True)
+            reader.start()
+
+            try:
+                code = self.run_split(decoder=proc)
+            except KeyboardInterrupt:
+                Utils.IO.delete_files(self._output_files)
+                return Utils.Proc.handle_interrupt(proc, process_name="GStreamer")
+            if code != 0:
+                # the failed split stopped reading, the decoder would block on the full pipe
+                try:
+                    proc.terminate()
+                except ProcessLookupError:
+                    pass
+            proc.stdout.close()
+
+            self.report.child("gstreamer", Utils.Proc.wait(proc))
+            reader.join()
+            if code != 0:
+                Utils.IO.delete_files(self._output_files)
+            elif proc.returncode != 0 and not self._is_split_complete():
+                Utils.Console.cprint(f"GStreamer failed with code {proc.returncode}", 'red')
+                Utils.Console.cprint(''.join(stderr), 'darkgray')
+                Utils.IO.delete_files(self._output_files)
+                code = proc.returncode
+            return code
+
+        def _is_split_complete(self) -> bool:
+            """
+            True if the split stage produced the expected duration.
+            The SoX path stops reading once FFmpeg reaches '-t', which breaks the decoder pipe.
+            """
+            return bool(self.duration and self._seconds_split and self._seconds_split >= self.duration - 0.5)
+
+        # ------------------ Channel split ------------------
+        def run_split(self, decoder: Optional[subprocess.Popen] = None) -> int:
+            """
+            Split the intermediate PCM into per-channel files with the selected engine.
+            Reads temp_raw_file, or the stdout of a streaming decoder if given.
+            A .raw file is split by up to split_jobs channel groups in parallel, a stream by a single worker.
+            """
+            if (code := self._scan_silence()) is not None:
+                return code
+            groups = self._split_groups() if decoder is None else []
+            if self.engine == SplitEngine.NATIVE:
+                if ChannelSplitter.is_available():
+                    if len(groups) > 1:
+                        return self.run_native_split_parallel(groups)
+                    return self.run_native_split(stream=decoder.stdout if decoder is not None else None)
+                Utils.Console.cprint("Warning. NumPy is not installed, falling back to SoX → FFmpeg.", "blue")
+            if len(groups) > 1:
+                return self.run_sox_ffmpeg_parallel(groups)
+            return self.run_sox_ffmpeg(decoder=decoder)
+
+        def _scan_silence(self) -> Optional[int]:
+            """
+            Find the silent channels of temp_raw_file before a SoX → FFmpeg split, which cannot detect them itself;
+            the native splitter tracks the channel peaks on the blocks it writes instead.
+            Returns:
+                0 if every selected channel is silent and skipped, None to split
+            """
+            self._channel_peaks = {}
+            if self.silent_channels == SilencePolicy.KEEP \
+                    or self.engine == SplitEngine.NATIVE and ChannelSplitter.is_available():
+                return None
+            if not ChannelSplitter.is_available() or not self.temp_raw_file.exists():
+                Utils.Console.cprint("Warning. Silent channels are only detected with NumPy, writing every channel.",
+                                     "blue")
+                return None
+            peaks = ChannelSplitter.scan_peaks(self.temp_raw_file, self.parent.channels_count, self.raw_format)
+            self._channel_peaks = {cname: float(peaks[cid])
+                                   for cid, cname, _ in self._select_outputs(self.no_numbers, self.channels_filter)}
+            if self._select_outputs(self.no_numbers, self.channels_filter):
+                return None
+            print("\nEvery selected channel is silent, nothing to write.")
+            self._output_files = []
+            return 0
+
+        def _is_silent(self, cname: str) -> bool:
+            peak = self._channel_peaks.get(cname)
+            return peak is not None and peak <= 10 ** (self.silence_threshold / 20)
+
+        def _write_channel_manifest(self) -> None:
+            """
+            Write <output>.channels.json listing every selected channel with its peak and whether it is silent
+            and was written, and drop the skipped files from the run's outputs.
+            """
+            if not self._channel_peaks:
+                return
+            if self.silent_channels == SilencePolicy.SKIP:
+                # outputs of an earlier run would pass for written ones
+                Utils.IO.delete_files([self._output_path(cid, cname) for cid, cname in
+                                       enumerate(self.parent.channels_layout) if self._is_silent(cname)])
+            channels = []
+            for cid, cname in enumerate(self.parent.channels_layout):
+                if cname not in self._channel_peaks:
+                    continue
+                path = self._output_path(cid, cname)
+                peak = self._channel_peaks[cname]
+                channels.append({"channel": cname, "file": path.name,
+                                 "peak_db": round(20 * math.log10(peak), 2) if peak > 0 else None,
+                                 "silent": self._is_silent(cname), "written": path.is_file()})
+            self._output_files = [path for path in self._output_files or [] if path.is_file()]
+            if silent := [channel["channel"] for channel in channels if channel["silent"]]:
+                action = "skipped" if self.silent_channels == SilencePolicy.SKIP else "marked"
+                print(f"\nSilent channels ({action}): {', '.join(silent)}")
+            manifest = {"silent_channels": self.silent_channels, "silence_threshold_db": self.silence_threshold,
+                        "channels": channels}
+            try:
+                self.output_file.with_suffix(".channels.json").write_text(json.dumps(manifest, indent=2),
+                                                                          encoding="utf-8")
+            except OSError as e:
+                Utils.Console.cprint(f"Warning. Failed to write the channel manifest: {e}", "blue")
+
+        def _split_groups(self) -> List[List[Tuple[int, str, Path]]]:
+            """Partition the selected outputs into at most split_jobs contiguous, evenly sized channel groups."""
+            selected_channels = self._select_outputs(self.no_numbers, self.channels_filter)
+            jobs = max(1, min(self.split_jobs, len(selected_channels)))
+            return [selected_channels[len(selected_channels) * i // jobs:len(selected_channels) * (i + 1) // jobs]
+                    for i in range(jobs)] if selected_channels else []
+
+        def _follow_groups(self, tasks: List[Any], positions: List[float]) -> None:
+            """
+            Report the progress of the slowest channel group until every group has finished.
+            Tasks are the groups' threads or processes, both provide join(timeout) / is_alive().
+            """
+            start_time = time.time()
+            total_duration = self.duration
+            while True:
+                deadline = time.monotonic() + 0.5
+                for task in tasks:
+                    task.join(max(0.0, deadline - time.monotonic()))
+                done = not any(task.is_alive() for task in tasks)
+                self._seconds_split = min(positions)
+                self._report_progress(
+                    start_time=start_time,
+                    percent_done=min(self._seconds_split / total_duration * 100, 100) if total_duration else 0,
+                    seconds_passed=self._seconds_split, total_duration=total_duration, stage="split")
+                if done:
+                    break
+
+        def run_native_split(self, stream: Optional[BinaryIO] = None) -> int:
+            """
+            Split the intermediate PCM in-process with ChannelSplitter.
+            Produces the same files as the SoX → FFmpeg stage without the two process hops.
+            Reads temp_raw_file, or the decoder output stream if given.
+            """
+            selected_channels = self._select_outputs(self.no_numbers, self.channels_filter)
+            if not selected_channels:
+                print("\nWarning: no channels selected for output.")
+                return 1
+            self._output_files = [path for _, _, path in selected_channels]
+
+            splitter = ChannelSplitter(
+                channels_count=self.parent.channels_count,
+                outputs=[(cid, path) for cid, _, path in selected_channels],
+                frequency=self.input_frequency,
+                bits=self.bits,
+                delay=self.delay,
+                volume=self.volume or 0,
+                duration=self.duration,
+                source_format=self.raw_format,
+                output_format=self.output_format,
+                ffmpeg=self.parent.ffmpeg_launch,
+                silence=self.silent_channels,
+                silence_threshold=self.silence_threshold
+            )
+
+            print("\nSplitter started...\n")
+            start_time = time.time()
+            total_duration = self.duration
+
+            def _progress(seconds_passed: float) -> None:
+                self._seconds_split = seconds_passed
+                self._report_progress(
+                    start_time=start_time,
+                    percent_done=min(seconds_passed / total_duration * 100, 100) if total_duration else 0,
+                    seconds_passed=seconds_passed, total_duration=total_duration, stage="split")
+
+            try:
+                if stream is not None:
+                    splitter.run_stream(stream, progress=_progress)
+                else:
+                    splitter.run_file(self.temp_raw_file, progress=_progress)
+            except KeyboardInterrupt:
+                Utils.IO.delete_files(self._output_files)
+                Utils.Console.cprint('\n\nSplitter interrupted.', 'red')
+                return 1
+            except (OSError, ValueError) as e:
+                sys.stdout.write("\n")
+                Utils.Console.cprint(f"Splitter failed: {e}", 'red')
+                Utils.IO.delete_files(self._output_files)
+                return 1
+
+            if splitter.peaks is not None:
+                self._channel_peaks = {cname: float(peak) for (_, cname, _), peak in zip(selected_channels,
+                                                                                          splitter.peaks)}
+            self._finish_progress("split")
+            sys.stdout.write("\n")
+            print("\nSplitter finished successfully.")
+            return 0
+
+        def run_native_split_parallel(self, groups: List[List[Tuple[int, str, Path]]]) -> int:
+            """
+            Split temp_raw_file with one ChannelSplitter process per channel group.
+            Every worker memory-maps the same .raw, so the page cache is shared and
+            the conversion / write work scales with the number of groups.
+            """
+            self._output_files = [path for group in groups for _, _, path in group]
+            # not fork: this runs on executor threads (AsyncAudioProcessor, WorkerDaemon) next to the event loop,
+            # the loudness pool and SQLite connections, which a forked child would inherit mid-use
+            context = multiprocessing.get_context("spawn")
+            positions = context.Array("d", len(groups), lock=False)
+            usage = context.Array("d", 3 * len(groups), lock=False)
+            peaks = context.Array("d", sum(len(group) for group in groups), lock=False)
+            offsets = [sum(len(group) for group in groups[:index]) for index in range(len(groups))]
+            workers = [
+                context.Process(
+                    target=self._split_group_worker,
+                    args=(self.temp_raw_file, self.parent.channels_count, [(cid, path) for cid, _, path in group],
+                          self.input_frequency, self.bits, self.delay, self.volume or 0,
+                          self.duration, self.raw_format, self.output_format, self.parent.ffmpeg_launch,
+                          self.silent_channels, self.silence_threshold,
+                          positions, usage, index, peaks, offsets[index]),
+                    name=f"splitter.{index}")
+                for index, group in enumerate(groups)
+            ]
+
+            print(f"\nSplitter started ({len(workers)} channel groups)...\n")
+            try:
+                for worker in workers:
+                    worker.start()
+                self._follow_groups(workers, positions)
+            except KeyboardInterrupt:
+                for worker in workers:
+                    if worker.is_alive():
+                        worker.terminate()
+                    worker.join()
+                Utils.IO.delete_files(self._output_files)
+                Utils.Console.cprint('\n\nSplitter interrupted.', 'red')
+                return 1
+
+            for index, worker in enumerate(workers):
+                worker_usage = usage[3 * index:3 * index + 3]
+                self.report.child(worker.name, dict(zip(("cpu_user", "cpu_system", "peak_rss_mb"), worker_usage))
+                                  if any(worker_usage) else None)
+
+            failed = [worker.name for worker in workers if worker.exitcode != 0]
+            if not failed:
+                self._finish_progress("split")
+            sys.stdout.write("\n")
+            if failed:
+                Utils.Console.cprint(f"Splitter failed in {', '.join(failed)}", 'red')
+                Utils.IO.delete_files(self._output_files)
+                return 1
+            if self.silent_channels != SilencePolicy.KEEP:
+                self._channel_peaks = {cname: peak for (_, cname, _), peak in
+                                       zip((output for group in groups for output in group), peaks)}
+            print("\nSplitter finished successfully.")
+            return 0
+
+        @staticmethod
+        def _split_group_worker(raw_file: Path, channels_count: int, outputs: List[Tuple[int, Path]],
+                                frequency: int, bits: int, delay: int, volume: float, duration: Optional[float],
+                                source_format: str, output_format: str, ffmpeg: Path,
+                                silence: str, silence_threshold: float,
+                                positions: Any, usage: Any, index: int, peaks: Any, offset: int) -> None:
+            """Process entry point of one channel group, static so it pickles under the spawn start method."""
+            def _progress(seconds_passed: float) -> None:
+                positions[index] = seconds_passed
+
+            splitter = ChannelSplitter(channels_count=channels_count, outputs=outputs, frequency=frequency, bits=bits,
+                                       delay=delay, volume=volume, duration=duration, source_format=source_format,
+                                       output_format=output_format, ffmpeg=ffmpeg, silence=silence,
+                                       silence_threshold=silence_threshold)
+            splitter.run_file(raw_file, progress=_progress)
+            if splitter.peaks is not None:
+                peaks[offset:offset + len(outputs)] = splitter.peaks.tolist()
+            if own_usage := Utils.Proc.usage():
+                usage[3 * index:3 * index + 3] = list(own_usage.values())
+
+        # ------------------ SoX / FFmpeg  Processor ------------------
+        def run_sox_ffmpeg(self, decoder: Optional[subprocess.Popen] = None) -> int:
+            """
+            Convert intermediate PCM with SoX and encode selected channels with FFmpeg.
+            Shows live progress from the FFmpeg '-progress' stream, with a progress bar if total duration is known.
+            If a streaming decoder is given, SoX (or FFmpeg when SoX is not needed) reads its stdout
+            instead of temp_raw_file.
+            """
+            sox_cmd, ffmpeg_cmd = self._build_split_commands(self.channels_filter, piped=decoder is not None)
+
+            print("\nFFmpeg started...\n")
+            sox_proc = None
+            try:
+                if sox_cmd:
+                    sox_proc = subprocess.Popen(
+                        sox_cmd,
+                        stdin=decoder.stdout if decoder is not None else None,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        bufsize=0,
+                        shell=False
+                    )
 
                 ffmpeg_proc = subprocess.Popen(
                     ffmpeg_cmd,
-                    stdin=sox_proc.stdout,
+                    stdin=sox_proc.stdout if sox_proc else decoder.stdout if decoder is not None else subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
                     bufsize=1,
                     universal_newlines=True,
                     shell=False
                 )
 
-                sox_proc.stdout.close()
+                if sox_proc:
+                    sox_proc.stdout.close()
+                if decoder is not None:
+                    decoder.stdout.close()
                 start_time = time.time()
-                stderr: list = []
-                seconds_passed = None
-                while True:
-                    line = ffmpeg_proc.stderr.readline()
-                    if not line and ffmpeg_proc.poll() is not None:
-                        break
-                    if line:
-                        if (_sp := self._parse_ffmpeg_output_line(
-                                line=line, start_time=start_time, total_duration=self.duration)) is not None:
-                            seconds_passed = _sp
-                        else:
-                            stderr.append(line)
-
-                # bug fix in duration log in FFMPEG 6.x
-                if seconds_passed and seconds_passed < self.duration:
-                    self._parse_ffmpeg_output_line(
-                        line=f"time={Utils.Format.to_human_time(self.duration)}.000", start_time=start_time, total_duration=self.duration)
 
+                def _progress(progress: AudioProcessor._FFmpegProgress) -> None:
+                    self._seconds_split = progress.seconds
+                    if self.duration:
+                        self._report_progress(start_time=start_time,
+                                              percent_done=min(progress.seconds / self.duration * 100, 100),
+                                              seconds_passed=progress.seconds, total_duration=self.duration,
+                                              stage="split")
+
+                progress = AudioProcessor._FFmpegProgress(on_update=_progress)
+                stderr = progress.follow(ffmpeg_proc)
+
+                self.report.child("ffmpeg", Utils.Proc.wait(ffmpeg_proc))
+                if sox_proc:
+                    self.report.child("sox", Utils.Proc.wait(sox_proc))
+                if ffmpeg_proc.returncode == 0:
+                    self._finish_progress("split")
                 sys.stdout.write("\n")
                 sys.stdout.flush()
-                ffmpeg_proc.wait()
-                sox_proc.wait()
+                self.report.note(ffmpeg_speed=progress.speed, ffmpeg_total_size=progress.total_size)
 
                 if ffmpeg_proc.returncode == 0:
                     print("\nFFmpeg finished successfully.")
@@ -299,135 +1131,277 @@ class AudioProcessor:
                 Utils.IO.delete_files(self._output_files)
                 return Utils.Proc.handle_interrupt(ffmpeg_proc, sox_proc, process_name="FFmpeg")
 
-        # ------- COMMAND OUTPUT PARSERS -------
-        def _parse_gstreamer_output_line(
-                self, line: str, start_time: float, total_duration: Optional[float] = None) -> Optional[float]:
-            """Parse GStreamer progress line and print progress bar."""
-            seconds_passed: Optional[float] = None
-            if not any(x in line for x in ["Setting pipeline", "PREROLLING", "PREROLLED", "PLAYING", "New clock"]):
-                if "progressreport" in line:
-                    match = re.search(r"(\d+)\s*/\s*(\d+)\s*seconds\s*\(\s*([\d,\.]+)\s*%\)", line)
-                    if match:
-                        seconds_passed = float(match.group(1))
-                        if total_duration is None:
-                            total_duration = float(match.group(2))
-                        percent_done = float(match.group(3).replace(",", "."))
-                        Utils.update_progress_bar(start_time=start_time, percent_done=percent_done,
-                                                  seconds_passed=seconds_passed, total_duration=total_duration)
-            return seconds_passed
-
-        def _parse_ffmpeg_output_line(
-                self, line: str, start_time: float, total_duration: Optional[float] = None) -> Optional[float]:
-            """Parse FFmpeg progress line and print progress bar."""
-            line = line.strip()
-            seconds_passed: Optional[float] = None
-            time_match = re.search(r"time=(\d+):(\d+):(\d+\.\d+)", line)
-            if total_duration and time_match:
-                h, m, s = time_match.groups()
-                seconds_passed = int(h) * 3600 + int(m) * 60 + float(s)
-                percent_done = (seconds_passed / total_duration) * 100
-                Utils.update_progress_bar(start_time=start_time, percent_done=percent_done,
-                                          seconds_passed=seconds_passed, total_duration=total_duration)
-            return seconds_passed
+        def run_sox_ffmpeg_parallel(self, groups: List[List[Tuple[int, str, Path]]]) -> int:
+            """
+            Run one SoX → FFmpeg pipeline per channel group, all reading temp_raw_file.
+            Each FFmpeg applies only its group's channelmap filters, so the encode spreads over the cores.
+            """
+            positions: List[float] = [0.0] * len(groups)
+            stderr: List[str] = []
+            pipelines: List[Tuple[Optional[subprocess.Popen], subprocess.Popen]] = []
+            progresses: List[AudioProcessor._FFmpegProgress] = []
+
+            def _read_progress(ffmpeg_proc: subprocess.Popen, index: int) -> None:
+                stderr.extend(progresses[index].follow(ffmpeg_proc))
+
+            print(f"\nFFmpeg started ({len(groups)} channel groups)...\n")
+            readers: List[threading.Thread] = []
+            try:
+                for index, group in enumerate(groups):
+                    sox_cmd, ffmpeg_cmd = self._build_split_commands([cname for _, cname, _ in group])
+                    sox_proc = subprocess.Popen(
+                        sox_cmd,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL,
+                        bufsize=0,
+                        shell=False
+                    ) if sox_cmd else None
+                    ffmpeg_proc = subprocess.Popen(
+                        ffmpeg_cmd,
+                        stdin=sox_proc.stdout if sox_proc else subprocess.DEVNULL,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        bufsize=1,
+                        universal_newlines=True,
+                        shell=False
+                    )
+                    if sox_proc:
+                        sox_proc.stdout.close()
+                    pipelines.append((sox_proc, ffmpeg_proc))
+                    progresses.append(AudioProcessor._FFmpegProgress(
+                        on_update=lambda progress, index=index: positions.__setitem__(index, progress.seconds)))
+                    readers.append(threading.Thread(target=_read_progress, args=(ffmpeg_proc, index), daemon=True))
+                    readers[-1].start()
+                # channel names are unique, so the groups' outputs are exactly the full selection
+                self._output_files = [path for group in groups for _, _, path in group]
+
+                self._follow_groups(readers, positions)
+            except KeyboardInterrupt:
+                Utils.IO.delete_files(self._output_files)
+                return Utils.Proc.handle_interrupt(*(proc for pipeline in pipelines for proc in pipeline),
+                                                   process_name="FFmpeg")
+
+            codes = []
+            for index, (sox_proc, ffmpeg_proc) in enumerate(pipelines):
+                self.report.child(f"ffmpeg.{index}", Utils.Proc.wait(ffmpeg_proc))
+                if sox_proc:
+                    self.report.child(f"sox.{index}", Utils.Proc.wait(sox_proc))
+                codes.append(ffmpeg_proc.returncode)
+            if not any(codes):
+                self._finish_progress("split")
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+            # groups encode concurrently, so their speeds add up
+            speeds = [progress.speed for progress in progresses if progress.speed is not None]
+            self.report.note(ffmpeg_speed=round(sum(speeds), 3) if speeds else None,
+                             ffmpeg_total_size=sum(progress.total_size or 0 for progress in progresses) or None)
+
+            if code := next((code for code in codes if code != 0), 0):
+                Utils.Console.cprint(f'FFmpeg failed with code {code}.', 'red')
+                Utils.Console.cprint(''.join(stderr), 'darkgray')
+                Utils.IO.delete_files(self._output_files)
+            else:
+                print("\nFFmpeg finished successfully.")
+            return code
+
+        def _report_progress(self, start_time: Optional[float], percent_done: float,
+                             seconds_passed: Optional[float] = None, total_duration: Optional[float] = None,
+                             stage: str = "decode") -> None:
+            """
+            Single place every stage reports its progress through.
+            start_time is None for stages that did no work of their own (e.g. a reused .raw), which have no speed.
+            """
+            self._last_progress[stage] = (start_time, percent_done, seconds_passed, total_duration)
+            if self.progress is not None:
+                self.progress(stage, percent_done, seconds_passed)
+            else:
+                self.renderer.update(stage, percent_done, seconds_passed, total_duration=total_duration,
+                                     start_time=start_time)
+
+        def _finish_progress(self, stage: str) -> None:
+            """Report 100 % of a stage that succeeded; its last sampled update is usually just short of it."""
+            if (last := self._last_progress.get(stage)) is not None and last[1] < 100:
+                start_time, _, seconds_passed, total_duration = last
+                self._report_progress(start_time=start_time, percent_done=100,
+                                      seconds_passed=total_duration or seconds_passed,
+                                      total_duration=total_duration, stage=stage)
+
+        def _report_decoded(self, start_time: float, decoded_bytes: int, total_duration: Optional[float]) -> None:
+            """Report decode progress from the bytes of PCM decoded so far."""
+            seconds_passed = self._pcm_seconds(decoded_bytes)
+            self._report_progress(
+                start_time=start_time,
+                percent_done=min(seconds_passed / total_duration * 100, 100) if total_duration else 0,
+                seconds_passed=seconds_passed, total_duration=total_duration, stage="decode")
+
+        def _pcm_seconds(self, size: int) -> float:
+            """Audio seconds in size bytes of decoded PCM (raw_format, all channels)."""
+            return size // (RawFormat.SIZES[self.raw_format] * self.parent.channels_count) / self.input_frequency
 
         # -------------- COMMAND BUILDERS ---------------
-        def _build_gstreamer_thd_command(self) -> List[str]:
+        def _build_gstreamer_command(self, to_pipe: bool = False, from_stdin: bool = False) -> List[str]:
+            """
+            Build GStreamer command for the detected input format.
+            The decoder outputs the sample format of the requested bits, recorded as raw_format,
+            except when reading stdin to resume a partial .raw, which keeps its recorded format.
+            """
+            if not from_stdin:
+                self.audio_info["raw_format"] = RawFormat.from_bits(self.bits)
+            if self.input_format == self.parent.THD:
+                return self._build_gstreamer_thd_command(to_pipe, from_stdin)
+            elif self.input_format == self.parent.AC3:
+                return self._build_gstreamer_ac3_command(to_pipe, from_stdin)
+            raise ValueError(Utils.Format.colorize(f"Unsupported input_format: {self.input_format}", 'red'))
+
+        def _build_gstreamer_caps(self) -> List[str]:
+            """Decoder output caps in the .raw sample format, converted by audioconvert unless it is float."""
+            return [
+                *(["!", "audioconvert", "dithering=none"] if self.raw_format != RawFormat.F32LE else []),
+                "!", f"audio/x-raw,format={self.raw_format},rate={self.input_frequency},"
+                     f"channels={self.parent.channels_count}"
+            ]
+
+        def _build_gstreamer_source(self, from_stdin: bool = False) -> List[str]:
+            """Source of the GStreamer pipeline: input_file, or stdin (fdsrc) positioned by the caller."""
+            return ["fdsrc", "fd=0"] if from_stdin else ["filesrc", f'location="{self.input_file.as_posix()}"']
+
+        def _build_gstreamer_sink(self, to_pipe: bool = False) -> List[str]:
+            """Sink of the GStreamer pipeline: temp_raw_file, or stdout (fdsink) when streaming."""
+            return ["!", "fdsink", "fd=1"] if to_pipe \
+                else ["!", "filesink", f'location="{self.temp_raw_file.as_posix()}"']
+
+        def _build_gstreamer_thd_command(self, to_pipe: bool = False, from_stdin: bool = False) -> List[str]:
             """Build GStreamer command for TrueHD input."""
             return [
                 self.parent.gst_launch.as_posix(),
+                *(["-q"] if to_pipe else []),
                 "--gst-plugin-path", (self.parent.gst_launch.parent / "gst-plugins").as_posix(),
-                "--gst-debug=progressreport:5",
-                "filesrc", f'location="{self.input_file.as_posix()}"',
+                *self._build_gstreamer_source(from_stdin),
                 "!", "dlbtruehdparse", "align-major-sync=false",
-                "!", "dlbaudiodecbin", "truehddec-presentation=16", f"out-ch-config={self.parent.channels_config_id}",
-                "!", f"audio/x-raw,format=F32LE,rate={self.input_frequency},channels={self.parent.channels_count}",
-                "!", "progressreport", "update-freq=1", "silent=false",
-                "!", "filesink", f'location="{self.temp_raw_file.as_posix()}"'
+                "!", "dlbaudiodecbin", f"truehddec-presentation={self.parent.THD_PRESENTATION}",
+                f"out-ch-config={self.parent.channels_config_id}",
+                *self._build_gstreamer_caps(),
+                *self._build_gstreamer_sink(to_pipe)
             ]
 
-        def _build_gstreamer_ac3_command(self) -> List[str]:
+        def _build_gstreamer_ac3_command(self, to_pipe: bool = False, from_stdin: bool = False) -> List[str]:
             """Build GStreamer command for E-AC3 input."""
             return [
                 self.parent.gst_launch.as_posix(),
+                *(["-q"] if to_pipe else []),
                 "--gst-plugin-path", (self.parent.gst_launch.parent / "gst-plugins").as_posix(),
-                "--gst-debug=progressreport:5",
-                "filesrc", f'location="{self.input_file.as_posix()}"',
+                *self._build_gstreamer_source(from_stdin),
                 '!', 'dlbac3parse',
                 '!', 'dlbaudiodecbin', 'ac3dec-drc-suppress=true', 'ac3dec-drop-delay=true',
                 f'out-ch-config={self.parent.channels_config_id}',
-                "!", f"audio/x-raw,format=F32LE,rate={self.input_frequency},channels={self.parent.channels_count}",
-                "!", "progressreport", "update-freq=1", "silent=false",
-                "!", "filesink", f'location="{self.temp_raw_file.as_posix()}"'
+                *self._build_gstreamer_caps(),
+                *self._build_gstreamer_sink(to_pipe)
             ]
 
-        def _build_sox_command(self, bits: int, delay: int, volume: float) -> List[str]:
-            """Build SoX command for PCM processing."""
+        def _build_sox_command(self, bits: int, delay: int, volume: float, source: Optional[str] = None) -> List[str]:
+            """Build SoX command for PCM processing. Source defaults to temp_raw_file, '-' reads stdin."""
 
+            output_format = RawFormat.from_bits(bits)
             cmd = [
                 str(self.parent.sox_launch), "-V1",
-                "-t", "f32", "-r", str(self.input_frequency), "-c", str(self.parent.channels_count),
-                "--ignore-length", str(self.temp_raw_file)
+                "-t", RawFormat.SOX[self.raw_format], "-r", str(self.input_frequency),
+                "-c", str(self.parent.channels_count),
+                "--ignore-length", source or str(self.temp_raw_file),
+                "-t", RawFormat.SOX[output_format],
+                "-e", "floating-point" if output_format == RawFormat.F32LE else "signed-integer",
+                "-D", "-"
             ]
-            if bits == 32:
-                cmd.extend(["-t", "f32", "-e", "floating-point"])
-            else:
-                cmd.extend(["-t", "s24", "-e", "signed-integer"])
-            cmd.extend(["-D", "-"])
 
             if delay > 0:
                 cmd.extend(["pad", f"{delay}s"])
             elif delay < 0:
                 cmd.extend(["trim", f"{abs(delay)}s"])
             if volume:
-                cmd.extend(["gain", str(int(volume))])
+                cmd.extend(["gain", f"{volume:g}"])
             return cmd
 
+        def _build_split_commands(self, channels_filter: List[str], piped: bool = False
+                                  ) -> Tuple[Optional[List[str]], List[str]]:
+            """
+            SoX and FFmpeg commands of the split stage, SoX is None when FFmpeg can read the intermediate itself.
+            Source is temp_raw_file, or stdin if piped.
+            """
+            if self._use_sox():
+                return (self._build_sox_command(self.bits, self.delay, self.volume, source="-" if piped else None),
+                        self._build_ffmpeg_command(self.bits, self.no_numbers, self.duration, channels_filter))
+            return None, self._build_ffmpeg_command(self.bits, self.no_numbers, self.duration, channels_filter,
+                                                    source="-" if piped else str(self.temp_raw_file),
+                                                    input_format=self.raw_format, skip=max(0, -self.delay))
+
+        def _use_sox(self) -> bool:
+            """SoX is only needed for gain and leading silence, FFmpeg trims and converts samples on its own."""
+            return bool(self.volume) or self.delay > 0
+
         def _build_ffmpeg_command(self, bits: int, no_numbers: bool, duration: Optional[float],
-                                  channels_filter: List[str]) -> List[str]:
-            """Build FFmpeg command for channel encoding."""
+                                  channels_filter: List[str], source: str = "-", input_format: Optional[str] = None,
+                                  skip: int = 0) -> List[str]:
+            """
+            Build FFmpeg command for channel encoding.
+            Args:
+                source: Input file, '-' reads stdin
+                input_format: RawFormat of the input (default: SoX output for bits)
+                skip: Leading samples to drop from the input
+            """
+            input_format = input_format or RawFormat.from_bits(bits)
             ffmpeg_cmd = [
                 str(self.parent.ffmpeg_launch),
-                "-hide_banner", "-loglevel", "error", "-stats",
-                "-f", "s24le" if bits == 24 else "f32le",
+                "-hide_banner", "-loglevel", "error", "-nostats", "-progress", "pipe:1",
+                *(["-nostdin"] if source != "-" else []),
+                "-f", RawFormat.FFMPEG[input_format],
                 "-ar", str(self.input_frequency),
                 "-ac", str(self.parent.channels_count)
             ]
+            if skip:
+                frame_size = RawFormat.SIZES[input_format] * self.parent.channels_count
+                ffmpeg_cmd.extend(["-skip_initial_bytes", str(skip * frame_size)])
             if duration:
                 ffmpeg_cmd.extend(["-t", str(duration)])
 
-            ffmpeg_cmd.extend(["-i", "-"])
+            ffmpeg_cmd.extend(["-i", source])
 
-            selected_channels = [
-                (cid, cname)
-                for cid, cname in enumerate(self.parent.channels_layout)
-                if not channels_filter or cname in channels_filter
-            ]
+            selected_channels = self._select_outputs(no_numbers, channels_filter)
             if not selected_channels:
                 print("\nWarning: no channels selected for output.")
                 return []
 
-            self._output_files = [
-                self.output_file.with_suffix(
-                    f".{cname}.wav" if no_numbers else f".{str(cid + 1).zfill(2)}_{cname}.wav"
-                )
-                for cid, cname in selected_channels]
+            self._output_files = [path for _, _, path in selected_channels]
 
             ffmpeg_cmd.extend([
                 "-filter_complex",
-                f'{";".join(f"[0:a]channelmap={cid}[{cname}]" for cid, cname in selected_channels)}',
+                f'{";".join(f"[0:a]channelmap={cid}[{cname}]" for cid, cname, _ in selected_channels)}',
                 *[
                     item
-                    for cid, cname in selected_channels
+                    for cid, cname, path in selected_channels
                     for item in [
                         "-map", f"[{cname}]",
-                        "-c:a", "pcm_s24le" if bits == 24 else "pcm_f32le",
-                        "-y", str(self.output_file.with_suffix(
-                            f".{cname}.wav" if no_numbers else f".{str(cid + 1).zfill(2)}_{cname}.wav"))
+                        *OutputFormat.ffmpeg_args(self.output_format, bits),
+                        "-y", str(path)
                     ]
                 ]
             ])
             return ffmpeg_cmd
 
+        def _select_outputs(self, no_numbers: bool, channels_filter: List[str]) -> List[Tuple[int, str, Path]]:
+            """Return (channel index, channel name, output file) for every channel passing the filter."""
+            return [
+                (cid, cname, self._output_path(cid, cname, no_numbers))
+                for cid, cname in enumerate(self.parent.channels_layout)
+                if (not channels_filter or cname in channels_filter)
+                # channels found silent by a scan ahead of the split are not written at all under SKIP
+                and not (self.silent_channels == SilencePolicy.SKIP and self._is_silent(cname))
+            ]
+
+        def _output_path(self, cid: int, cname: str, no_numbers: Optional[bool] = None) -> Path:
+            extension = OutputFormat.EXTENSIONS[self.output_format]
+            no_numbers = self.no_numbers if no_numbers is None else no_numbers
+            return self.output_file.with_suffix(
+                f".{cname}.{extension}" if no_numbers else f".{str(cid + 1).zfill(2)}_{cname}.{extension}")
+
         def prepare_audio_info(self, force: bool = False) -> None:
             """
             Prepare and update audio file information.
@@ -438,9 +1412,11 @@ class AudioProcessor:
             def _normalize_audio_field(k: str, v: Union[str, int, float, None]) -> Union[str, int, float, None]:
                 """Normalize a single audio info field."""
                 return (
-                    Utils.Format.to_str(v, True) if k in {"format", "channels", "parser_used"}
-                    else Utils.Format.to_float(v) if k == "duration"
+                    Utils.Format.to_str(v, True) if k in {"format", "channels", "core", "parser_used", "raw_format",
+                                                          "loudness_channels"}
+                    else Utils.Format.to_float(v) if k in {"duration", "loudness_integrated", "loudness_true_peak"}
                     else Utils.Format.to_frequency(v) if k == "freq"
+                    else int(v) if isinstance(v, bool)
                     else Utils.Format.to_int(v) if v is not None else None
                 )
 
@@ -449,18 +1425,15 @@ class AudioProcessor:
             # Attempt to get cached or precomputed data first
             if not force:
                 ai = self._get_raw_audio_info(force=True)
-            # If no data or forced update, parse the audio file directly
+            # If no data or forced update, use pre-probed data or parse the audio file directly
             if not ai:
-                ai = AudioInfo(
-                    mediainfo_launch=self.parent.mediainfo_launch,
-                    eac3to_launch=self.parent.eac3to_launch
-                ).parse(self.input_file).audio_info
+                ai = self._probed_audio_info or self.parent.probe(self.input_file)
 
             if self.volume is None:
                 if ai.get("dialnorm") is None:
-                    if ai.get("format") == self.parent.THD and ai.get("parser_used") is None:
-                        Utils.Console.cprint("Warning. The 'dialnorm' level for TrueHD audio can only be determined "
-                                     "using 'eac3to'.\nThe sound volume will not be adjusted.", "blue")
+                    if ai.get("format") == self.parent.THD and ai.get("parser_used") == AudioInfo.Parser.MEDIAINFO:
+                        Utils.Console.cprint("Warning. The 'dialnorm' level for TrueHD audio is not reported by "
+                                     "'mediainfo'.\nThe sound volume will not be adjusted.", "blue")
                     else:
                         Utils.Console.cprint("Warning. Failed to set the audio 'dialnorm' level.\n"
                                      "The sound volume will not be adjusted.", "blue")
@@ -471,8 +1444,8 @@ class AudioProcessor:
             self._put_raw_audio_info(self.audio_info)
 
             Utils.Console.cprint("{format}{channels} info{parser_used}".format(
-                format="TrueHD (Atmos)" if self.get_audio_info("format") and self.get_audio_info(
-                    "format") == AudioFormat.TRUEHD else "E-AC3",
+                format=("TrueHD" if self.get_audio_info("atmos") == 0 else "TrueHD (Atmos)")
+                if self.get_audio_info("format") == AudioFormat.TRUEHD else "E-AC3",
                 channels=f" {self.get_audio_info('channels')}" if self.get_audio_info('channels') else "",
                 parser_used=f" got by {self.get_audio_info('parser_used').upper()}" if self.get_audio_info('parser_used') else ""
             ))
@@ -525,3 +1498,58 @@ class AudioProcessor:
                 file=self.temp_raw_info_file,
                 params=params or {k: v for k, v in kwargs.items() if k not in ("self", "params")}
             )
+
+    # ---------------------------
+    # Private FFmpeg progress reader
+    # ---------------------------
+    class _FFmpegProgress:
+        """
+        Reads the key=value blocks FFmpeg writes with '-progress pipe:1' (one block per update,
+        ended by 'progress=continue' or 'progress=end') from its stdout, and drains its stderr,
+        which '-loglevel error -nostats' leaves to real errors only.
+        """
+
+        def __init__(self, on_update: Optional[Callable[["AudioProcessor._FFmpegProgress"], None]] = None) -> None:
+            """
+            Args:
+                on_update: Called after every complete progress block
+            """
+            self.on_update: Optional[Callable[["AudioProcessor._FFmpegProgress"], None]] = on_update
+            self.seconds: float = 0.0
+            self.total_size: Optional[int] = None
+            self.speed: Optional[float] = None
+            self.finished: bool = False
+
+        def follow(self, proc: subprocess.Popen) -> List[str]:
+            """
+            Read progress until FFmpeg closes its stdout.
+            Args:
+                proc: FFmpeg process with text-mode stdout / stderr pipes
+            Returns:
+                List[str]: stderr lines
+            """
+            stderr: List[str] = []
+            reader = threading.Thread(target=lambda: stderr.extend(proc.stderr), daemon=True)
+            reader.start()
+            for line in proc.stdout:
+                self.feed(line)
+            reader.join()
+            return stderr
+
+        def feed(self, line: str) -> None:
+            """Take one line of the progress stream."""
+            key, _, value = line.strip().partition("=")
+            if key == "out_time_us" and value.isdigit():
+                self.seconds = int(value) / 1_000_000
+            elif key == "total_size" and value.isdigit():
+                self.total_size = int(value)
+            elif key == "speed":
+                # 'N/A' before the first frame and at the end of short runs
+                try:
+                    self.speed = float(value.rstrip("x"))
+                except ValueError:
+                    pass
+            elif key == "progress":
+                self.finished = value == "end"
+                if self.on_update is not None:
+                    self.on_update(self)
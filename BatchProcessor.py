@@ -0,0 +1,254 @@
+import contextlib
+import glob
+import io
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional, List, Dict, Union, Any, Tuple
+
+from AudioProcessor import AudioProcessor
+from Utils import Utils
+
+multiprocessing = Utils.Import.lazy("multiprocessing")
+
+
+class BatchProcessor:
+    """
+    Runs AudioProcessor jobs for many input files concurrently.
+    Metadata probing runs on a thread pool, jobs run on a process pool, and the
+    decode (GStreamer) and split/encode stages are limited by separate
+    cross-process semaphores, so many cores stay busy without thrashing the scratch disk.
+    """
+
+    EXTENSIONS = (".thd", ".truehd", ".mlp", ".ac3", ".eac3", ".ec3")
+
+    # Stage gates of the current worker process, set by _init_worker
+    _gates: Dict[str, Any] = {}
+
+    def __init__(self,
+                 processor_args: Dict[str, Any],
+                 decode_jobs: int = 1,
+                 encode_jobs: int = 1,
+                 probe_jobs: int = 4
+                 ) -> None:
+        """
+        Args:
+            processor_args: AudioProcessor constructor arguments (tool paths and channels)
+            decode_jobs: Maximum concurrent GStreamer decodes
+            encode_jobs: Maximum concurrent split/encode stages
+            probe_jobs: Maximum concurrent metadata probes
+        """
+        self.processor_args: Dict[str, Any] = processor_args
+        self.decode_jobs: int = decode_jobs
+        self.encode_jobs: int = encode_jobs
+        self.probe_jobs: int = probe_jobs
+
+    @classmethod
+    def from_config(cls, config: Any) -> "BatchProcessor":
+        """Build from the parsed InData configuration."""
+        return cls(processor_args=cls.processor_args(config),
+                   decode_jobs=config.decode_jobs,
+                   encode_jobs=config.encode_jobs,
+                   probe_jobs=config.probe_jobs)
+
+    @staticmethod
+    def processor_args(config: Any) -> Dict[str, Any]:
+        """AudioProcessor constructor arguments (tool paths, channels and caches) of an InData configuration."""
+        processor_args = {f"{name}_launch": getattr(config, f"{name}_launch") for name in config.BINS_REQ}
+        processor_args["channels"] = config.channels
+        processor_args["probe_cache"] = config.probe_cache
+        processor_args["pcm_cache"] = config.pcm_cache
+        processor_args["pcm_cache_size"] = config.pcm_cache_size
+        return processor_args
+
+    @staticmethod
+    def run_args(config: Any) -> Dict[str, Any]:
+        """AudioProcessor.run options of an InData configuration, shared by all jobs of the batch."""
+        return {
+            "keep_raw": config.keep_raw,
+            "no_numbers": config.no_numbers,
+            "bits": config.bits,
+            "delay": config.delay,
+            "volume": config.volume,
+            "loudness_target": config.loudness_target,
+            "channels_filter": config.channels_filter,
+            "engine": config.engine,
+            "split_jobs": config.split_jobs,
+            "decode_segments": config.decode_segments,
+            "output_format": config.output_format,
+            "silent_channels": config.silent_channels,
+            "silence_threshold": config.silence_threshold,
+            "progress_mode": config.progress_mode
+        }
+
+    @classmethod
+    def collect_inputs(cls, sources: List[Union[str, Path]]) -> List[Path]:
+        """
+        Expand files, glob patterns and directories into a de-duplicated list of source files.
+        Directories are scanned (non-recursively) for known TrueHD / AC3 extensions.
+        """
+        result: Dict[Path, None] = {}
+        for source in sources:
+            source = Utils.Format.to_str(source, True)
+            if not source:
+                continue
+            path = Path(source)
+            if path.is_dir():
+                candidates = sorted(p for p in path.iterdir() if p.suffix.lower() in cls.EXTENSIONS)
+            elif path.is_file():
+                candidates = [path]
+            else:
+                candidates = sorted(Path(p) for p in glob.glob(source, recursive=True))
+            for candidate in candidates:
+                if candidate.is_file():
+                    result.setdefault(candidate.absolute(), None)
+        return list(result)
+
+    # ------------------------------------------------------------------ #
+    #                           Public Methods                           #
+    # ------------------------------------------------------------------ #
+    def run(self, input_files: List[Path], output_dir: Optional[Path] = None, **run_args) -> int:
+        """
+        Process all input files and print an aggregate throughput summary.
+        Args:
+            input_files: Source files
+            output_dir: Directory for outputs, next to each source if None
+            run_args: AudioProcessor.run options shared by all jobs
+        Returns:
+            int: 0 if every job succeeded, 1 otherwise
+        """
+        if not input_files:
+            Utils.Console.cprint("\nNo input files found.", 'red')
+            return 1
+
+        start_time = time.time()
+        if output_dir is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+        probed = self._probe_all(input_files)
+
+        Utils.Console.cprint(f"\nProcessing {len(input_files)} files: decode_jobs={self.decode_jobs} "
+                             f"encode_jobs={self.encode_jobs}\n", 'green')
+        output_files = self._output_files(input_files, output_dir)
+        ctx = multiprocessing.get_context()
+        failed = 0
+        audio_seconds = 0.0
+        with ProcessPoolExecutor(max_workers=self.decode_jobs + self.encode_jobs,
+                                 mp_context=ctx,
+                                 initializer=self._init_worker,
+                                 initargs=(ctx.BoundedSemaphore(self.decode_jobs),
+                                           ctx.BoundedSemaphore(self.encode_jobs))) as pool:
+            try:
+                futures = {
+                    pool.submit(self._run_job, self.processor_args, {
+                        **run_args,
+                        "input_file": input_file,
+                        "output_file": output_files[input_file],
+                        "audio_info": probed.get(input_file)
+                    }): input_file
+                    for input_file in input_files
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    input_file = futures[future]
+                    duration = Utils.Format.to_float((probed.get(input_file) or {}).get("duration")) or 0
+                    try:
+                        code, elapsed, log = future.result()
+                    except Exception as e:  # broken pool, unpicklable job: a failed job, not a failed batch
+                        code, elapsed, log = 1, 0.0, f"{type(e).__name__}: {e}"
+                    if code == 0:
+                        audio_seconds += duration
+                        speed = f" {duration / elapsed:.1f}x realtime" if duration and elapsed else ""
+                        Utils.Console.cprint(f"[{done}/{len(futures)}] OK {input_file.name}{speed}", 'green')
+                    else:
+                        failed += 1
+                        Utils.Console.cprint(f"[{done}/{len(futures)}] FAILED ({code}) {input_file.name}", 'red')
+                        Utils.Console.cprint(log, 'darkgray')
+            except KeyboardInterrupt:
+                # the workers turn SIGINT into a failed job and would go on with the queued files
+                workers = list((pool._processes or {}).values())
+                pool.shutdown(wait=False, cancel_futures=True)
+                for worker in workers:
+                    if worker.is_alive():
+                        worker.terminate()
+                Utils.Console.cprint('\n\nBatch interrupted.', 'red')
+                return 1
+
+        self._print_summary(len(input_files), failed, audio_seconds, time.time() - start_time)
+        return 0 if not failed else 1
+
+    # ------------------------------------------------------------------ #
+    #                              Helpers                               #
+    # ------------------------------------------------------------------ #
+    def _probe_all(self, input_files: List[Path]) -> Dict[Path, Optional[Dict[str, Any]]]:
+        """Probe metadata of all inputs concurrently (probing is bound by external parsers)."""
+        print(f"\nProbing {len(input_files)} files...")
+        processor = AudioProcessor(**self.processor_args)
+        with ThreadPoolExecutor(max_workers=self.probe_jobs) as pool:
+            return dict(zip(input_files, pool.map(processor.probe, input_files)))
+
+    @staticmethod
+    def _output_files(input_files: List[Path], output_dir: Optional[Path]) -> Dict[Path, Path]:
+        """
+        Output .wav of every input, in output_dir or next to the input.
+        Inputs that would share a name (Movie.thd + Movie.ac3, a/x.thd + b/x.thd into one output_dir)
+        keep their extension in the stem, then also their parent directory name, then an index.
+        """
+        def _stem(input_file: Path, level: int) -> str:
+            parts = [input_file.parent.name if level > 1 else "", input_file.stem,
+                     input_file.suffix.lstrip(".").lower() if level > 0 else ""]
+            return "_".join(part for part in parts if part)
+
+        result: Dict[Path, Path] = {}
+        taken = set()
+        pending = list(input_files)
+        for level in range(3):
+            candidates = {input_file: (output_dir or input_file.parent) / f"{_stem(input_file, level)}.wav"
+                          for input_file in pending}
+            counts: Dict[str, int] = {}
+            for output_file in candidates.values():
+                counts[str(output_file).lower()] = counts.get(str(output_file).lower(), 0) + 1
+            pending = []
+            for input_file, output_file in candidates.items():
+                key = str(output_file).lower()  # case-insensitive file systems
+                if counts[key] == 1 and key not in taken:
+                    result[input_file] = output_file
+                    taken.add(key)
+                else:
+                    pending.append(input_file)
+        for input_file in pending:
+            index = 2
+            while str(output_file := (output_dir or input_file.parent) /
+                      f"{_stem(input_file, 2)}_{index}.wav").lower() in taken:
+                index += 1
+            result[input_file] = output_file
+            taken.add(str(output_file).lower())
+        return result
+
+    @staticmethod
+    def _print_summary(total: int, failed: int, audio_seconds: float, elapsed: float) -> None:
+        done = total - failed
+        files_per_hour = done / elapsed * 3600 if elapsed else 0
+        realtime = audio_seconds / elapsed if elapsed else 0
+        Utils.Console.cprint(f"\nBatch finished: {done}/{total} files in {Utils.Format.to_human_time(elapsed)}"
+                             f"{f' ({failed} failed)' if failed else ''}", 'red' if failed else 'green')
+        Utils.Console.cprint(f"Throughput: {files_per_hour:.1f} files/hour, {realtime:.1f}x realtime "
+                             f"({Utils.Format.to_human_time(audio_seconds)} of audio)", 'green')
+
+    @staticmethod
+    def _init_worker(decode_gate: Any, encode_gate: Any) -> None:
+        BatchProcessor._gates = {"decode": decode_gate, "encode": encode_gate}
+
+    @staticmethod
+    def _run_job(processor_args: Dict[str, Any], run_args: Dict[str, Any]) -> Tuple[int, float, str]:
+        """Run one job in a worker process; its console output is captured, not interleaved."""
+        log = io.StringIO()
+        start_time = time.time()
+        with contextlib.redirect_stdout(log):
+            try:
+                code = AudioProcessor(**processor_args).run(**run_args, stage_gates=BatchProcessor._gates)
+            except Exception:  # one broken job must not stop the batch
+                print(traceback.format_exc())
+                code = 1
+        # progress bar lines are carriage-return separated, keep only the tail
+        return code, time.time() - start_time, log.getvalue().replace("\r", "\n")[-2000:]
@@ -0,0 +1,295 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+from typing import Optional, List, Dict, Callable, Tuple
+
+from AudioInfo import AudioInfo, AudioFormat
+from AudioProcessor import AudioProcessor
+from ChannelSplitter import ChannelSplitter, SplitEngine
+from InData import InData
+from ToolRegistry import ToolRegistry
+from Utils import Utils
+
+
+class Benchmark:
+    """
+    Benchmark suite for the pipeline stages, on synthetic inputs.
+    Generates F32LE multichannel .raw intermediates for every InData.CHANNELS layout and
+    times the SoX → FFmpeg and FFmpeg-only splits (if the binaries are found), the native splitter, the
+    Utils.Format converters and AudioInfo parsing of synthetic AC-3 / TrueHD / DTS streams.
+    Results (best of 'repeat' runs) are reported in MB/s and x-realtime, can be saved
+    as a JSON baseline and compared against one to flag slowdowns.
+    """
+
+    FREQUENCY = 48000
+    DURATIONS = (10, 60)
+    FORMAT_CALLS = 20000
+
+    def __init__(self,
+                 work_dir: Path,
+                 layouts: Optional[List[str]] = None,
+                 durations: Optional[List[float]] = None,
+                 sox_launch: Optional[Path] = None,
+                 ffmpeg_launch: Optional[Path] = None,
+                 repeat: int = 3
+                 ) -> None:
+        """
+        Args:
+            work_dir: Directory for the synthetic inputs and the split outputs
+            layouts: InData.CHANNELS keys, all layouts if None
+            durations: Synthetic input lengths in seconds
+            sox_launch: SoX executable, the SoX → FFmpeg split is skipped if it or FFmpeg is missing
+            ffmpeg_launch: FFmpeg executable
+            repeat: Runs per case, the fastest one is reported
+        """
+        self.work_dir: Path = work_dir
+        self.layouts: List[str] = layouts or list(InData.CHANNELS)
+        self.durations: List[float] = durations or list(self.DURATIONS)
+        self.sox_launch: Optional[Path] = sox_launch
+        self.ffmpeg_launch: Optional[Path] = ffmpeg_launch
+        self.repeat: int = max(1, repeat)
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    # ------------------------------------------------------------------ #
+    #                           Public Methods                           #
+    # ------------------------------------------------------------------ #
+    def run(self) -> Dict[str, Dict[str, float]]:
+        """Run every benchmark case, print one line per case and return the results."""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        with_ffmpeg = ToolRegistry.exists(self.ffmpeg_launch)
+        with_sox = with_ffmpeg and ToolRegistry.exists(self.sox_launch)
+        if not with_ffmpeg:
+            Utils.Console.cprint("FFmpeg not found, skipping the SoX → FFmpeg and FFmpeg splits.", "blue")
+        elif not with_sox:
+            Utils.Console.cprint("SoX not found, skipping the SoX → FFmpeg split.", "blue")
+        if not ChannelSplitter.is_available():
+            Utils.Console.cprint("NumPy not installed, skipping the native split.", "blue")
+
+        for layout in self.layouts:
+            for duration in self.durations:
+                raw_file = self._make_raw(layout, duration)
+                size = raw_file.stat().st_size
+                if ChannelSplitter.is_available():
+                    self._record(f"split/native/{layout}/{duration:g}s", size, duration,
+                                 lambda: self._split(layout, raw_file, duration, SplitEngine.NATIVE))
+                if with_sox:
+                    # a gain, otherwise the engine leaves SoX out
+                    self._record(f"split/sox/{layout}/{duration:g}s", size, duration,
+                                 lambda: self._split(layout, raw_file, duration, SplitEngine.SOX_FFMPEG, volume=-1))
+                if with_ffmpeg:
+                    self._record(f"split/ffmpeg/{layout}/{duration:g}s", size, duration,
+                                 lambda: self._split(layout, raw_file, duration, SplitEngine.SOX_FFMPEG))
+                Utils.IO.delete_files(raw_file)
+
+        for duration in self.durations:
+            for audio_format, file in self._make_streams(duration).items():
+                self._record(f"parse/{audio_format}/{duration:g}s", file.stat().st_size, duration,
+                             lambda: self._parse(file))
+
+        for name, call in self._format_cases().items():
+            self._record(f"format/{name}", 0, 0, call)
+        return self.results
+
+    def save(self, file: Path) -> None:
+        """Save the results as a JSON baseline."""
+        file.write_text(json.dumps({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": ChannelSplitter.is_available(),
+            "results": self.results
+        }, indent=2), encoding="utf-8")
+
+    def compare(self, baseline_file: Path, threshold: float = 0.1) -> List[str]:
+        """
+        Compare the results with a saved baseline.
+        Returns:
+            List[str]: Cases slower than the baseline by more than threshold (0.1 = 10%)
+        """
+        baseline = json.loads(baseline_file.read_text(encoding="utf-8")).get("results", {})
+        regressions: List[str] = []
+        print(f"\n{'case':<32} {'baseline':>10} {'current':>10} {'change':>8}")
+        for name, result in self.results.items():
+            if not (base := baseline.get(name)) or not base.get("seconds"):
+                continue
+            change = result["seconds"] / base["seconds"] - 1
+            slower = change > threshold
+            if slower:
+                regressions.append(name)
+            Utils.Console.cprint(f"{name:<32} {base['seconds']:>9.4f}s {result['seconds']:>9.4f}s {change:>+8.1%}",
+                                 'red' if slower else 'default')
+        return regressions
+
+    # ------------------------------------------------------------------ #
+    #                               Cases                                #
+    # ------------------------------------------------------------------ #
+    def _record(self, name: str, size: int, duration: float, case: Callable[[], None]) -> None:
+        seconds = min(self._time(case) for _ in range(self.repeat))
+        result = {"seconds": seconds}
+        if size:
+            result["mb_per_s"] = size / 1e6 / seconds if seconds else 0
+        if duration:
+            result["x_realtime"] = duration / seconds if seconds else 0
+        self.results[name] = result
+        Utils.Console.cprint(f"{name:<32} {seconds:>9.4f}s" + (
+            f" {result['mb_per_s']:>9.1f} MB/s" if size else "") + (
+            f" {result['x_realtime']:>9.1f}x realtime" if duration else ""))
+
+    @staticmethod
+    def _time(case: Callable[[], None]) -> float:
+        start = time.perf_counter()
+        case()
+        return time.perf_counter() - start
+
+    def _split(self, layout: str, raw_file: Path, duration: float, engine: str, volume: int = 0) -> None:
+        """Split raw_file with the AudioProcessor split stage of the given engine, with a gain of volume dB."""
+        processor = AudioProcessor(gst_launch=Path("gst-launch-1.0"), sox_launch=self.sox_launch,
+                                   ffmpeg_launch=self.ffmpeg_launch, eac3to_launch=Path("eac3to"),
+                                   mediainfo_launch=Path("mediainfo"), channels=InData.CHANNELS[layout])
+        runner = processor._Runner(processor, input_file=raw_file, output_file=raw_file.with_suffix(".wav"),
+                                   keep_raw=True, no_numbers=False, bits=24, delay=0, volume=volume, duration=0,
+                                   channels_filter=[], engine=engine, progress=lambda *args: None)
+        runner.audio_info.update(format=AudioFormat.AC3, duration=duration)
+        runner.delay = processor.get_delay_fix(AudioFormat.AC3)  # no net padding or trimming
+        with contextlib.redirect_stdout(io.StringIO()):
+            code = runner.run_native_split() if engine == SplitEngine.NATIVE else runner.run_sox_ffmpeg()
+        Utils.IO.delete_files(runner._output_files)
+        if code != 0:
+            raise RuntimeError(f"{engine} split of {raw_file.name} failed with code {code}")
+
+    @staticmethod
+    def _parse(file: Path) -> None:
+        info = AudioInfo(parsers={}, parser_priority={
+            AudioFormat.AC3: [AudioInfo.Parser.AC3],
+            AudioFormat.TRUEHD: [AudioInfo.Parser.TRUEHD],
+            AudioFormat.DTS: [AudioInfo.Parser.DTS],
+        }).parse(file)
+        if info.error:
+            raise RuntimeError(f"Parsing {file.name} failed: {info.error}")
+
+    def _format_cases(self) -> Dict[str, Callable[[], None]]:
+        """Utils.Format converters over FORMAT_CALLS typical inputs each."""
+        calls = range(self.FORMAT_CALLS)
+        return {
+            "to_float": lambda: [Utils.Format.to_float("1234.5") for _ in calls],
+            "to_int": lambda: [Utils.Format.to_int("-27") for _ in calls],
+            "to_frequency": lambda: [Utils.Format.to_frequency("48 kHz") for _ in calls],
+            "to_seconds": lambda: [Utils.Format.to_seconds("01:23:45") for _ in calls],
+            "to_human_time": lambda: [Utils.Format.to_human_time(5025.5, True) for _ in calls],
+        }
+
+    # ------------------------------------------------------------------ #
+    #                          Synthetic inputs                          #
+    # ------------------------------------------------------------------ #
+    def _make_raw(self, layout: str, duration: float) -> Path:
+        """F32LE interleaved raw file: one sine per channel at a different frequency."""
+        channels = len(InData.CHANNELS[layout]["names"])
+        second = array("f", (0.5 * math.sin(2 * math.pi * (100 + 50 * c) * i / self.FREQUENCY)
+                             for i in range(self.FREQUENCY) for c in range(channels)))
+        if sys.byteorder != "little":
+            second.byteswap()
+        raw_file = self.work_dir / f"bench_{layout}_{duration:g}s.raw"
+        with raw_file.open("wb") as f:
+            whole, part = int(duration), duration % 1
+            for _ in range(whole):
+                second.tofile(f)
+            f.write(second.tobytes()[:int(part * self.FREQUENCY) * channels * 4])
+        return raw_file
+
+    def _make_streams(self, duration: float) -> Dict[str, Path]:
+        """Constant bitrate synthetic AC-3 5.1, TrueHD 7.1 and DTS 5.1 streams of the given length."""
+        pack = self._pack
+        streams: Dict[str, Path] = {}
+
+        # AC-3 448 kbps 5.1, 1536 samples per frame
+        ac3 = pack((0x0B77, 16), (0, 16), (0, 2), (30, 6), (8, 5), (0, 3), (7, 3), (0, 2), (0, 2), (1, 1),
+                   (27, 5), size=1792)
+        streams["ac3"] = self._write_stream(f"bench_{duration:g}s.ac3", [ac3],
+                                            round(duration * self.FREQUENCY / 1536))
+
+        # TrueHD 7.1, 40 samples per access unit, major sync every 128 access units
+        major = pack((0x0014, 16), (0, 16), (0xF8726FBA, 32), (0, 4), (0, 4), (0, 2), (0, 2), (0b01111, 5),
+                     (0, 2), (0b0000001001111, 13), (0xB752, 16), (0, 48), (3, 4), (0, 4), (0, 8),
+                     (0, 17), (20, 6), (0, 6), (25, 5), (0, 11), (27, 5), size=40)
+        minor = pack((0x0014, 16), size=40)
+        streams["thd"] = self._write_stream(f"bench_{duration:g}s.thd", [major] + [minor] * 127,
+                                            round(duration * self.FREQUENCY / 40 / 128))
+
+        # DTS core 5.1 1509 kbps, 512 samples per frame
+        dts = pack((0x7FFE8001, 32), (1, 1), (31, 5), (0, 1), (15, 7), (2012, 14), (9, 6), (13, 4), (24, 5),
+                   (0, 10), (1, 2), (0, 2), (7, 4), (0, 7), (4, 4), size=2013)
+        streams["dts"] = self._write_stream(f"bench_{duration:g}s.dts", [dts],
+                                            round(duration * self.FREQUENCY / 512))
+        return streams
+
+    def _write_stream(self, name: str, period: List[bytes], count: int) -> Path:
+        file = self.work_dir / name
+        if not file.exists():
+            block = b"".join(period)
+            with file.open("wb") as f:
+                for _ in range(max(1, count)):
+                    f.write(block)
+        return file
+
+    @staticmethod
+    def _pack(*fields: Tuple[int, int], size: int) -> bytes:
+        """MSB-first bit fields (value, width), zero padded to size bytes."""
+        value, width = 0, 0
+        for field, bits in fields:
+            value = value << bits | field & ((1 << bits) - 1)
+            width += bits
+        data = (value << (-width % 8)).to_bytes((width + 7) // 8, "big")
+        return data + bytes(size - len(data))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages on synthetic inputs")
+    parser.add_argument('-c', '--channels', type=lambda v: [c for c in v.split(",") if c],
+                        default=list(InData.CHANNELS), help='Comma separated layouts (default: all)')
+    parser.add_argument('-d', '--durations', type=lambda v: [float(d) for d in v.split(",") if d],
+                        default=list(Benchmark.DURATIONS), help='Comma separated input lengths in seconds')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Runs per case, the fastest is reported')
+    parser.add_argument('-sox_launch', '--sox_launch', type=Path, default=Path("sox"), help='Path to SoX')
+    parser.add_argument('-ffmpeg_launch', '--ffmpeg_launch', type=Path, default=Path("ffmpeg"),
+                        help='Path to FFmpeg')
+    parser.add_argument('-w', '--work_dir', type=Path, default=None,
+                        help='Directory for synthetic files (default: a temporary directory)')
+    parser.add_argument('-s', '--save', type=Path, default=None, help='Save results as a JSON baseline')
+    parser.add_argument('-compare', '--compare', type=Path, default=None, help='Compare with a JSON baseline')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1,
+                        help='Slowdown ratio flagged as a regression by --compare (default: 0.1)')
+    args = parser.parse_args()
+
+    unknown = [c for c in args.channels if c not in InData.CHANNELS]
+    if unknown:
+        parser.error(f"unknown layouts: {', '.join(unknown)}")
+
+    work_dir = args.work_dir or Path(tempfile.mkdtemp(prefix="multyaudiotool_bench_"))
+    benchmark = Benchmark(work_dir=work_dir, layouts=args.channels, durations=args.durations,
+                          sox_launch=args.sox_launch, ffmpeg_launch=args.ffmpeg_launch, repeat=args.repeat)
+    try:
+        benchmark.run()
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.save:
+        benchmark.save(args.save)
+    if args.compare:
+        if regressions := benchmark.compare(args.compare, args.threshold):
+            Utils.Console.cprint(f"\n{len(regressions)} case(s) slower than the baseline by more than "
+                                 f"{args.threshold:.0%}", 'red')
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,669 @@
+import mmap
+from pathlib import Path
+from typing import Optional, List, Dict, Union, Iterator, Tuple, Set
+
+
+class BitstreamParser:
+    """
+    Native (pure Python) elementary stream header parsers.
+    Each parser reads the stream headers directly through an mmap of the file and
+    returns the same fields as AudioInfo.as_dict(), with no external process spawned.
+    """
+
+    class _BitReader:
+        """MSB-first bit reader over a bytes-like object."""
+
+        def __init__(self, data: Union[bytes, memoryview, mmap.mmap], offset: int = 0) -> None:
+            self.data = data
+            self.pos: int = offset * 8
+
+        def read(self, bits: int) -> int:
+            value = 0
+            for _ in range(bits):
+                value = (value << 1) | ((self.data[self.pos >> 3] >> (7 - (self.pos & 7))) & 1)
+                self.pos += 1
+            return value
+
+        def skip(self, bits: int) -> None:
+            self.pos += bits
+
+    @staticmethod
+    def _open(file: Path) -> Optional[mmap.mmap]:
+        """Read-only mmap of the whole file, None for empty or unreadable files."""
+        try:
+            with Path(file).open("rb") as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _channels(locations: Set[int], lfe_locations: Set[int], pairs: Set[int]) -> str:
+        """Format a set of speaker locations as 'main.lfe', counting paired locations twice."""
+        main = sum(2 if loc in pairs else 1 for loc in locations - lfe_locations)
+        return f"{main}.{len(locations & lfe_locations)}"
+
+    # ------------------------------------------------------------------ #
+    #                            AC-3 / E-AC-3                           #
+    # ------------------------------------------------------------------ #
+    class AC3:
+        """
+        AC-3 (bsid <= 10) and E-AC-3 (bsid 11..16) syncinfo / BSI parser.
+        Duration is the sample count of all independent substream 0 frames.
+        """
+
+        SYNC = b"\x0B\x77"
+        SAMPLE_RATES = (48000, 44100, 32000)
+        REDUCED_SAMPLE_RATES = (24000, 22050, 16000)  # E-AC-3 fscod == 3
+        BITRATES = (32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384, 448, 512, 576, 640)
+        BLOCKS = (1, 2, 3, 6)  # E-AC-3 numblkscod
+
+        # chanmap locations (bit 0 = MSB of the 16-bit field)
+        PAIRS = {5, 6, 9, 10, 11, 13}
+        LFE = {14, 15}
+        ACMOD_LOCATIONS = ({0, 2}, {1}, {0, 2}, {0, 1, 2}, {0, 2, 7}, {0, 1, 2, 7}, {0, 2, 3, 4}, {0, 1, 2, 3, 4})
+
+        CHECKPOINTS = 32  # constant frame pattern probes before trusting arithmetic frame counting
+
+        @classmethod
+        def parse(cls, file: Path) -> Optional[Dict[str, Union[str, int, float, None]]]:
+            """Return AudioInfo fields, or None if the file does not start with a valid frame."""
+            data = BitstreamParser._open(file)
+            if data is None:
+                return None
+            try:
+                return cls._parse(data)
+            except (IndexError, ValueError):
+                return None
+            finally:
+                data.close()
+
+        @classmethod
+        def _parse(cls, data: mmap.mmap) -> Optional[Dict[str, Union[str, int, float, None]]]:
+            first = cls.header(data, 0)
+            if first is None:
+                return None
+
+            # Speaker locations of the first program: independent frame + its dependent frames
+            locations = set()
+            offset, program = 0, 0
+            while (header := cls.header(data, offset)) is not None:
+                if header["independent"]:
+                    if offset and header["substreamid"] == 0:
+                        break
+                    program = header["substreamid"]
+                if program == 0:  # other programs do not change the main presentation
+                    if header["strmtyp"] != 1 or header["chanmap"] is None:
+                        locations |= cls.ACMOD_LOCATIONS[header["acmod"]] | ({15} if header["lfeon"] else set())
+                    else:
+                        locations |= {i for i in range(16) if header["chanmap"] & (0x8000 >> i)}
+                offset += header["size"]
+
+            samples, size = cls.count_samples(data)
+            duration = samples / first["rate"] if samples else None
+            bitrate = first["bitrate"] if not first["eac3"] else \
+                round(size * 8 / duration / 1000) if duration else None
+
+            return {
+                "format": "EAC3" if first["eac3"] else "AC3",
+                "duration": duration,
+                "channels": BitstreamParser._channels(locations, cls.LFE, cls.PAIRS),
+                "bitrate": bitrate,
+                "freq": first["rate"],
+                "dialnorm": first["dialnorm"],
+            }
+
+        @classmethod
+        def header(cls, data: Union[bytes, mmap.mmap], offset: int) -> Optional[Dict[str, Union[int, bool, None]]]:
+            """Decode syncinfo + BSI of the frame at offset, None if there is no valid frame."""
+            if data[offset:offset + 2] != cls.SYNC or len(data) < offset + 8:
+                return None
+            bsid = data[offset + 5] >> 3
+            if bsid <= 10:
+                fscod, frmsizecod = data[offset + 4] >> 6, data[offset + 4] & 0x3F
+                if fscod == 3 or frmsizecod >= 38:
+                    return None
+                rate = cls.SAMPLE_RATES[fscod]
+                kbps = cls.BITRATES[frmsizecod >> 1]
+                words = kbps * 96000 // rate + (frmsizecod & 1 if rate == 44100 else 0)
+                bits = BitstreamParser._BitReader(data, offset + 6)
+                acmod = bits.read(3)
+                if acmod & 1 and acmod != 1:
+                    bits.skip(2)  # cmixlev
+                if acmod & 4:
+                    bits.skip(2)  # surmixlev
+                if acmod == 2:
+                    bits.skip(2)  # dsurmod
+                lfeon = bits.read(1)
+                dialnorm = bits.read(5)
+                return {
+                    "eac3": False, "size": words * 2, "samples": 1536, "rate": rate, "bitrate": kbps,
+                    "strmtyp": 0, "substreamid": 0, "independent": True,
+                    "acmod": acmod, "lfeon": lfeon, "dialnorm": -(dialnorm or 31), "chanmap": None
+                }
+            if bsid <= 16:
+                bits = BitstreamParser._BitReader(data, offset + 2)
+                strmtyp = bits.read(2)
+                substreamid = bits.read(3)
+                size = (bits.read(11) + 1) * 2
+                fscod = bits.read(2)
+                if fscod == 3:
+                    rate, blocks = cls.REDUCED_SAMPLE_RATES[bits.read(2)], 6
+                else:
+                    rate, blocks = cls.SAMPLE_RATES[fscod], cls.BLOCKS[bits.read(2)]
+                acmod = bits.read(3)
+                lfeon = bits.read(1)
+                bits.skip(5)  # bsid
+                dialnorm = bits.read(5)
+                if bits.read(1):  # compre
+                    bits.skip(8)
+                if acmod == 0:
+                    bits.skip(5)  # dialnorm2
+                    if bits.read(1):  # compr2e
+                        bits.skip(8)
+                chanmap = bits.read(16) if strmtyp == 1 and bits.read(1) else None
+                return {
+                    "eac3": True, "size": size, "samples": blocks * 256, "rate": rate, "bitrate": None,
+                    "strmtyp": strmtyp, "substreamid": substreamid, "independent": strmtyp != 1,
+                    "acmod": acmod, "lfeon": lfeon, "dialnorm": -(dialnorm or 31), "chanmap": chanmap
+                }
+            return None
+
+        @classmethod
+        def iter_frames(cls, data: Union[bytes, mmap.mmap], offset: int = 0) -> Iterator[Tuple[int, int, int]]:
+            """
+            Yield (offset, size, samples) of every frame, samples counted for independent
+            substream 0 only. Stops at the first invalid frame.
+            """
+            sync, size_total = cls.SYNC, len(data)
+            while offset + 6 <= size_total and data[offset:offset + 2] == sync:
+                b2, b4 = data[offset + 2], data[offset + 4]
+                if data[offset + 5] >> 3 <= 10:
+                    if b4 >> 6 == 3 or b4 & 0x3F >= 38:
+                        return
+                    rate = cls.SAMPLE_RATES[b4 >> 6]
+                    size = (cls.BITRATES[(b4 & 0x3F) >> 1] * 96000 // rate + (b4 & 1 if rate == 44100 else 0)) * 2
+                    samples = 1536
+                else:
+                    size = (((b2 & 0x07) << 8 | data[offset + 3]) + 1) * 2
+                    samples = 0 if b2 >> 6 == 1 or (b2 >> 3) & 0x07 else \
+                        1536 if b4 >> 6 == 3 else cls.BLOCKS[(b4 >> 4) & 0x03] * 256
+                if offset + size > size_total:
+                    return
+                yield offset, size, samples
+                offset += size
+
+        @classmethod
+        def count_samples(cls, data: mmap.mmap) -> Tuple[int, int]:
+            """
+            Return (samples, stream bytes) of the valid frames.
+            Streams with a constant frame pattern are counted arithmetically after verifying
+            the pattern at evenly spaced checkpoints; anything else is walked frame by frame.
+            """
+            # One program period: frames up to the next independent substream 0 frame
+            period, period_samples = 0, 0
+            for offset, size, samples in cls.iter_frames(data):
+                if offset and samples:
+                    break
+                period += size
+                period_samples += samples
+
+            if period and period_samples and len(data) % period == 0:
+                periods = len(data) // period
+                checkpoints = {periods - 1} | {i * periods // cls.CHECKPOINTS for i in range(cls.CHECKPOINTS)}
+                if all(cls._period_matches(data, i * period, period, period_samples) for i in checkpoints):
+                    return periods * period_samples, len(data)
+
+            total_samples, end = 0, 0
+            for offset, size, samples in cls.iter_frames(data):
+                total_samples += samples
+                end = offset + size
+            return total_samples, end
+
+        @classmethod
+        def restart_point(cls, file: Path, sample: int) -> Optional[Tuple[int, int]]:
+            """
+            Return (byte offset, sample position) of the last frame at or before sample that starts
+            a program period, where a decoder can start. None if the stream cannot be parsed.
+            """
+            data = BitstreamParser._open(file)
+            if data is None:
+                return None
+            try:
+                point, position = None, 0
+                for offset, _, samples in cls.iter_frames(data):
+                    if samples:  # independent substream 0
+                        if position > sample:
+                            break
+                        point = offset, position
+                    position += samples
+                return point
+            except (IndexError, ValueError):
+                return None
+            finally:
+                data.close()
+
+        @classmethod
+        def _period_matches(cls, data: mmap.mmap, offset: int, period: int, period_samples: int) -> bool:
+            size_sum, samples_sum = 0, 0
+            for _, size, samples in cls.iter_frames(data, offset):
+                if size_sum and samples:
+                    break
+                size_sum += size
+                samples_sum += samples
+                if size_sum >= period:
+                    break
+            return size_sum == period and samples_sum == period_samples
+
+    # ------------------------------------------------------------------ #
+    #                               TrueHD                               #
+    # ------------------------------------------------------------------ #
+    class TrueHD:
+        """
+        Dolby TrueHD major sync parser.
+        Every access unit starts with a 4-byte header (check nibble, length in 16-bit words,
+        input timing); access units carrying a major sync have the F8726FBA signature after it.
+        Duration is the access unit count times the fixed access unit sample count.
+        """
+
+        SYNC = b"\xF8\x72\x6F\xBA"
+        SIGNATURE = b"\xB7\x52"  # major_sync_info signature, rules out payload false positives
+        SAMPLE_RATES = {0: 48000, 1: 96000, 2: 192000, 8: 44100, 9: 88200, 10: 176400}
+
+        # channel assignment bits: LR C LFE LRs LRvh LRc LRrs Cs Ts LRsd LRw Cvh LFE2
+        PAIRS = {0, 3, 4, 5, 6, 9, 10}
+        LFE = {2, 12}
+
+        CHECKPOINTS = 32  # major sync intervals walked before trusting a constant interval
+
+        @classmethod
+        def parse(cls, file: Path) -> Optional[Dict[str, Union[str, int, float, None]]]:
+            """Return AudioInfo fields, or None if no major sync is found at the start of the file."""
+            data = BitstreamParser._open(file)
+            if data is None:
+                return None
+            try:
+                return cls._parse(data)
+            except (IndexError, ValueError):
+                return None
+            finally:
+                data.close()
+
+        @classmethod
+        def _parse(cls, data: mmap.mmap) -> Optional[Dict[str, Union[str, int, float, None]]]:
+            sync = cls.major_sync(data, 0)
+            if sync is None:
+                return None
+
+            access_units, size = cls.count_access_units(data)
+            duration = access_units * sync["au_samples"] / sync["rate"] if access_units else None
+
+            return {
+                "format": "THD",
+                "duration": duration,
+                "channels": sync["channels"],
+                "bitrate": round(size * 8 / duration / 1000) if duration else None,
+                "freq": sync["rate"],
+                "dialnorm": sync["dialnorm"],
+                "atmos": sync["atmos"],
+            }
+
+        @classmethod
+        def major_sync(cls, data: Union[bytes, mmap.mmap], offset: int) -> Optional[Dict[str, Union[int, str, bool, None]]]:
+            """Decode the major sync of the access unit at offset, None if it carries none."""
+            s = offset + 4
+            if data[s:s + 4] != cls.SYNC or len(data) < s + 28:
+                return None
+            rate_code = data[s + 4] >> 4
+            if rate_code not in cls.SAMPLE_RATES:
+                return None
+
+            bits = BitstreamParser._BitReader(data, s + 5)
+            bits.skip(2)  # 6ch presentation channel modifier
+            bits.skip(2)  # 2ch presentation channel modifier
+            assignment_6ch = bits.read(5)
+            bits.skip(2)  # 8ch presentation channel modifier
+            assignment_8ch = bits.read(13)
+
+            substreams = data[s + 16] >> 4
+            substream_info = data[s + 17]
+
+            # channel_meaning(): per presentation dialogue normalization, 0 = not signalled
+            bits = BitstreamParser._BitReader(data, s + 18)
+            bits.skip(6 + 4 + 7)  # reserved, control enabled flags, drc_start_up_gain
+            dialnorm_2ch = bits.read(6)
+            bits.skip(6)
+            dialnorm_6ch = bits.read(5)
+            bits.skip(6 + 5)
+            dialnorm_8ch = bits.read(5)
+            dialnorm = dialnorm_8ch if substreams >= 3 else dialnorm_6ch if substreams >= 2 else dialnorm_2ch
+
+            assignment = assignment_8ch if substreams >= 3 and assignment_8ch else assignment_6ch
+            locations = {i for i in range(13) if assignment & (1 << i)}
+
+            return {
+                "rate": cls.SAMPLE_RATES[rate_code],
+                "au_samples": 40 << (rate_code & 7),
+                "channels": BitstreamParser._channels(locations, cls.LFE, cls.PAIRS),
+                "substreams": substreams,
+                "atmos": substreams == 4 and bool(substream_info >> 7),
+                "dialnorm": -dialnorm if dialnorm else None,
+            }
+
+        @classmethod
+        def iter_access_units(cls, data: Union[bytes, mmap.mmap], offset: int = 0) -> Iterator[Tuple[int, int]]:
+            """Yield (offset, size) of every complete access unit."""
+            end = len(data)
+            while offset + 4 <= end:
+                size = ((data[offset] & 0x0F) << 8 | data[offset + 1]) << 1
+                if size < 4 or offset + size > end:
+                    return
+                yield offset, size
+                offset += size
+
+        @classmethod
+        def count_access_units(cls, data: mmap.mmap) -> Tuple[int, int]:
+            """
+            Return (access units, stream bytes).
+            When major syncs repeat every N access units only the tail after the last sync
+            is walked; otherwise every access unit is walked.
+            """
+            syncs = cls._major_syncs(data)
+            if interval := cls._sync_interval(data, syncs):
+                count, end = cls._walk(data, syncs[-1], len(data))
+                return (len(syncs) - 1) * interval + count, end
+            return cls._walk(data, 0, len(data))
+
+        @classmethod
+        def restart_point(cls, file: Path, sample: int) -> Optional[Tuple[int, int]]:
+            """
+            Return (byte offset, sample position) of the last major sync at or before sample,
+            where a decoder can restart bit-exactly. None if the stream cannot be parsed.
+            """
+            data = BitstreamParser._open(file)
+            if data is None:
+                return None
+            try:
+                if (sync := cls.major_sync(data, 0)) is None:
+                    return None
+                au_samples = sync["au_samples"]
+                syncs = cls._major_syncs(data)
+                if interval := cls._sync_interval(data, syncs):
+                    index = min(max(sample, 0) // (interval * au_samples), len(syncs) - 1)
+                    return syncs[index], index * interval * au_samples
+
+                point, known = (0, 0), set(syncs)
+                for count, (offset, _) in enumerate(cls.iter_access_units(data)):
+                    if count * au_samples > sample:
+                        break
+                    if offset in known:
+                        point = offset, count * au_samples
+                return point
+            except (IndexError, ValueError):
+                return None
+            finally:
+                data.close()
+
+        @classmethod
+        def _major_syncs(cls, data: mmap.mmap) -> List[int]:
+            """Offsets of the access units carrying a major sync, located with a C-speed signature search."""
+            syncs = []
+            position = data.find(cls.SYNC, 4)
+            while position != -1:
+                if data[position + 8:position + 10] == cls.SIGNATURE:
+                    syncs.append(position - 4)
+                position = data.find(cls.SYNC, position + 4)
+            return syncs
+
+        @classmethod
+        def _sync_interval(cls, data: mmap.mmap, syncs: List[int]) -> Optional[int]:
+            """
+            Access units between consecutive major syncs if it is constant, verified by walking
+            between syncs at evenly spaced checkpoints. None for irregular streams.
+            """
+            if len(syncs) > 2 and syncs[0] == 0:
+                interval = cls._walk(data, syncs[0], syncs[1])[0]
+                pairs = {len(syncs) - 2} | {i * (len(syncs) - 1) // cls.CHECKPOINTS for i in range(cls.CHECKPOINTS)}
+                if interval and all(cls._walk(data, syncs[i], syncs[i + 1]) == (interval, syncs[i + 1])
+                                    for i in pairs):
+                    return interval
+            return None
+
+        @staticmethod
+        def _walk(data: Union[bytes, mmap.mmap], offset: int, end: int) -> Tuple[int, int]:
+            """Walk access units from offset up to end, return (count, offset after the last complete unit)."""
+            count, limit = 0, len(data)
+            while offset < end and offset + 4 <= limit:
+                size = ((data[offset] & 0x0F) << 8 | data[offset + 1]) << 1
+                if size < 4 or offset + size > limit:
+                    break
+                offset += size
+                count += 1
+            return count, offset
+
+    # ------------------------------------------------------------------ #
+    #                           DTS / DTS-HD                             #
+    # ------------------------------------------------------------------ #
+    class DTS:
+        """
+        DTS core frame and DTS-HD extension substream (ExSS) parser, 16-bit big endian streams.
+        A DTS-HD frame is a core frame followed by an ExSS frame (or an ExSS frame alone for
+        streams without core); the lossless / high resolution properties come from the first
+        ExSS asset descriptor, the core properties from the core frame header.
+        Duration is the frame count times the samples per frame.
+        """
+
+        SYNC = b"\x7F\xFE\x80\x01"
+        EXSS_SYNC = b"\x64\x58\x20\x25"
+        XLL_SYNC = b"\x41\xA2\x95\x47"  # lossless (Master Audio)
+        XBR_SYNC = b"\x65\x5E\x31\x5E"  # extra bitrate (High Resolution)
+        X96_SYNC = b"\x1D\x95\xF2\x62"  # 96 kHz extension (High Resolution)
+        LBR_SYNC = b"\x0A\x80\x19\x21"  # low bitrate (Express)
+
+        SAMPLE_RATES = {1: 8000, 2: 16000, 3: 32000, 6: 11025, 7: 22050, 8: 44100, 11: 12000, 12: 24000, 13: 48000}
+        EXSS_SAMPLE_RATES = (8000, 16000, 32000, 64000, 128000, 22050, 44100, 88200,
+                             176400, 352800, 12000, 24000, 48000, 96000, 192000, 384000)
+        REF_CLOCKS = (32000, 44100, 48000)
+        AMODE_CHANNELS = (1, 2, 2, 2, 2, 3, 3, 4, 4, 5, 6, 6, 6, 7, 8, 8)
+
+        # ExSS speaker activity mask bits: C LR LsRs LFE1 Cs LhRh LsrRsr Ch Oh LcRc LwRw LssRss LFE2 ...
+        PAIRS = {1, 2, 5, 6, 9, 10, 11, 13, 15}
+        LFE = {3, 12}
+
+        CHECKPOINTS = 32  # constant frame size probes before trusting arithmetic frame counting
+
+        @classmethod
+        def parse(cls, file: Path) -> Optional[Dict[str, Union[str, int, float, None]]]:
+            """Return AudioInfo fields, or None if the file does not start with a valid frame."""
+            data = BitstreamParser._open(file)
+            if data is None:
+                return None
+            try:
+                return cls._parse(data)
+            except (IndexError, ValueError):
+                return None
+            finally:
+                data.close()
+
+        @classmethod
+        def _parse(cls, data: mmap.mmap) -> Optional[Dict[str, Union[str, int, float, None]]]:
+            core = cls.core_header(data, 0)
+            exss = cls.exss_header(data, core["size"] if core else 0)
+            if core is None and (exss is None or exss["rate"] is None):
+                return None
+
+            frames, size = cls.count_frames(data)
+            if core:
+                duration = frames * core["samples"] / core["rate"] if frames else None
+                core_info = "DTS{es}, {channels} channels, {bitrate}kbps, {rate:g}kHz".format(
+                    es="-ES" if core["xch"] else "", channels=core["channels"],
+                    bitrate=core["bitrate"], rate=core["rate"] / 1000)
+            else:
+                duration = frames * exss["samples"] / exss["ref_clock"] if frames else None
+                core_info = None
+
+            if exss is None or exss["rate"] is None:
+                return {
+                    "format": "DTS",
+                    "duration": duration,
+                    "channels": core["channels"],
+                    "bitrate": core["bitrate"],
+                    "freq": core["rate"],
+                    "dialnorm": core["dialnorm"],
+                    "core": core_info,
+                }
+
+            return {
+                "format": exss["format"],
+                "duration": duration,
+                "channels": exss["channels"] or (core["channels"] if core else None),
+                "bitrate": round(size * 8 / duration / 1000) if duration else None,
+                "freq": exss["rate"],
+                "dialnorm": core["dialnorm"] if core else None,
+                "core": core_info,
+            }
+
+        @classmethod
+        def core_header(cls, data: Union[bytes, mmap.mmap], offset: int) -> Optional[Dict[str, Union[int, str, bool, None]]]:
+            """Decode the core frame header at offset, None if there is no valid core frame."""
+            if data[offset:offset + 4] != cls.SYNC or len(data) < offset + 16:
+                return None
+            bits = BitstreamParser._BitReader(data, offset + 4)
+            bits.skip(1 + 5)  # frame type, deficit sample count
+            crc_present = bits.read(1)
+            samples = (bits.read(7) + 1) * 32
+            size = bits.read(14) + 1
+            amode = bits.read(6)
+            rate = cls.SAMPLE_RATES.get(bits.read(4))
+            bits.skip(5)  # nominal transmission rate, the effective one is derived from the frame size
+            bits.skip(1 + 1 + 1 + 1 + 1)  # downmix, dynamic range, time stamp, aux data, HDCD
+            ext_audio_id = bits.read(3)
+            ext_audio = bits.read(1)
+            bits.skip(1)  # audio sync word insertion
+            lfe = bits.read(2)
+            bits.skip(1 + (16 if crc_present else 0))  # predictor history, header CRC
+            bits.skip(1)  # multirate interpolator
+            version = bits.read(4)
+            bits.skip(2 + 3 + 1 + 1)  # copy history, source PCM resolution, front / surround sum
+            dialnorm = bits.read(4)
+            if rate is None or size < 96 or amode >= len(cls.AMODE_CHANNELS):
+                return None
+
+            xch = bool(ext_audio) and ext_audio_id == 0  # DTS-ES discrete back center
+            return {
+                "size": size,
+                "samples": samples,
+                "rate": rate,
+                "bitrate": size * 8 * rate // samples // 1000,
+                "channels": f"{cls.AMODE_CHANNELS[amode] + xch}.{1 if lfe else 0}",
+                "xch": xch,
+                "dialnorm": -(16 + dialnorm) if version == 6 else -dialnorm if version == 7 else None,
+            }
+
+        @classmethod
+        def exss_header(cls, data: Union[bytes, mmap.mmap], offset: int) -> Optional[Dict[str, Union[int, str, None]]]:
+            """
+            Decode the ExSS frame at offset and the descriptor of its first asset,
+            None if there is no ExSS frame. Asset fields are None without static fields.
+            """
+            if data[offset:offset + 4] != cls.EXSS_SYNC or len(data) < offset + 16:
+                return None
+            bits = BitstreamParser._BitReader(data, offset + 4)
+            bits.skip(8)  # user defined
+            index = bits.read(2)
+            long_header = bits.read(1)
+            header_size = bits.read(12 if long_header else 8) + 1
+            size = bits.read(20 if long_header else 16) + 1
+            result = {"size": size, "format": None, "rate": None, "bits": None, "channels": None,
+                      "samples": None, "ref_clock": None}
+            if not bits.read(1):  # static fields
+                return result
+
+            result["ref_clock"] = cls.REF_CLOCKS[bits.read(2)]
+            result["samples"] = 512 * (bits.read(3) + 1)
+            if bits.read(1):
+                bits.skip(32 + 4)  # time stamp
+            presentations = bits.read(3) + 1
+            assets = bits.read(3) + 1
+            active_masks = [bits.read(index + 1) for _ in range(presentations)]
+            for mask in active_masks:
+                bits.skip(8 * bin(mask).count("1"))  # active asset masks
+            if bits.read(1):  # mixing metadata
+                bits.skip(2)
+                mask_bits = (bits.read(2) + 1) << 2
+                bits.skip(mask_bits * (bits.read(2) + 1))
+            bits.skip(assets * (20 if long_header else 16))  # asset sizes
+
+            # first asset descriptor
+            bits.skip(9 + 3)  # descriptor size, asset index
+            if bits.read(1):
+                bits.skip(4)  # asset type
+            if bits.read(1):
+                bits.skip(24)  # language
+            if bits.read(1):
+                bits.skip((bits.read(10) + 1) * 8)  # info text
+            result["bits"] = bits.read(5) + 1
+            result["rate"] = cls.EXSS_SAMPLE_RATES[bits.read(4)]
+            total_channels = bits.read(8) + 1
+            speaker_mask = None
+            if bits.read(1):  # one to one channel to speaker mapping
+                if total_channels > 2:
+                    bits.skip(1)  # embedded stereo
+                if total_channels > 6:
+                    bits.skip(1)  # embedded 5.1
+                if bits.read(1):
+                    speaker_mask = bits.read((bits.read(2) + 1) << 2)
+            if speaker_mask:
+                locations = {i for i in range(16) if speaker_mask & (1 << i)}
+                result["channels"] = BitstreamParser._channels(locations, cls.LFE, cls.PAIRS)
+
+            payload = (offset + header_size, offset + size)
+            result["format"] = (
+                "DTSHD_MA" if data.find(cls.XLL_SYNC, *payload) != -1
+                else "DTS_EXPRESS" if data.find(cls.LBR_SYNC, *payload) != -1
+                else "DTSHD_HRA" if data.find(cls.XBR_SYNC, *payload) != -1 or data.find(cls.X96_SYNC, *payload) != -1
+                else "DTS"
+            )
+            return result
+
+        @classmethod
+        def iter_frames(cls, data: Union[bytes, mmap.mmap], offset: int = 0) -> Iterator[Tuple[int, int]]:
+            """Yield (offset, size) of every complete frame, a core frame including its ExSS frame."""
+            end = len(data)
+            core_sync, exss_sync = cls.SYNC, cls.EXSS_SYNC
+            while offset + 10 <= end:
+                size = 0
+                if data[offset:offset + 4] == core_sync:
+                    size = ((data[offset + 5] & 0x03) << 12 | data[offset + 6] << 4 | data[offset + 7] >> 4) + 1
+                if data[offset + size:offset + size + 4] == exss_sync and offset + size + 10 <= end:
+                    b = offset + size + 5
+                    if data[b] & 0x20:
+                        size += ((data[b + 1] & 0x01) << 19 | data[b + 2] << 11 | data[b + 3] << 3 | data[b + 4] >> 5) + 1
+                    else:
+                        size += ((data[b + 1] & 0x1F) << 11 | data[b + 2] << 3 | data[b + 3] >> 5) + 1
+                if not size or offset + size > end:
+                    return
+                yield offset, size
+                offset += size
+
+        @classmethod
+        def count_frames(cls, data: mmap.mmap) -> Tuple[int, int]:
+            """
+            Return (frames, stream bytes) of the valid frames.
+            Constant size streams (plain core) are counted arithmetically after verifying
+            the frame size at evenly spaced checkpoints; anything else is walked frame by frame.
+            """
+            first = next(cls.iter_frames(data), None)
+            if first is None:
+                return 0, 0
+            size = first[1]
+            if len(data) % size == 0:
+                frames = len(data) // size
+                checkpoints = {frames - 1} | {i * frames // cls.CHECKPOINTS for i in range(cls.CHECKPOINTS)}
+                if all(next(cls.iter_frames(data, i * size), None) == (i * size, size) for i in checkpoints):
+                    return frames, len(data)
+
+            frames, end = 0, 0
+            for offset, size in cls.iter_frames(data):
+                frames += 1
+                end = offset + size
+            return frames, end
@@ -0,0 +1,430 @@
+import struct
+import subprocess
+from pathlib import Path
+from typing import Optional, List, Tuple, Callable, Iterator, BinaryIO, Union
+
+from Utils import Utils
+
+# optional: without NumPy the SoX → FFmpeg engine is used; loaded on first use
+np = Utils.Import.lazy("numpy")
+
+
+class SplitEngine:
+    NATIVE = "native"  # in-process NumPy splitter
+    SOX_FFMPEG = "sox"  # SoX → FFmpeg pipeline
+
+
+class RawFormat:
+    """Sample formats of the decoded PCM intermediate, named as in the GStreamer caps."""
+    F32LE = "F32LE"
+    S24LE = "S24LE"
+    S16LE = "S16LE"
+
+    SIZES = {F32LE: 4, S24LE: 3, S16LE: 2}  # bytes per sample
+    SOX = {F32LE: "f32", S24LE: "s24", S16LE: "s16"}  # SoX '-t' file types
+    FFMPEG = {F32LE: "f32le", S24LE: "s24le", S16LE: "s16le"}  # FFmpeg raw formats (pcm_<name> codecs)
+
+    @staticmethod
+    def from_bits(bits: int) -> str:
+        """Sample format of the requested output size: 32 -> float, 16 -> 16-bit, anything else -> 24-bit."""
+        return RawFormat.F32LE if bits == 32 else RawFormat.S16LE if bits == 16 else RawFormat.S24LE
+
+
+class OutputFormat:
+    """Container / codec of the per-channel output files."""
+    WAV = "wav"
+    FLAC = "flac"  # lossless, 16 / 24-bit integer only
+    W64 = "w64"  # Sony Wave64, 64-bit chunk sizes for titles beyond the 4 GB WAV limit
+    RF64 = "rf64"  # EBU RF64, WAV with 64-bit sizes (.wav extension)
+
+    ALL = (WAV, FLAC, W64, RF64)
+    EXTENSIONS = {WAV: "wav", FLAC: "flac", W64: "w64", RF64: "wav"}
+
+    @staticmethod
+    def ffmpeg_args(output_format: str, bits: int) -> List[str]:
+        """FFmpeg codec / muxer options writing one output file of the format."""
+        if output_format == OutputFormat.FLAC:
+            return ["-c:a", "flac"]
+        codec = ["-c:a", f"pcm_{RawFormat.FFMPEG[RawFormat.from_bits(bits)]}"]
+        if output_format == OutputFormat.W64:
+            return [*codec, "-f", "w64"]
+        if output_format == OutputFormat.RF64:
+            return [*codec, "-f", "wav", "-rf64", "always"]
+        return codec
+
+
+class SilencePolicy:
+    """What to do with output channels whose peak never exceeds the silence threshold."""
+    KEEP = "keep"  # write every channel, no activity scan
+    MARK = "mark"  # write every channel, list the silent ones in the channel manifest
+    SKIP = "skip"  # do not write silent channels, list them in the channel manifest
+
+    ALL = (KEEP, MARK, SKIP)
+    DEFAULT_THRESHOLD = -90.0  # dBFS, sample peak of the decoded source
+
+
+class ChannelSplitter:
+    """
+    In-process replacement for the SoX → FFmpeg stage.
+    Deinterleaves an F32LE / S24LE / S16LE multichannel stream block by block with NumPy
+    strided views and writes every selected channel straight to its own mono WAV / W64 / RF64
+    file, or pipes it to its own FFmpeg FLAC encoder, so compression runs on one process per channel.
+    Integer samples already in the output format are copied byte for byte.
+    Supports the same bits / delay / volume / duration semantics as the
+    SoX + FFmpeg command pair built by AudioProcessor.
+    With a SilencePolicy other than KEEP the peak of every channel is tracked on the blocks
+    being written; under SKIP an output file is only opened at its first non-zero sample,
+    so channels of digital silence cost no output I/O at all.
+    """
+
+    BLOCK_FRAMES = 1 << 18  # ~5.5 s at 48 kHz, 16 MB per block for 16 channels of F32
+
+    def __init__(self,
+                 channels_count: int,
+                 outputs: List[Tuple[int, Path]],
+                 frequency: int = 48000,
+                 bits: int = 24,
+                 delay: int = 0,
+                 volume: float = 0,
+                 duration: Optional[float] = None,
+                 source_format: str = RawFormat.F32LE,
+                 output_format: str = OutputFormat.WAV,
+                 ffmpeg: Optional[Path] = None,
+                 silence: str = SilencePolicy.KEEP,
+                 silence_threshold: float = SilencePolicy.DEFAULT_THRESHOLD
+                 ) -> None:
+        """
+        Args:
+            channels_count: Number of interleaved channels in the source stream
+            outputs: List of (channel index, output file) pairs
+            frequency: Sample rate in Hz
+            bits: 32 -> float WAV, 16 -> 16-bit, anything else -> 24-bit integer WAV (as SoX/FFmpeg)
+            delay: Samples of silence to add (positive) or to trim (negative)
+            volume: Gain in dB
+            duration: Maximum output length in seconds (None or 0 -> unlimited)
+            source_format: RawFormat of the interleaved source samples
+            output_format: OutputFormat of the output files
+            ffmpeg: FFmpeg executable encoding FLAC outputs
+            silence: SilencePolicy of channels whose peak stays at or below silence_threshold
+            silence_threshold: Silence threshold in dBFS
+        """
+        self.channels_count: int = channels_count
+        self.outputs: List[Tuple[int, Path]] = outputs
+        self.frequency: int = frequency
+        self.bits: int = bits
+        self.delay: int = delay
+        self.volume: float = volume
+        self.max_frames: Optional[int] = round(duration * frequency) if duration else None
+
+        self.source_format: str = source_format
+        self.sample_size: int = RawFormat.SIZES[source_format]
+        self.output_format: str = RawFormat.from_bits(bits)
+        self.is_float: bool = self.output_format == RawFormat.F32LE
+        self.gain: Optional[float] = 10 ** (volume / 20) if volume else None
+
+        self.container: str = output_format
+        self.ffmpeg: Optional[Path] = ffmpeg
+        if self.container == OutputFormat.FLAC and (self.is_float or ffmpeg is None):
+            raise ValueError("FLAC output needs 16 or 24-bit samples and FFmpeg")
+
+        self.silence: str = silence
+        self.silence_threshold: float = 10 ** (silence_threshold / 20)
+        # sample peak of every output channel (before gain), tracked unless silence is KEEP
+        self.peaks: Optional["np.ndarray"] = np.zeros(len(outputs)) if silence != SilencePolicy.KEEP else None
+        self._pending: List[int] = [0] * len(outputs)  # leading zero frames of outputs not opened yet
+
+    @staticmethod
+    def is_available() -> bool:
+        return np is not None
+
+    # ------------------------------------------------------------------ #
+    #                           Public Methods                           #
+    # ------------------------------------------------------------------ #
+    def run_file(self, raw_file: Path, progress: Optional[Callable[[float], None]] = None) -> None:
+        """Split a raw PCM file, memory-mapped so blocks are views into the page cache."""
+        self._process(self._iter_file_blocks(raw_file), progress)
+
+    @property
+    def silent_outputs(self) -> List[Tuple[int, Path]]:
+        """(channel index, output file) of the outputs whose peak never exceeded the silence threshold."""
+        if self.peaks is None:
+            return []
+        return [output for output, peak in zip(self.outputs, self.peaks) if peak <= self.silence_threshold]
+
+    @staticmethod
+    def scan_peaks(raw_file: Path, channels_count: int, source_format: str = RawFormat.F32LE) -> "np.ndarray":
+        """Sample peak of every channel of a raw PCM file, for splits that do not run through ChannelSplitter."""
+        peaks = np.zeros(channels_count)
+        sample_size = RawFormat.SIZES[source_format]
+        if frames := raw_file.stat().st_size // (sample_size * channels_count):
+            data = np.memmap(raw_file, dtype=np.uint8, mode="r", shape=(frames, channels_count, sample_size))
+            for start in range(0, frames, ChannelSplitter.BLOCK_FRAMES):
+                block = ChannelSplitter.decode_samples(
+                    data[start:start + ChannelSplitter.BLOCK_FRAMES].transpose(1, 0, 2), source_format)
+                np.maximum(peaks, np.abs(block).max(axis=1), out=peaks)
+        return peaks
+
+    def run_stream(self, stream: BinaryIO, progress: Optional[Callable[[float], None]] = None) -> None:
+        """
+        Split a PCM stream read from a pipe (e.g. GStreamer fdsink).
+        After a complete split the stream is drained to EOF even past 'duration' so the producer exits cleanly;
+        on errors and interrupts it is left as is, stopping the producer is up to the caller.
+        """
+        self._process(self._iter_stream_blocks(stream), progress)
+        while stream.read(1 << 20):
+            pass
+
+    # ------------------------------------------------------------------ #
+    #                              Helpers                               #
+    # ------------------------------------------------------------------ #
+    def _iter_file_blocks(self, raw_file: Path) -> Iterator["np.ndarray"]:
+        """(frames, channels, sample bytes) views of the file."""
+        frames = raw_file.stat().st_size // (self.sample_size * self.channels_count)
+        if frames:
+            data = np.memmap(raw_file, dtype=np.uint8, mode="r",
+                             shape=(frames, self.channels_count, self.sample_size))
+            for start in range(0, frames, self.BLOCK_FRAMES):
+                yield data[start:start + self.BLOCK_FRAMES]
+
+    def _iter_stream_blocks(self, stream: BinaryIO) -> Iterator["np.ndarray"]:
+        """(frames, channels, sample bytes) blocks of the stream."""
+        frame_size = self.sample_size * self.channels_count
+        buffer = bytearray(self.BLOCK_FRAMES * frame_size)
+        view = memoryview(buffer)
+        filled = 0
+        while True:
+            count = stream.readinto(view[filled:])
+            if count:
+                filled += count
+            if filled == len(buffer) or (not count and filled):
+                usable = filled - filled % frame_size
+                yield np.frombuffer(buffer, dtype=np.uint8, count=usable).reshape(
+                    -1, self.channels_count, self.sample_size)
+                # keep a partial trailing frame for the next read
+                buffer[:filled - usable] = buffer[usable:filled]
+                filled -= usable
+            if not count:
+                break
+
+    def _process(self, blocks: Iterator["np.ndarray"], progress: Optional[Callable[[float], None]]) -> None:
+        """Apply trim / pad / gain / duration to (frames, channels, sample bytes) blocks, write each selected channel."""
+        columns = [cid for cid, _ in self.outputs]
+        writers: List[Optional[Union["ChannelSplitter._WavWriter", "ChannelSplitter._FlacWriter"]]] = []
+        written = 0
+        to_trim = -self.delay if self.delay < 0 else 0
+        limit = self.max_frames
+
+        try:
+            for index in range(len(self.outputs)):
+                # SKIP opens an output at its first non-zero sample
+                writers.append(self._open(index) if self.silence != SilencePolicy.SKIP else None)
+
+            # Positive delay: leading silence
+            to_pad = self.delay if self.delay > 0 else 0
+            while to_pad > 0 and (limit is None or written < limit):
+                count = min(to_pad, self.BLOCK_FRAMES, limit - written if limit is not None else to_pad)
+                self._write(writers, np.zeros((len(columns), count, self.sample_size), dtype=np.uint8))
+                written += count
+                to_pad -= count
+
+            for block in blocks:
+                if to_trim:
+                    skip = min(to_trim, len(block))
+                    block = block[skip:]
+                    to_trim -= skip
+                if limit is not None:
+                    block = block[:max(0, limit - written)]
+                if not len(block):
+                    if limit is not None and written >= limit:
+                        break
+                    continue
+
+                # Strided column gather -> one contiguous row of samples per output channel
+                self._write(writers, np.ascontiguousarray(block[:, columns].transpose(1, 0, 2)))
+                written += len(block)
+                if progress:
+                    progress(written / self.frequency)
+        finally:
+            errors = []
+            for writer in writers:
+                try:
+                    if writer is not None:
+                        writer.close()
+                except OSError as e:
+                    errors.append(e)
+        if errors:
+            raise errors[0]
+        if self.silence == SilencePolicy.SKIP:
+            # opened at a non-zero sample, but never above the threshold
+            for _, path in self.silent_outputs:
+                path.unlink(missing_ok=True)
+
+    def _open(self, index: int) -> Union["ChannelSplitter._WavWriter", "ChannelSplitter._FlacWriter"]:
+        path = self.outputs[index][1]
+        if self.container == OutputFormat.FLAC:
+            return self._FlacWriter(path, self.frequency, self.output_format, self.ffmpeg)
+        return self._WavWriter(path, self.frequency, self.bits, self.is_float, self.container)
+
+    def _write(self, writers: List[Optional[BinaryIO]], data: "np.ndarray") -> None:
+        """Convert a (channels, frames, sample bytes) source block to the output sample format and write rows."""
+        samples = None
+        if self.peaks is not None and data.shape[1]:
+            samples = self._decode(data)
+            np.maximum(self.peaks, np.abs(samples).max(axis=1), out=self.peaks)
+        if self.gain is None and not self.is_float and self.source_format == self.output_format:
+            rows = [row.tobytes() for row in data]
+        else:
+            rows = self._encode(samples if samples is not None else self._decode(data))
+        for index, row in enumerate(rows):
+            if writers[index] is None:
+                if not data[index].any():
+                    self._pending[index] += data.shape[1]
+                    continue
+                writers[index] = self._open(index)
+                # zero samples are zero bytes in every output format
+                sample_size = RawFormat.SIZES[self.output_format]
+                while self._pending[index]:
+                    count = min(self._pending[index], self.BLOCK_FRAMES)
+                    writers[index].write(bytes(count * sample_size))
+                    self._pending[index] -= count
+            writers[index].write(row)
+
+    def _decode(self, data: "np.ndarray") -> "np.ndarray":
+        return self.decode_samples(data, self.source_format)
+
+    @staticmethod
+    def decode_samples(data: "np.ndarray", source_format: str) -> "np.ndarray":
+        """(channels, frames, sample bytes) samples in source_format -> (channels, frames) float32 in [-1, 1)."""
+        if source_format == RawFormat.F32LE:
+            return data.view("<f4")[:, :, 0]
+        if source_format == RawFormat.S16LE:
+            return data.view("<i2")[:, :, 0].astype(np.float32) * np.float32(1 / 32768)
+        samples = data[:, :, 0].astype(np.int32) | data[:, :, 1].astype(np.int32) << 8 \
+            | data[:, :, 2].view(np.int8).astype(np.int32) << 16
+        return samples.astype(np.float32) * np.float32(1 / 8388608)
+
+    def _encode(self, data: "np.ndarray") -> List[bytes]:
+        """(channels, frames) float block -> one row of output samples per channel."""
+        if self.gain is not None:
+            data = data * self.gain
+        if self.is_float:
+            out = np.clip(data, -1.0, 1.0).astype("<f4", copy=False)
+            return [row.tobytes() for row in out]
+        if self.output_format == RawFormat.S16LE:
+            out = np.clip(np.rint(data * 32768.0), -32768, 32767).astype("<i2")
+            return [row.tobytes() for row in out]
+        out = np.clip(np.rint(data * 8388608.0), -8388608, 8388607).astype("<i4")
+        packed = out.view(np.uint8).reshape(out.shape[0], out.shape[1], 4)[:, :, :3]
+        return [row.tobytes() for row in packed]
+
+    # ---------------------------
+    # Private WAV writer
+    # ---------------------------
+    class _WavWriter:
+        """
+        Minimal streaming mono WAV / W64 / RF64 writer.
+        Uses WAVE_FORMAT_EXTENSIBLE for >16-bit samples, as FFmpeg does.
+        The sizes in the header are filled in by close().
+        """
+
+        GUID_TAIL = b"\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71"
+        # Wave64 chunk GUIDs
+        W64_RIFF = b"riff\x2e\x91\xcf\x11\xa5\xd6\x28\xdb\x04\xc1\x00\x00"
+        W64_TAIL = b"\xf3\xac\xd3\x11\x8c\xd1\x00\xc0\x4f\x8e\xdb\x8a"
+
+        def __init__(self, file: Path, frequency: int, bits: int, is_float: bool,
+                     container: str = OutputFormat.WAV) -> None:
+            self.file: BinaryIO = file.open("wb")
+            self.container: str = container
+            self.data_size: int = 0
+
+            sample_bits = 32 if is_float else 16 if bits == 16 else 24
+            self.block_align: int = sample_bits // 8
+            if sample_bits == 16:
+                fmt = struct.pack("<HHIIHH", 1, 1, frequency, frequency * self.block_align, self.block_align,
+                                  sample_bits)
+            else:
+                sub_format = struct.pack("<I", 3 if is_float else 1) + self.GUID_TAIL
+                fmt = struct.pack("<HHIIHHHHI", 0xFFFE, 1, frequency, frequency * self.block_align,
+                                  self.block_align, sample_bits, 22, sample_bits, 0x4) + sub_format
+            if container == OutputFormat.W64:
+                # chunk sizes count the 24-byte GUID + size header, chunks are 8-byte aligned (fmt is 16 or 40)
+                self.file.write(self.W64_RIFF + struct.pack("<Q", 0) + b"wave" + self.W64_TAIL)
+                self.file.write(b"fmt " + self.W64_TAIL + struct.pack("<Q", 24 + len(fmt)) + fmt)
+                self.file.write(b"data" + self.W64_TAIL + struct.pack("<Q", 0))
+            elif container == OutputFormat.RF64:
+                # sizes live in the ds64 chunk, the 32-bit fields stay 0xFFFFFFFF
+                self.file.write(b"RF64" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE")
+                self.file.write(b"ds64" + struct.pack("<IQQQI", 28, 0, 0, 0, 0))
+                self.file.write(b"fmt " + struct.pack("<I", len(fmt)) + fmt)
+                self.file.write(b"data" + struct.pack("<I", 0xFFFFFFFF))
+            else:
+                self.file.write(b"RIFF" + struct.pack("<I", 0) + b"WAVE")
+                self.file.write(b"fmt " + struct.pack("<I", len(fmt)) + fmt)
+                self.file.write(b"data" + struct.pack("<I", 0))
+            self.header_size: int = self.file.tell()
+
+        def write(self, data: bytes) -> None:
+            self.file.write(data)
+            self.data_size += len(data)
+
+        def close(self) -> None:
+            if self.file.closed:
+                return
+            if self.container == OutputFormat.W64:
+                self.file.write(b"\x00" * (-self.data_size % 8))
+                self.file.seek(16)
+                self.file.write(struct.pack("<Q", self.header_size + self.data_size + (-self.data_size % 8)))
+                self.file.seek(self.header_size - 8)
+                self.file.write(struct.pack("<Q", 24 + self.data_size))
+            elif self.container == OutputFormat.RF64:
+                if self.data_size & 1:
+                    self.file.write(b"\x00")
+                self.file.seek(20)
+                self.file.write(struct.pack("<QQQ", self.header_size - 8 + self.data_size + (self.data_size & 1),
+                                            self.data_size, self.data_size // self.block_align))
+            else:
+                if self.data_size & 1:
+                    self.file.write(b"\x00")
+                riff_size = min(self.header_size - 8 + self.data_size + (self.data_size & 1), 0xFFFFFFFF)
+                self.file.seek(4)
+                self.file.write(struct.pack("<I", riff_size))
+                self.file.seek(self.header_size - 4)
+                self.file.write(struct.pack("<I", min(self.data_size, 0xFFFFFFFF)))
+            self.file.close()
+
+    # ---------------------------
+    # Private FLAC writer
+    # ---------------------------
+    class _FlacWriter:
+        """Pipes mono integer PCM to an FFmpeg FLAC encoder, one encoder process per output channel."""
+
+        def __init__(self, file: Path, frequency: int, sample_format: str, ffmpeg: Path) -> None:
+            self.file: Path = file
+            self.proc: subprocess.Popen = subprocess.Popen(
+                [str(ffmpeg), "-hide_banner", "-loglevel", "error",
+                 "-f", RawFormat.FFMPEG[sample_format], "-ar", str(frequency), "-ac", "1", "-i", "-",
+                 *OutputFormat.ffmpeg_args(OutputFormat.FLAC, 0), "-y", str(file)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                shell=False
+            )
+
+        def write(self, data: bytes) -> None:
+            try:
+                self.proc.stdin.write(data)
+            except BrokenPipeError:
+                raise OSError(f"FLAC encoder of {self.file.name} exited early")
+
+        def close(self) -> None:
+            if self.proc.returncode is not None:
+                return
+            try:
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            stderr = self.proc.stderr.read().decode(errors="replace").strip()
+            if self.proc.wait() != 0:
+                raise OSError(f"FLAC encoder of {self.file.name} failed with code {self.proc.returncode}"
+                              + (f": {stderr}" if stderr else ""))
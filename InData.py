@@ -1,7 +1,12 @@
 import argparse
+import os
 import pathlib
 import sys
-from typing import Optional, List, Dict, Union
+import threading
+from typing import Optional, List, Dict, Union, Tuple
+from ChannelSplitter import ChannelSplitter, SplitEngine, OutputFormat, SilencePolicy
+from PcmCache import PcmCache
+from Progress import ProgressMode
 from Utils import Utils
 
 
@@ -12,26 +17,57 @@ class InData:
     # ---------------------------
     # Typed attributes
     # ---------------------------
-    input_file: pathlib.Path
-    output_file: pathlib.Path
+    input_file: Optional[pathlib.Path]
+    output_file: Optional[pathlib.Path]
+
+    # Batch mode
+    batch: List[str]
+    decode_jobs: int
+    encode_jobs: int
+    probe_jobs: int
+
+    # Daemon mode
+    daemon: Optional[pathlib.Path]
+    daemon_jobs: int
 
     volume: Optional[int] = None
+    loudness_target: Optional[float] = None
     channels_filter: List[str]
     no_numbers: bool
     bits: int
+    output_format: str
+    silent_channels: str
+    silence_threshold: float
     delay: int
     keep_raw: bool
+    engine: str
+    split_jobs: int
+    decode_segments: int
+    probe_cache: Optional[pathlib.Path]
+    pcm_cache: Optional[pathlib.Path]
+    pcm_cache_size: int
+    progress_mode: str
 
     # ---------------------------
     # Constants
     # ---------------------------
-    CHANNELS: Dict[str, Dict]
+    CHANNELS: Dict[str, Dict] = {
+        '2.0': {'id': 0, 'names': ['L', 'R']},
+        '3.1': {'id': 3, 'names': ['L', 'R', 'C', 'LFE']},
+        '5.1': {'id': 7, 'names': ['L', 'R', 'C', 'LFE', 'Ls', 'Rs']},
+        '7.1': {'id': 11, 'names': ['L', 'R', 'C', 'LFE', 'Ls', 'Rs', 'Lrs', 'Rrs']},
+        '9.1': {'id': 12, 'names': ['L', 'R', 'C', 'LFE', 'Ls', 'Rs', 'Lrs', 'Rrs', 'Lw', 'Rw']},
+        '9.1.6': {'id': 20, 'names': ['L', 'R', 'C', 'LFE', 'Ls', 'Rs', 'Lrs', 'Rrs',
+                                      'Lw', 'Rw', 'Ltf', 'Rtf', 'Ltm', 'Rtm', 'Ltr', 'Rtr']},
+    }
     BINS_REQ: Dict[str, str]
+    # plus one '<name>_launch': pathlib.Path attribute per BINS_REQ entry
     # ---------------------------
     # Private attributes
     # ---------------------------
     _instance: Optional["InData"] = None
-    _parser: Optional["_Parser"] = None
+    _parsers: Dict[Tuple[str, ...], "_Parser"] = {}  # built once per set of binaries, reused by parse_job
+    _parsers_lock = threading.Lock()
     # ---------------------------
     # Used by setter/getter
     # ---------------------------
@@ -43,10 +79,6 @@ class InData:
     def __new__(cls, bins_req: Optional[Dict[str, str]] = None):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-
-            # Dynamically add type annotations for binary paths
-            for name in cls.BINS_REQ:
-                cls._instance.__annotations__[f"{name}_launch"] = pathlib.Path
         return cls._instance
 
     def __init__(self, bins_req: Optional[Dict[str, str]] = None):
@@ -57,20 +89,36 @@ class InData:
 
             self.BINS_REQ = bins_req
 
-            # ---------------------------
-            # Private CHANNELS
-            # ---------------------------
-            self.CHANNELS = {
-                '2.0': {'id': 0, 'names': ['L', 'R']},
-                '3.1': {'id': 3, 'names': ['L', 'R', 'C', 'LFE']},
-                '5.1': {'id': 7, 'names': ['L', 'R', 'C', 'LFE', 'Ls', 'Rs']},
-                '7.1': {'id': 11, 'names': ['L', 'R', 'C', 'LFE', 'Ls', 'Rs', 'Lrs', 'Rrs']},
-                '9.1': {'id': 12, 'names': ['L', 'R', 'C', 'LFE', 'Ls', 'Rs', 'Lrs', 'Rrs', 'Lw', 'Rw']},
-                '9.1.6': {'id': 20, 'names': ['L', 'R', 'C', 'LFE', 'Ls', 'Rs', 'Lrs', 'Rrs',
-                                              'Lw', 'Rw', 'Ltf', 'Rtf', 'Ltm', 'Rtm', 'Ltr', 'Rtr']},
-            }
-
-            self._Parser(self).parse()
+            self._get_parser(self.BINS_REQ).parse(self)
+
+    @classmethod
+    def parse_job(cls, argv: List[str], bins_req: Optional[Dict[str, str]] = None) -> "InData":
+        """
+        Parse the command line of one job (e.g. submitted to WorkerDaemon) into a new configuration,
+        leaving the process configuration untouched.
+        Args:
+            argv: Command line options of the job
+            bins_req: Required binaries when there is no process configuration to take them from
+        Raises:
+            ValueError: Invalid options, with the argparse message
+        """
+        config = object.__new__(cls)
+        config._initialized = True
+        config.BINS_REQ = cls._instance.BINS_REQ if cls._instance is not None else bins_req or {}
+        cls._get_parser(config.BINS_REQ).parse(config, argv, strict=False)
+        return config
+
+    @classmethod
+    def _get_parser(cls, bins_req: Dict[str, str]) -> "_Parser":
+        """
+        The argument parser of a set of binaries, constructed on first use only.
+        It holds no state of a parse, so concurrent parse_job calls can share it.
+        """
+        key = tuple(sorted(bins_req or {}))
+        with cls._parsers_lock:
+            if key not in cls._parsers:
+                cls._parsers[key] = cls._Parser(key)
+            return cls._parsers[key]
 
     @property
     def channels(self) -> Dict:
@@ -83,13 +131,31 @@ class InData:
     # ---------------------------
     # Private parser
     # ---------------------------
+    class _ParserExit(ValueError):
+        """Invalid options (error) or --help / --version (exit) met by the shared parser."""
+
+        def __init__(self, status: int, message: Optional[str], error: bool = False):
+            super().__init__((message or f"exit status {status}").strip())
+            self.status: int = status
+            self.message: Optional[str] = message
+            self.error: bool = error
+
+    class _ArgumentParser(argparse.ArgumentParser):
+        """Raises _ParserExit instead of exiting the process, each parse decides whether to exit."""
+
+        def exit(self, status: int = 0, message: Optional[str] = None):
+            raise InData._ParserExit(status, message)
+
+        def error(self, message: str):
+            raise InData._ParserExit(2, message, error=True)
+
     class _Parser:
-        config: "InData"
-        parser: "argparse.ArgumentParser"
+        bins: Tuple[str, ...]
+        parser: "InData._ArgumentParser"
 
-        def __init__(self, config: "InData"):
-            self.config = config
-            self.parser = argparse.ArgumentParser()
+        def __init__(self, bins: Tuple[str, ...]):
+            self.bins = bins
+            self.parser = InData._ArgumentParser(fromfile_prefix_chars='@')
             self._add_arguments()
 
         class _Converters:
@@ -133,14 +199,20 @@ class InData:
                 return result
 
             @staticmethod
-            def parse_volume(value: str) -> Optional[int]:
-                result: Optional[int]
+            def parse_volume(value: str) -> Tuple[Optional[int], Optional[float]]:
+                """Returns (volume, loudness_target): 'auto', a gain in dB or a target such as '-23lufs'."""
+                result: Tuple[Optional[int], Optional[float]]
                 val = value.strip().lower()
                 if val == 'auto':
-                    result = None
+                    result = (None, None)
+                elif val.endswith(('lufs', 'lkfs')):
+                    try:
+                        result = (0, float(val[:-4]))
+                    except ValueError:
+                        raise argparse.ArgumentTypeError(f"Invalid loudness target: {value}")
                 else:
                     try:
-                        result = int(value)
+                        result = (int(value), None)
                     except ValueError:
                         raise argparse.ArgumentTypeError(f"Invalid volume value: {value}")
                 return result
@@ -161,26 +233,84 @@ class InData:
             def parse_channels_filter(value: str) -> List[str]:
                 return stripped.split(",") if (stripped := value.strip(" ,")) else []
 
+            @staticmethod
+            def parse_jobs(value: str) -> int:
+                try:
+                    result = int(value)
+                except ValueError:
+                    raise argparse.ArgumentTypeError(f"Invalid number of jobs: {value}")
+                if result < 1:
+                    raise argparse.ArgumentTypeError(f"Number of jobs must be positive, got '{value}'")
+                return result
+
+            @staticmethod
+            def parse_jobs_or_zero(value: str) -> int:
+                try:
+                    result = int(value)
+                except ValueError:
+                    raise argparse.ArgumentTypeError(f"Invalid number of jobs: {value}")
+                if result < 0:
+                    raise argparse.ArgumentTypeError(f"Number of jobs cannot be negative, got '{value}'")
+                return result
+
+            @staticmethod
+            def parse_size(value: str) -> int:
+                val = value.strip().upper().removesuffix("B")
+                units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+                try:
+                    result = int(float(val[:-1]) * units[val[-1]]) if val[-1:] in units else int(val)
+                except ValueError:
+                    raise argparse.ArgumentTypeError(f"Invalid size: {value}")
+                if result < 0:
+                    raise argparse.ArgumentTypeError(f"Size cannot be negative, got '{value}'")
+                return result
+
         def _add_arguments(self):
             conv = self._Converters
 
             # Input/output
-            self.parser.add_argument('-i', '--input', required=True, metavar='FILENAME',
+            self.parser.add_argument('-i', '--input', metavar='FILENAME',
                                      type=conv.parse_existing_path,
                                      help='Path to source file')
             self.parser.add_argument('-o', '--output', metavar='FILENAME',
                                      type=conv.parse_optional_path,
-                                     help='Path to output base file')
+                                     help='Path to output base file (output directory in batch mode)')
+
+            # Batch mode
+            cores = os.cpu_count() or 1
+            self.parser.add_argument('-batch', '--batch', nargs='+', default=[], metavar='PATH',
+                                     help='Batch mode: source files, glob patterns or directories '
+                                          '(@file reads the list from a file, one per line)')
+            self.parser.add_argument('-decode_jobs', '--decode_jobs', type=conv.parse_jobs,
+                                     default=max(1, cores // 8),
+                                     help='Batch mode: concurrent GStreamer decodes')
+            self.parser.add_argument('-encode_jobs', '--encode_jobs', type=conv.parse_jobs,
+                                     default=max(1, cores // 4),
+                                     help='Batch mode: concurrent channel split/encode stages')
+            self.parser.add_argument('-probe_jobs', '--probe_jobs', type=conv.parse_jobs,
+                                     default=max(1, min(8, cores)),
+                                     help='Batch mode: concurrent metadata probes')
+
+            # Daemon mode
+            self.parser.add_argument('-daemon', '--daemon', metavar='SOCKET', type=conv.parse_optional_path,
+                                     default=None,
+                                     help='Daemon mode: serve jobs (the options of this command line, as JSON '
+                                          'lines) on a Unix socket, with tools and caches kept warm; '
+                                          '--decode_jobs / --encode_jobs limit the stages as in batch mode')
+            self.parser.add_argument('-daemon_jobs', '--daemon_jobs', type=conv.parse_jobs,
+                                     default=max(1, cores // 4),
+                                     help='Daemon mode: jobs run concurrently, later ones wait in the queue')
             # Binary paths
-            for name, path in self.config.BINS_REQ.items():
+            # defaults are resolved by parse(), only for the binaries not given
+            for name in self.bins:
                 self.parser.add_argument(f'-{name}_launch', f'--{name}_launch',
                                          type=pathlib.Path,
-                                         default=Utils.IO.absolute_self(path),
+                                         default=None,
                                          help=f'Path to {name}-launch file')
 
             # Audio options
             self.parser.add_argument('-c', '--channels',
-                                     type=str, default='9.1.6', choices=self.config.CHANNELS.keys(),
+                                     type=str, default='9.1.6', choices=InData.CHANNELS.keys(),
                                      help='Output channel configuration')
             self.parser.add_argument('-cf', '--channels_filter',
                                      type=conv.parse_channels_filter, default=[],
@@ -194,10 +324,49 @@ class InData:
                 type=conv.parse_bool,  # if value is provided -> parse it
                 help='Do not use numbers in output channel names (bool)',
             )
-            self.parser.add_argument('-v', '--volume', type=conv.parse_volume, default=None,
-                                     help="Change volume level (db) or 'auto'")
+            self.parser.add_argument('-v', '--volume', type=conv.parse_volume, default=(None, None),
+                                     help="Change volume level (db), 'auto' (dialnorm) or a loudness "
+                                          "target such as '-23lufs' (EBU R128, measured while decoding)")
             self.parser.add_argument('-b', '--bits', type=int, choices=[16, 24, 32], default=24,
                                      help='Encoded sample size in bits')
+            self.parser.add_argument('-format', '--format', type=str.lower, choices=OutputFormat.ALL,
+                                     default=OutputFormat.WAV,
+                                     help='Per-channel output format: wav, flac (16/24 bits, encoded by one FFmpeg '
+                                          'process per channel), w64 or rf64 (titles beyond 4 GB per channel)')
+            self.parser.add_argument('-silent_channels', '--silent_channels', type=str.lower,
+                                     choices=SilencePolicy.ALL, default=SilencePolicy.KEEP,
+                                     help='Channels that never exceed --silence_threshold: keep, mark (list them in '
+                                          '<output>.channels.json) or skip (do not write them, list them too)')
+            self.parser.add_argument('-silence_threshold', '--silence_threshold', type=float,
+                                     default=SilencePolicy.DEFAULT_THRESHOLD,
+                                     help='Peak level (dBFS) at or below which a channel counts as silent')
+            self.parser.add_argument('-e', '--engine', type=str,
+                                     choices=[SplitEngine.NATIVE, SplitEngine.SOX_FFMPEG],
+                                     default=SplitEngine.NATIVE if ChannelSplitter.is_available()
+                                     else SplitEngine.SOX_FFMPEG,
+                                     help='Channel split engine: in-process NumPy or SoX → FFmpeg')
+            self.parser.add_argument('-split_jobs', '--split_jobs', type=conv.parse_jobs_or_zero, default=None,
+                                     help='Channel groups split in parallel from the raw file, 0 for one per CPU '
+                                          'core (default: 0, 1 in batch mode and for daemon jobs)')
+            self.parser.add_argument('-decode_segments', '--decode_segments', type=conv.parse_jobs, default=1,
+                                     help='Decode a long stream as parts in parallel GStreamer processes, '
+                                          'joined at TrueHD major syncs / AC-3 frames (default: 1, serial)')
+            self.parser.add_argument('-probe_cache', '--probe_cache', metavar='FILENAME',
+                                     type=str, default=None,
+                                     help="Persistent metadata cache file ('' disables caching, "
+                                          "default: probe.sqlite in the user cache directory)")
+            self.parser.add_argument('-pcm_cache', '--pcm_cache', metavar='DIRECTORY',
+                                     type=conv.parse_optional_path, default=None,
+                                     help='Directory of decoded PCM shared by all runs, so re-exports with other '
+                                          'gain, delay or channels skip GStreamer (default: disabled)')
+            self.parser.add_argument('-pcm_cache_size', '--pcm_cache_size', metavar='SIZE',
+                                     type=conv.parse_size, default=PcmCache.DEFAULT_MAX_BYTES,
+                                     help='Byte budget of --pcm_cache before the least recently used entries '
+                                          'are evicted, e.g. 500G (default: 100G)')
+            self.parser.add_argument('-progress', '--progress', type=str.lower, choices=ProgressMode.ALL,
+                                     default=ProgressMode.AUTO,
+                                     help='Progress output: bar, plain lines, JSON lines on stderr (one event per line '
+                                          'for supervisors) or none; auto draws the bar on a terminal, plain otherwise')
             self.parser.add_argument('-keep_raw', '--keep_raw',
                                      nargs='?', const=True, default=False, type=conv.parse_bool,
                                      help='Keep raw/intermediate file')
@@ -216,21 +385,73 @@ class InData:
                                          "  --delay -1500  => trim 1500 samples"
                                      ))
 
-        def parse(self):
-            args = self.parser.parse_args()
+        def parse(self, config: "InData", argv: Optional[List[str]] = None, strict: bool = True):
+            """
+            Parse argv (the process command line by default) into config.
+            Args:
+                strict: Exit the process on invalid options or --help as argparse does, else raise ValueError
+            """
+            try:
+                self._parse(config, argv)
+            except InData._ParserExit as e:
+                if not strict:
+                    raise
+                if e.error:
+                    self.parser.print_usage(sys.stderr)
+                    e.message = f"{self.parser.prog}: error: {e.message}\n"
+                if e.message:
+                    sys.stderr.write(e.message)
+                sys.exit(e.status)
+
+        def _parse(self, config: "InData", argv: Optional[List[str]]):
+            args = self.parser.parse_args(argv)
+            if args.input is None and not args.batch and not args.daemon:
+                self.parser.error("one of the arguments -i/--input, -batch/--batch or -daemon/--daemon is required")
+            if args.format == OutputFormat.FLAC and args.bits == 32:
+                self.parser.error("--format flac supports --bits 16 or 24 only")
             # Binary paths (loop instead of hardcoded)
-            for name in self.config.BINS_REQ:
-                setattr(self.config, f"{name}_launch", getattr(args, f"{name}_launch"))
+            for name, path in config.BINS_REQ.items():
+                setattr(config, f"{name}_launch", getattr(args, f"{name}_launch") or Utils.IO.absolute_self(path))
             # Audio options
-            self.config.channels = args.channels
-            self.config.channels_filter = args.channels_filter
-            self.config.no_numbers = args.no_numbers
-            self.config.volume = args.volume
-            self.config.bits = args.bits
-            self.config.keep_raw = args.keep_raw
-            self.config.delay = args.delay
+            config.channels = args.channels
+            config.channels_filter = args.channels_filter
+            config.no_numbers = args.no_numbers
+            config.volume, config.loudness_target = args.volume
+            config.bits = args.bits
+            config.output_format = args.format
+            config.silent_channels = args.silent_channels
+            config.silence_threshold = args.silence_threshold
+            config.keep_raw = args.keep_raw
+            config.engine = args.engine
+            # batch, daemon and library jobs run in parallel, one split worker each unless asked otherwise;
+            # only a single run from the process command line takes every core (0, resolved by AudioProcessor)
+            if args.split_jobs is not None:
+                config.split_jobs = args.split_jobs
+            else:
+                config.split_jobs = 0 if argv is None and not args.batch else 1
+            config.decode_segments = args.decode_segments
+            # resolved here rather than as the option default, so building the parser creates no directory
+            if args.probe_cache is None:
+                config.probe_cache = Utils.IO.cache_dir() / "probe.sqlite"
+            else:
+                config.probe_cache = self._Converters.parse_optional_path(args.probe_cache)
+            config.pcm_cache = args.pcm_cache
+            config.pcm_cache_size = args.pcm_cache_size
+            config.progress_mode = args.progress
+            config.delay = args.delay
+            # Batch mode
+            config.batch = args.batch
+            config.decode_jobs = args.decode_jobs
+            config.encode_jobs = args.encode_jobs
+            config.probe_jobs = args.probe_jobs
+            # Daemon mode
+            config.daemon = args.daemon
+            config.daemon_jobs = args.daemon_jobs
             # Input/output
-            self.config.input_file = args.input
-            self.config.output_file = args.output.with_suffix(".wav") if args.output is not None \
-                else args.input.with_suffix(".wav")
+            config.input_file = args.input
+            if args.batch or args.input is None:
+                config.output_file = args.output
+            else:
+                config.output_file = args.output.with_suffix(".wav") if args.output is not None \
+                    else args.input.with_suffix(".wav")
 
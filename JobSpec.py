@@ -0,0 +1,274 @@
+import csv
+from pathlib import Path
+from typing import Optional, List, Dict, Union, Any, Iterable, Mapping, Tuple
+
+from ChannelSplitter import SplitEngine, OutputFormat, SilencePolicy, RawFormat
+from InData import InData
+from PcmCache import PcmCache
+from Progress import ProgressMode
+
+
+class JobSpec:
+    """
+    Immutable configuration of one AudioProcessor job: input, output, channel layout and
+    filter, sample format, delay, gain, split options, tool paths and caches.
+    Unlike the process-wide InData it holds a single job, so any number of them can be
+    queued and run concurrently in one interpreter (AudioProcessor.run_job).
+    Build it from keyword arguments, a dict, a command line / parsed InData configuration,
+    or a manifest row; replace() derives a modified copy.
+    """
+
+    # AudioProcessor binaries: name -> default (resolved on PATH)
+    TOOLS = {"gst": "gst-launch-1.0", "sox": "sox", "ffmpeg": "ffmpeg", "eac3to": "eac3to", "mediainfo": "mediainfo"}
+    # manifest columns holding paths, relative ones are taken from the manifest directory
+    PATH_COLUMNS = ("input", "output")
+
+    __slots__ = ("input_file", "output_file", "channels", "channels_filter", "no_numbers", "bits", "delay", "volume",
+                 "loudness_target", "keep_raw", "engine", "split_jobs", "decode_segments", "output_format",
+                 "silent_channels", "silence_threshold", "progress_mode", "tools", "probe_cache", "pcm_cache",
+                 "pcm_cache_size")
+
+    def __init__(self,
+                 input_file: Union[str, Path],
+                 output_file: Union[str, Path, None] = None,
+                 channels: str = '9.1.6',
+                 channels_filter: Union[str, Iterable[str], None] = None,
+                 no_numbers: bool = False,
+                 bits: int = 24,
+                 delay: int = 0,
+                 volume: Optional[int] = None,
+                 loudness_target: Optional[float] = None,
+                 keep_raw: bool = False,
+                 engine: str = SplitEngine.NATIVE,
+                 split_jobs: int = 1,
+                 decode_segments: int = 1,
+                 output_format: str = OutputFormat.WAV,
+                 silent_channels: str = SilencePolicy.KEEP,
+                 silence_threshold: float = SilencePolicy.DEFAULT_THRESHOLD,
+                 progress_mode: str = ProgressMode.AUTO,
+                 tools: Optional[Mapping[str, Union[str, Path]]] = None,
+                 probe_cache: Union[str, Path, None] = None,
+                 pcm_cache: Union[str, Path, None] = None,
+                 pcm_cache_size: int = PcmCache.DEFAULT_MAX_BYTES
+                 ) -> None:
+        """
+        Args:
+            input_file: Source TrueHD / AC-3 / E-AC-3 file
+            output_file: Output base file, defaults to input_file with a .wav suffix
+            channels: Channel layout key of InData.CHANNELS
+            channels_filter: Channel names to write ('L,R' or a list), all if empty
+            volume: Gain in dB, None for the dialnorm gain
+            loudness_target: Integrated loudness (LUFS) to normalize to, overrides volume
+            split_jobs: Channel groups split in parallel (0 = one per CPU core)
+            tools: Paths of the TOOLS binaries, missing ones default to a PATH lookup
+            probe_cache: SQLite file of the metadata cache, None disables caching
+            pcm_cache: Directory of the decoded-PCM cache, None disables caching
+            Other arguments as in AudioProcessor.run.
+        Raises:
+            ValueError: An option outside its choices
+        """
+        if channels not in InData.CHANNELS:
+            raise ValueError(f"Unknown channel layout: {channels}")
+        if bits not in (16, 24, 32):
+            raise ValueError(f"Unsupported bits: {bits}")
+        if engine not in (SplitEngine.NATIVE, SplitEngine.SOX_FFMPEG):
+            raise ValueError(f"Unknown split engine: {engine}")
+        if output_format not in OutputFormat.ALL:
+            raise ValueError(f"Unknown output format: {output_format}")
+        if output_format == OutputFormat.FLAC and RawFormat.from_bits(bits) == RawFormat.F32LE:
+            raise ValueError("FLAC output supports 16 and 24 bits only")
+        if silent_channels not in SilencePolicy.ALL:
+            raise ValueError(f"Unknown silent channel policy: {silent_channels}")
+        if progress_mode not in ProgressMode.ALL:
+            raise ValueError(f"Unknown progress mode: {progress_mode}")
+        if unknown := set(tools or {}) - set(self.TOOLS):
+            raise ValueError(f"Unknown tools: {', '.join(sorted(unknown))}")
+
+        if isinstance(channels_filter, str):
+            channels_filter = [name.strip() for name in channels_filter.split(",")]
+        values = {
+            "input_file": Path(input_file),
+            "output_file": Path(output_file) if output_file else Path(input_file).with_suffix(".wav"),
+            "channels": channels,
+            "channels_filter": tuple(name for name in channels_filter or () if name),
+            "no_numbers": bool(no_numbers),
+            "bits": int(bits),
+            "delay": int(delay),
+            "volume": volume,
+            "loudness_target": loudness_target,
+            "keep_raw": bool(keep_raw),
+            "engine": engine,
+            "split_jobs": int(split_jobs),
+            "decode_segments": int(decode_segments),
+            "output_format": output_format,
+            "silent_channels": silent_channels,
+            "silence_threshold": float(silence_threshold),
+            "progress_mode": progress_mode,
+            # a private copy, as_dict() and replace() hand out copies of it
+            "tools": {name: Path((tools or {}).get(name) or default) for name, default in self.TOOLS.items()},
+            "probe_cache": Path(probe_cache) if probe_cache else None,
+            "pcm_cache": Path(pcm_cache) if pcm_cache else None,
+            "pcm_cache_size": int(pcm_cache_size)
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"JobSpec is immutable, use replace({name}=...)")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("JobSpec is immutable")
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, JobSpec) and self.as_dict() == other.as_dict()
+
+    def __hash__(self) -> int:
+        return hash(tuple((name, str(value) if isinstance(value, Mapping) else value)
+                          for name, value in self.as_dict().items()))
+
+    def __reduce__(self) -> Tuple:
+        # rebuilt through the validating constructor, so jobs can be copied and sent to worker processes
+        return JobSpec.from_dict, (self.as_dict(),)
+
+    def __repr__(self) -> str:
+        return f"JobSpec({self.input_file!s} -> {self.output_file!s}, channels={self.channels})"
+
+    # ------------------------------------------------------------------ #
+    #                            Constructors                            #
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "JobSpec":
+        """
+        Build from a dict of the constructor arguments (e.g. deserialized JSON).
+        Raises:
+            ValueError: Unknown keys, a missing input_file or invalid options
+        """
+        if unknown := set(data) - set(cls.__slots__):
+            raise ValueError(f"Unknown job options: {', '.join(sorted(unknown))}")
+        if not data.get("input_file"):
+            raise ValueError("input_file is required")
+        return cls(**data)
+
+    @classmethod
+    def from_config(cls, config: InData) -> "JobSpec":
+        """Build from a parsed InData configuration (the command line of a single job)."""
+        if config.input_file is None:
+            raise ValueError("the configuration has no input file")
+        channels = next((key for key, layout in InData.CHANNELS.items() if layout == config.channels), '9.1.6')
+        return cls(input_file=config.input_file,
+                   output_file=config.output_file,
+                   channels=channels,
+                   channels_filter=config.channels_filter,
+                   no_numbers=config.no_numbers,
+                   bits=config.bits,
+                   delay=config.delay,
+                   volume=config.volume,
+                   loudness_target=config.loudness_target,
+                   keep_raw=config.keep_raw,
+                   engine=config.engine,
+                   split_jobs=config.split_jobs,
+                   decode_segments=config.decode_segments,
+                   output_format=config.output_format,
+                   silent_channels=config.silent_channels,
+                   silence_threshold=config.silence_threshold,
+                   progress_mode=config.progress_mode,
+                   tools={name: getattr(config, f"{name}_launch") for name in config.BINS_REQ if name in cls.TOOLS},
+                   probe_cache=config.probe_cache,
+                   pcm_cache=config.pcm_cache,
+                   pcm_cache_size=config.pcm_cache_size)
+
+    @classmethod
+    def from_args(cls, argv: List[str]) -> "JobSpec":
+        """
+        Build from command line options, parsed and validated exactly as the CLI does
+        (the <tool>_launch options default to the CLI's paths, or to TOOLS outside of it).
+        Raises:
+            ValueError: Invalid options, with the argparse message
+        """
+        return cls.from_config(InData.parse_job(argv, bins_req=cls.TOOLS))
+
+    @classmethod
+    def from_manifest_row(cls, row: Mapping[str, Optional[str]], base_dir: Optional[Path] = None) -> "JobSpec":
+        """
+        Build from a manifest row whose columns are command line option names
+        (input, output, channels, channels_filter, bits, volume, delay, format, ...); empty cells are skipped.
+        Relative input / output paths are taken from base_dir.
+        """
+        argv = []
+        for column, value in row.items():
+            column, value = (column or "").strip().lstrip("-"), (value or "").strip()
+            if not column or not value:
+                continue
+            if column in cls.PATH_COLUMNS and base_dir is not None and not Path(value).is_absolute():
+                value = str(base_dir / value)
+            argv.extend([f"--{column}", value])
+        return cls.from_args(argv)
+
+    @classmethod
+    def read_manifest(cls, manifest_file: Path) -> List["JobSpec"]:
+        """
+        Read a CSV manifest, one job per row (see from_manifest_row).
+        Raises:
+            ValueError: An invalid row, with its line number
+        """
+        manifest_file = Path(manifest_file)
+        with manifest_file.open(newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            jobs = []
+            for row in reader:
+                try:
+                    jobs.append(cls.from_manifest_row(row, base_dir=manifest_file.parent))
+                except ValueError as e:
+                    raise ValueError(f"{manifest_file.name}, line {reader.line_num}: {e}")
+        return jobs
+
+    # ------------------------------------------------------------------ #
+    #                           Public Methods                           #
+    # ------------------------------------------------------------------ #
+    def replace(self, **changes: Any) -> "JobSpec":
+        """Copy of the job with the given options changed."""
+        return self.from_dict({**self.as_dict(), **changes})
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Constructor arguments of the job."""
+        return {name: dict(getattr(self, name)) if name == "tools" else getattr(self, name) for name in self.__slots__}
+
+    def processor_args(self) -> Dict[str, Any]:
+        """AudioProcessor constructor arguments (tool paths, channels and caches)."""
+        return {
+            **{f"{name}_launch": path for name, path in self.tools.items()},
+            "channels": InData.CHANNELS[self.channels],
+            "probe_cache": self.probe_cache,
+            "pcm_cache": self.pcm_cache,
+            "pcm_cache_size": self.pcm_cache_size
+        }
+
+    def run_args(self) -> Dict[str, Any]:
+        """AudioProcessor.run arguments."""
+        return {
+            "input_file": self.input_file,
+            "output_file": self.output_file,
+            "keep_raw": self.keep_raw,
+            "no_numbers": self.no_numbers,
+            "bits": self.bits,
+            "delay": self.delay,
+            "volume": self.volume,
+            "loudness_target": self.loudness_target,
+            "channels_filter": list(self.channels_filter),
+            "engine": self.engine,
+            "split_jobs": self.split_jobs,
+            "decode_segments": self.decode_segments,
+            "output_format": self.output_format,
+            "silent_channels": self.silent_channels,
+            "silence_threshold": self.silence_threshold,
+            "progress_mode": self.progress_mode
+        }
+
+    def processor_key(self) -> Tuple:
+        """Jobs with equal keys can share one AudioProcessor (and its caches)."""
+        return self.args_key(self.processor_args())
+
+    @staticmethod
+    def args_key(processor_args: Mapping[str, Any]) -> Tuple:
+        """Comparable key of AudioProcessor constructor arguments."""
+        return tuple((name, str(value)) for name, value in sorted(processor_args.items()))
@@ -0,0 +1,244 @@
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple, Any
+
+from ChannelSplitter import ChannelSplitter, RawFormat
+from Utils import Utils
+
+# optional: without NumPy loudness is not measured and a loudness target keeps the volume; loaded on first use
+np = Utils.Import.lazy("numpy")
+futures = Utils.Import.lazy("concurrent.futures")
+
+
+class LoudnessMeter:
+    """
+    ITU-R BS.1770-4 / EBU R128 integrated loudness and true peak of a multichannel PCM stream.
+    Samples are fed block by block in stream order (e.g. while the decoder output is written);
+    K-weighting runs as an FFT overlap-save convolution with the filter's impulse response and
+    true peak as a 4x polyphase interpolation, both vectorized and spread over a shared thread pool
+    by channel group (NumPy releases the GIL in FFTs and matrix products).
+    Energies are kept per 100 ms step at absolute sample positions, so meters of consecutive
+    parts of one stream (segmented decoding) merge into the measurement of the whole stream.
+    """
+
+    STEP_SECONDS = 0.1  # gating blocks are 4 steps (400 ms) overlapping by 75 %
+    BLOCK_STEPS = 4
+    ABSOLUTE_GATE = -70.0  # LKFS
+    RELATIVE_GATE = -10.0  # LU below the loudness of the absolute-gated blocks
+
+    # BS.1770-4 channel weights by position: LFE is excluded, side surrounds (60°-120° azimuth) get +1.5 dB
+    WEIGHTS: Dict[str, float] = {"LFE": 0.0, "Ls": 1.41, "Rs": 1.41, "Lw": 1.41, "Rw": 1.41}
+
+    TAPS = 2048  # K-weighting impulse response length, the filter has decayed below -80 dB by then
+    FFT_SIZE = 8192
+
+    # BS.1770-4 Annex 2: 4x oversampling interpolation filter, one row of 12 taps per phase
+    TRUE_PEAK_FILTER = (
+        (0.0017089843750, 0.0109863281250, -0.0196533203125, 0.0332031250000, -0.0594482421875, 0.1373291015625,
+         0.9721679687500, -0.1022949218750, 0.0476074218750, -0.0266113281250, 0.0148925781250, -0.0083007812500),
+        (-0.0291748046875, 0.0292968750000, -0.0517578125000, 0.0891113281250, -0.1665039062500, 0.4650878906250,
+         0.7797851562500, -0.2003173828125, 0.1015625000000, -0.0582275390625, 0.0330810546875, -0.0189208984375),
+        (-0.0189208984375, 0.0330810546875, -0.0582275390625, 0.1015625000000, -0.2003173828125, 0.7797851562500,
+         0.4650878906250, -0.1665039062500, 0.0891113281250, -0.0517578125000, 0.0292968750000, -0.0291748046875),
+        (-0.0083007812500, 0.0148925781250, -0.0266113281250, 0.0476074218750, -0.1022949218750, 0.9721679687500,
+         0.1373291015625, -0.0594482421875, 0.0332031250000, -0.0196533203125, 0.0109863281250, 0.0017089843750),
+    )
+    TRUE_PEAK_CHUNK = 1 << 16  # frames interpolated at once per channel
+
+    # Process-wide worker threads shared by all meters
+    _pool: Optional["futures.ThreadPoolExecutor"] = None
+    _pool_lock = threading.Lock()
+
+    def __init__(self,
+                 channels: List[str],
+                 frequency: int = 48000,
+                 source_format: str = RawFormat.F32LE,
+                 start: int = 0
+                 ) -> None:
+        """
+        Args:
+            channels: Channel names of the interleaved stream, in order (used for the BS.1770 weights)
+            frequency: Sample rate in Hz
+            source_format: RawFormat of the bytes passed to add_bytes
+            start: Sample position of the first measured frame within the whole stream
+        """
+        self.channels: List[str] = channels
+        self.frequency: int = frequency
+        self.source_format: str = source_format
+        self.frame_size: int = RawFormat.SIZES[source_format] * len(channels)
+        self.step: int = round(frequency * self.STEP_SECONDS)
+        self.position: int = start
+        jobs = max(1, min(len(channels), os.cpu_count() or 1))
+        self._groups: List[slice] = [slice(len(channels) * i // jobs, len(channels) * (i + 1) // jobs)
+                                     for i in range(jobs)]
+
+        self.peaks: "np.ndarray" = np.zeros(len(channels))
+        self._steps: List[Tuple[int, "np.ndarray"]] = []  # (first step index, (steps, channels) energy sums)
+        self._partial: bytes = b""
+        self._k_history: "np.ndarray" = np.zeros((len(channels), self.TAPS - 1), dtype=np.float32)
+        self._k_response: "np.ndarray" = np.fft.rfft(self._k_weighting(frequency, self.TAPS), self.FFT_SIZE)
+        taps = len(self.TRUE_PEAK_FILTER[0])
+        self._tp_history: "np.ndarray" = np.zeros((len(channels), taps - 1), dtype=np.float32)
+        # window (x[n-11] .. x[n]) @ matrix -> the 4 interpolated samples of x[n]
+        self._tp_matrix: "np.ndarray" = np.array(self.TRUE_PEAK_FILTER, dtype=np.float32)[:, ::-1].T.copy()
+
+    @staticmethod
+    def is_available() -> bool:
+        return np is not None
+
+    # ------------------------------------------------------------------ #
+    #                           Public Methods                           #
+    # ------------------------------------------------------------------ #
+    def add_bytes(self, data: bytes, measure: bool = True) -> None:
+        """
+        Feed interleaved samples in source_format; a trailing partial frame is kept for the next call.
+        With measure=False the samples only prime the filters (e.g. the decoder warm-up before start).
+        """
+        data = self._partial + bytes(data) if self._partial else data
+        usable = len(data) - len(data) % self.frame_size
+        self._partial = bytes(data[usable:])
+        if usable:
+            frames = np.frombuffer(data, dtype=np.uint8, count=usable).reshape(
+                -1, len(self.channels), RawFormat.SIZES[self.source_format])
+            self.add(ChannelSplitter.decode_samples(frames.transpose(1, 0, 2), self.source_format), measure)
+
+    def add(self, samples: "np.ndarray", measure: bool = True) -> None:
+        """Feed a (channels, frames) block of float samples."""
+        samples = np.asarray(samples, dtype=np.float32)
+        if not samples.shape[1]:
+            return
+        sums = list(self._executor().map(lambda group: self._add_group(samples, group, measure), self._groups))
+        if measure:
+            self._steps.append((self.position // self.step, np.concatenate(sums, axis=1)))
+            self.position += samples.shape[1]
+
+    def add_file(self, raw_file: Path, block_frames: int = ChannelSplitter.BLOCK_FRAMES) -> None:
+        """Measure a whole raw PCM file in source_format."""
+        with raw_file.open("rb") as f:
+            while chunk := f.read(block_frames * self.frame_size):
+                self.add_bytes(chunk)
+
+    def merge(self, other: "LoudnessMeter") -> None:
+        """Add the measurement of another part of the same stream."""
+        self._steps.extend(other._steps)
+        self.peaks = np.maximum(self.peaks, other.peaks)
+        self.position = max(self.position, other.position)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: 'integrated' loudness (LUFS) and 'true_peak' (dBTP) of the programme, and
+            'channels': {name: (integrated, true_peak)}; loudness is None if every block is gated out
+        """
+        count = self.position // self.step
+        energy = np.zeros((count, len(self.channels)))
+        for first, sums in self._steps:
+            sums = sums[:max(0, count - first)]
+            energy[first:first + len(sums)] += sums
+        # mean square of every 400 ms block, one block per 100 ms step
+        blocks = sum(energy[i:count - self.BLOCK_STEPS + 1 + i] for i in range(self.BLOCK_STEPS)) \
+            / (self.BLOCK_STEPS * self.step) if count >= self.BLOCK_STEPS else np.zeros((0, len(self.channels)))
+        weights = np.array([self.WEIGHTS.get(name, 1.0) for name in self.channels])
+        return {
+            "integrated": self._gated_loudness(blocks @ weights),
+            "true_peak": self._to_db(self.peaks.max()) if len(self.peaks) else None,
+            "channels": {name: (self._gated_loudness(blocks[:, index]), self._to_db(self.peaks[index]))
+                         for index, name in enumerate(self.channels)}
+        }
+
+    # ------------------------------------------------------------------ #
+    #                              Helpers                               #
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def _executor(cls) -> "futures.ThreadPoolExecutor":
+        with cls._pool_lock:
+            if cls._pool is None:
+                cls._pool = futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="loudness")
+        return cls._pool
+
+    def _add_group(self, samples: "np.ndarray", group: slice, measure: bool) -> Optional["np.ndarray"]:
+        """Filter and measure one channel group, returns its (steps, channels) energy sums if measuring."""
+        filtered = self._filter(samples[group], group)
+        if measure:
+            self._add_peaks(samples[group], group)
+        history = self._tp_history[group]
+        self._tp_history[group] = np.concatenate((history, samples[group]), axis=1)[:, -history.shape[1]:]
+        return self._step_sums(filtered) if measure else None
+
+    def _filter(self, samples: "np.ndarray", group: slice) -> "np.ndarray":
+        """K-weighted (channels, frames) block of a channel group, continuing its filter state."""
+        channels, frames = samples.shape
+        hop = self.FFT_SIZE - self.TAPS + 1
+        segments = -(-frames // hop)
+        padded = np.zeros((channels, self.TAPS - 1 + segments * hop), dtype=np.float32)
+        padded[:, :self.TAPS - 1] = self._k_history[group]
+        padded[:, self.TAPS - 1:self.TAPS - 1 + frames] = samples
+        self._k_history[group] = padded[:, frames:frames + self.TAPS - 1]
+
+        # overlap-save: every FFT_SIZE window yields hop valid output samples
+        windows = np.lib.stride_tricks.sliding_window_view(padded, self.FFT_SIZE, axis=1)[:, ::hop]
+        output = np.fft.irfft(np.fft.rfft(windows, axis=2) * self._k_response, self.FFT_SIZE, axis=2)
+        return output[:, :, self.TAPS - 1:].reshape(channels, -1)[:, :frames]
+
+    def _step_sums(self, filtered: "np.ndarray") -> "np.ndarray":
+        """(steps, channels) sums of the squared K-weighted samples per 100 ms step of the stream position."""
+        boundaries = np.arange(-self.position % self.step, filtered.shape[1], self.step)
+        starts = np.concatenate(([0], boundaries[boundaries > 0]))
+        return np.add.reduceat(np.square(filtered), starts, axis=1, dtype=np.float64).T
+
+    def _add_peaks(self, samples: "np.ndarray", group: slice) -> None:
+        """Update the true peaks of a channel group (4x oversampled, never below the sample peak)."""
+        extended = np.concatenate((self._tp_history[group], samples), axis=1)
+        taps = self._tp_matrix.shape[0]
+        for index, channel in enumerate(range(len(self.channels))[group]):
+            peak = float(np.abs(samples[index]).max())
+            for start in range(0, samples.shape[1], self.TRUE_PEAK_CHUNK):
+                windows = np.lib.stride_tricks.sliding_window_view(
+                    extended[index, start:start + self.TRUE_PEAK_CHUNK + taps - 1], taps)
+                peak = max(peak, float(np.abs(windows @ self._tp_matrix).max()))
+            self.peaks[channel] = max(self.peaks[channel], peak)
+
+    @classmethod
+    def _gated_loudness(cls, blocks: "np.ndarray") -> Optional[float]:
+        """Integrated loudness of weighted block energies with the absolute and relative gates."""
+        with np.errstate(divide="ignore"):
+            loudness = -0.691 + 10 * np.log10(blocks)
+        gated = blocks[loudness > cls.ABSOLUTE_GATE]
+        if not len(gated):
+            return None
+        threshold = -0.691 + 10 * math.log10(gated.mean()) + cls.RELATIVE_GATE
+        gated = blocks[(loudness > cls.ABSOLUTE_GATE) & (loudness > threshold)]
+        return round(-0.691 + 10 * math.log10(gated.mean()), 2) if len(gated) else None
+
+    @staticmethod
+    def _to_db(peak: float) -> Optional[float]:
+        return round(20 * math.log10(peak), 2) if peak > 0 else None
+
+    @staticmethod
+    def _k_weighting(frequency: int, taps: int) -> "np.ndarray":
+        """
+        Impulse response of the BS.1770 K-weighting (high shelf + RLB high-pass) at any sample rate,
+        designed from the analog prototypes as libebur128 does (matches the 48 kHz coefficients of the standard).
+        """
+        k = math.tan(math.pi * 1681.974450955533 / frequency)
+        q = 0.7071752369554196
+        vh = 10 ** (3.999843853973347 / 20)
+        vb = vh ** 0.4996667741545416
+        a0 = 1 + k / q + k * k
+        shelf = ((vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0), \
+            (2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0)
+        k = math.tan(math.pi * 38.13547087602444 / frequency)
+        q = 0.5003270373238773
+        a0 = 1 + k / q + k * k
+        highpass = (1.0, -2.0, 1.0), (2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0)
+
+        response = [1.0] + [0.0] * (taps - 1)
+        for (b0, b1, b2), (a1, a2) in (shelf, highpass):
+            x1 = x2 = y1 = y2 = 0.0
+            for n, x in enumerate(response):
+                y = b0 * x + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+                x1, x2, y1, y2 = x, x1, y, y1
+                response[n] = y
+        return np.array(response)
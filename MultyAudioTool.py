@@ -0,0 +1,30 @@
+import sys
+
+from AudioProcessor import AudioProcessor
+from BatchProcessor import BatchProcessor
+from InData import InData
+from JobSpec import JobSpec
+from WorkerDaemon import WorkerDaemon
+
+
+def main() -> int:
+    """
+    Command line entry point: a job server with --daemon, a batch of files with --batch,
+    otherwise the single -i file.
+    Returns:
+        int: Process exit code, 0 on success
+    """
+    config = InData(JobSpec.TOOLS)
+    if config.daemon:
+        return WorkerDaemon.from_config(config).serve()
+    if config.batch:
+        # --output names the output directory in batch mode
+        return BatchProcessor.from_config(config).run(BatchProcessor.collect_inputs(config.batch),
+                                                      config.output_file,
+                                                      **BatchProcessor.run_args(config))
+    job = JobSpec.from_config(config)
+    return int(AudioProcessor.from_job(job).run_job(job))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
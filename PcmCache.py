@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Union, Any
+
+from Utils import Utils
+
+
+class PcmCache:
+    """
+    Content-addressed cache of decoded .raw intermediates shared by all jobs.
+    Entries are keyed by a SHA-256 of the input file contents plus the decoder settings
+    (decoder, channel configuration id, presentation, sample format), so re-exports of the
+    same source with another gain, delay or channel selection reuse the decoded PCM.
+    Files are published with an atomic rename and indexed in SQLite (WAL), so several
+    processes can share the directory; the least recently used entries are evicted once
+    the total size exceeds max_bytes.
+    """
+
+    DEFAULT_MAX_BYTES = 100 * 1024 ** 3
+    STALE_SECONDS = 24 * 3600  # temporary files older than this are left over by crashed jobs
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Args:
+            cache_dir: Cache directory, defaults to pcm in the user cache directory
+            max_bytes: Size budget of the cached .raw files before LRU eviction
+        """
+        self.cache_dir: Path = Path(cache_dir) if cache_dir else Utils.IO.cache_dir() / "pcm"
+        self.max_bytes: int = max_bytes
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------ #
+    #                           Public Methods                           #
+    # ------------------------------------------------------------------ #
+    def key(self, input_file: Path, **decoder: Union[str, int, float, None]) -> Optional[str]:
+        """
+        Cache key of input_file decoded with the given settings, None if the file cannot be read.
+        The content digest is remembered per (path, size, mtime), so unchanged sources are hashed once.
+        """
+        try:
+            digest = self._digest(Path(input_file))
+        except (OSError, sqlite3.Error):
+            return None
+        return hashlib.sha256(json.dumps({"content": digest, **decoder}, sort_keys=True).encode()).hexdigest()
+
+    def restore(self, key: str, raw_file: Path) -> Optional[Dict[str, Any]]:
+        """
+        Place the cached PCM at raw_file (hard link, or a copy across file systems).
+        Returns:
+            dict: Completion marker stored with the entry, None if the entry is missing
+        """
+        try:
+            db = self._connect()
+            row = db.execute("SELECT size, info FROM pcm WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            entry = self._entry(key)
+            if not entry.is_file() or entry.stat().st_size != row[0]:
+                with db:
+                    db.execute("DELETE FROM pcm WHERE key = ?", (key,))
+                Utils.IO.delete_files(entry)
+                return None
+            self._place(entry, raw_file)
+            with db:
+                db.execute("UPDATE pcm SET last_used = ? WHERE key = ?", (time.time(), key))
+            return json.loads(row[1])
+        except (OSError, sqlite3.Error, ValueError):
+            # evicted by another process in between, or the cache is unusable: decode instead
+            return None
+
+    def put(self, key: str, raw_file: Path, info: Dict[str, Any]) -> None:
+        """Publish a complete raw_file under key and evict the oldest entries beyond the byte budget."""
+        try:
+            db = self._connect()
+            if db.execute("SELECT 1 FROM pcm WHERE key = ?", (key,)).fetchone() is None:
+                self._place(raw_file, self._entry(key))
+            with db:
+                db.execute("INSERT OR REPLACE INTO pcm (key, size, info, last_used) VALUES (?, ?, ?, ?)",
+                           (key, raw_file.stat().st_size, json.dumps(info), time.time()))
+            self._evict()
+        except (OSError, sqlite3.Error, TypeError, ValueError):
+            pass
+
+    # ------------------------------------------------------------------ #
+    #                              Helpers                               #
+    # ------------------------------------------------------------------ #
+    def _connect(self) -> sqlite3.Connection:
+        db: Optional[sqlite3.Connection] = getattr(self._local, "db", None)
+        if db is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.cache_dir / "index.sqlite"), timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS pcm (key TEXT PRIMARY KEY, size INTEGER, info TEXT, "
+                       "last_used REAL)")
+            db.execute("CREATE INDEX IF NOT EXISTS pcm_last_used ON pcm (last_used)")
+            db.execute("CREATE TABLE IF NOT EXISTS source (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+                       "digest TEXT)")
+            self._local.db = db
+        return db
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.raw"
+
+    def _digest(self, file: Path) -> str:
+        """SHA-256 of the file contents, memoized in the index while size and mtime are unchanged."""
+        file = file.absolute()
+        stat = file.stat()
+        db = self._connect()
+        row = db.execute("SELECT size, mtime_ns, digest FROM source WHERE path = ?", (str(file),)).fetchone()
+        if row is not None and tuple(row[:2]) == (stat.st_size, stat.st_mtime_ns):
+            return row[2]
+        sha = hashlib.sha256()
+        with file.open("rb") as f:
+            while chunk := f.read(1 << 24):
+                sha.update(chunk)
+        with db:
+            db.execute("INSERT OR REPLACE INTO source (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                       (str(file), stat.st_size, stat.st_mtime_ns, sha.hexdigest()))
+        return sha.hexdigest()
+
+    @staticmethod
+    def _place(source: Path, target: Path) -> None:
+        """Atomically make target a hard link to (or a copy of) source."""
+        temp_file = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            try:
+                os.link(source, temp_file)
+            except OSError:
+                shutil.copyfile(source, temp_file)
+            os.replace(temp_file, target)
+        finally:
+            Utils.IO.delete_files(temp_file)
+
+    def _evict(self) -> None:
+        """Drop the least recently used entries beyond max_bytes and temporary files of crashed jobs."""
+        db = self._connect()
+        total = 0
+        for key, size in db.execute("SELECT key, size FROM pcm ORDER BY last_used DESC").fetchall():
+            total += size or 0
+            if total <= self.max_bytes:
+                continue
+            try:
+                self._entry(key).unlink(missing_ok=True)
+            except OSError:
+                # still open by a job on Windows, retried by the next eviction
+                continue
+            with db:
+                db.execute("DELETE FROM pcm WHERE key = ?", (key,))
+        for temp_file in self.cache_dir.glob("*.tmp"):
+            try:
+                if time.time() - temp_file.stat().st_mtime > self.STALE_SECONDS:
+                    temp_file.unlink()
+            except OSError:
+                pass
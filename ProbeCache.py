@@ -0,0 +1,93 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Union, Tuple
+
+from Utils import Utils
+
+
+class ProbeCache:
+    """
+    Persistent SQLite cache of AudioInfo.as_dict() results.
+    Entries are keyed by absolute path and validated against file size, mtime and
+    a hash of the first bytes of the file, so a changed file is re-probed automatically.
+    The least recently used entries are evicted once max_entries is exceeded.
+    """
+
+    HEADER_BYTES = 4096
+    DEFAULT_MAX_ENTRIES = 50000
+
+    def __init__(self, db_file: Optional[Path] = None, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """
+        Args:
+            db_file: SQLite database file, defaults to probe.sqlite in the user cache directory
+            max_entries: Maximum number of cached files before LRU eviction
+        """
+        self.db_file: Path = Path(db_file) if db_file else Utils.IO.cache_dir() / "probe.sqlite"
+        self.max_entries: int = max_entries
+        # sqlite3 connections must not be shared between threads (batch probing uses a thread pool)
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------ #
+    #                           Public Methods                           #
+    # ------------------------------------------------------------------ #
+    def get(self, file: Path) -> Optional[Dict[str, Union[str, int, float, None]]]:
+        """Return cached metadata, or None if missing or the file has changed."""
+        result: Optional[Dict[str, Union[str, int, float, None]]] = None
+        try:
+            key = self._identity(file)
+            db = self._connect()
+            row = db.execute("SELECT size, mtime_ns, header_hash, info FROM probe WHERE path = ?",
+                             (key[0],)).fetchone()
+            if row is not None:
+                if tuple(row[:3]) == key[1:]:
+                    result = json.loads(row[3])
+                    with db:
+                        db.execute("UPDATE probe SET last_used = ? WHERE path = ?", (time.time(), key[0]))
+                else:
+                    with db:
+                        db.execute("DELETE FROM probe WHERE path = ?", (key[0],))
+        except (OSError, sqlite3.Error, ValueError):
+            pass
+        return result
+
+    def put(self, file: Path, info: Dict[str, Union[str, int, float, None]]) -> None:
+        """Store metadata for the current state of the file and evict the oldest entries if needed."""
+        try:
+            path, size, mtime_ns, header_hash = self._identity(file)
+            db = self._connect()
+            with db:
+                db.execute("INSERT OR REPLACE INTO probe (path, size, mtime_ns, header_hash, info, last_used) "
+                           "VALUES (?, ?, ?, ?, ?, ?)",
+                           (path, size, mtime_ns, header_hash, json.dumps(info), time.time()))
+                db.execute("DELETE FROM probe WHERE path IN (SELECT path FROM probe ORDER BY last_used DESC "
+                           "LIMIT -1 OFFSET ?)", (self.max_entries,))
+        except (OSError, sqlite3.Error, TypeError, ValueError):
+            pass
+
+    # ------------------------------------------------------------------ #
+    #                              Helpers                               #
+    # ------------------------------------------------------------------ #
+    def _connect(self) -> sqlite3.Connection:
+        db: Optional[sqlite3.Connection] = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(str(self.db_file), timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS probe ("
+                       "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, header_hash TEXT, "
+                       "info TEXT, last_used REAL)")
+            db.execute("CREATE INDEX IF NOT EXISTS probe_last_used ON probe (last_used)")
+            self._local.db = db
+        return db
+
+    def _identity(self, file: Path) -> Tuple[str, int, int, str]:
+        """(absolute path, size, mtime in ns, header hash) of the file."""
+        file = Path(file).absolute()
+        stat = file.stat()
+        with file.open("rb") as f:
+            header_hash = hashlib.blake2b(f.read(self.HEADER_BYTES), digest_size=16).hexdigest()
+        return str(file), stat.st_size, stat.st_mtime_ns, header_hash
@@ -0,0 +1,181 @@
+import json
+import sys
+import threading
+import time
+from typing import Optional, Dict, Tuple, TextIO
+
+from Utils import Utils
+
+
+class ProgressMode:
+    """How AudioProcessor shows stage progress without a progress callback."""
+    AUTO = "auto"  # bar on a terminal, plain lines otherwise
+    BAR = "bar"  # colored bar redrawn in place with carriage returns
+    PLAIN = "plain"  # one line per 10 % step, no escape codes
+    JSON = "json"  # one JSON object per line on stderr: event, stage, percent, seconds_passed, speed, eta
+    NONE = "none"
+
+    ALL = (AUTO, BAR, PLAIN, JSON, NONE)
+
+
+class ProgressRenderer:
+    """
+    Console output of stage progress.
+    Updates arrive far more often than anyone can read them (every FFmpeg progress block, every
+    decoded chunk), so each mode has its own pace: the bar is redrawn at most every BAR_INTERVAL,
+    plain lines at every PLAIN_STEP percent, JSON events at most every JSON_INTERVAL per stage;
+    a stage change and 100 % always come through. The colored bar cells are built once per renderer.
+    JSON events go to stderr by default, so a supervisor never has to sort them out of the console output.
+    Speed is audio seconds per wall second (x realtime), ETA the wall seconds left at that pace.
+    Thread safe, split workers report from their own threads.
+    """
+
+    BAR_WIDTH = 30
+    PERCENT_POS = 12  # bar cell where the percent label starts
+    BAR_INTERVAL = 0.1  # seconds
+    PLAIN_STEP = 10  # percent
+    JSON_INTERVAL = 1.0  # seconds
+
+    # cell status -> (foreground, label foreground, background, fill character)
+    BAR_FILL: Dict[str, Tuple[str, str, str, str]] = {
+        'done': ('lightyellow', 'lightyellow', 'blue', ' '),
+        'in_progress': ('black', 'black', 'yellow', '•'),
+        'undone': ('lightyellow', 'cyan', 'black', '•'),
+    }
+
+    def __init__(self, mode: str = ProgressMode.AUTO, stream: Optional[TextIO] = None,
+                 label: Optional[str] = None) -> None:
+        """
+        Args:
+            mode: ProgressMode, AUTO picks BAR if the stream is a terminal and PLAIN otherwise
+            stream: Output stream, by default sys.stdout (sys.stderr in JSON mode) at the time of each update,
+                so redirections apply
+            label: Name of the job in plain lines and JSON events (e.g. the input file name)
+        Raises:
+            ValueError: Unknown mode
+        """
+        if mode not in ProgressMode.ALL:
+            raise ValueError(f"Unknown progress mode: {mode}")
+        self.mode: str = mode
+        self.stream: Optional[TextIO] = stream
+        self.label: Optional[str] = label
+
+        self._lock = threading.Lock()
+        self._stage: Optional[str] = None
+        self._started: Dict[str, float] = {}
+        self._last_time: float = 0.0
+        self._last_percent: float = -1.0
+        self._cells: Dict[Tuple[str, str], str] = {}
+        self._bar: Tuple[int, str, str] = (-1, "", "")
+
+    def __call__(self, stage: str, percent_done: float, seconds_passed: Optional[float] = None) -> None:
+        """AudioProcessor progress callback signature, see update()."""
+        self.update(stage, percent_done, seconds_passed)
+
+    # ------------------------------------------------------------------ #
+    #                           Public Methods                           #
+    # ------------------------------------------------------------------ #
+    def update(self, stage: str, percent_done: float, seconds_passed: Optional[float] = None,
+               total_duration: Optional[float] = None, start_time: Optional[float] = None) -> None:
+        """
+        Take a progress update, output it if the mode's pace allows.
+        Args:
+            stage: Stage name (decode, split, ...)
+            percent_done: 0-100
+            seconds_passed: Audio seconds processed
+            total_duration: Audio seconds of the stage, shown by the bar
+            start_time: Start of the stage (time.time()), by default its first update (no speed on a single update)
+        """
+        if self.mode == ProgressMode.NONE:
+            return
+        percent_done = round(float(percent_done), 1)  # as shown, so 99.96 % counts as the final 100 %
+        with self._lock:
+            now = time.time()
+            started = self._started.setdefault(stage, start_time or now)
+            stream = self.stream or (sys.stderr if self.mode == ProgressMode.JSON else sys.stdout)
+            mode = self.mode if self.mode != ProgressMode.AUTO else self._auto_mode(stream)
+            if stage == self._stage and not self._is_due(mode, now, percent_done):
+                return
+            self._stage, self._last_time, self._last_percent = stage, now, percent_done
+
+            elapsed = now - started
+            speed = seconds_passed / elapsed if seconds_passed and elapsed > 0 else None
+            if percent_done >= 100:
+                eta = 0.0
+            else:
+                eta = elapsed * (100 - percent_done) / percent_done if percent_done > 0 else None
+            if mode == ProgressMode.BAR:
+                stream.write(f"{Utils.Format.to_human_time(elapsed)} >> {self._render_bar(percent_done)} "
+                             f"time={Utils.Format.to_human_time(seconds_passed)} "
+                             f"total={Utils.Format.to_human_time(total_duration)}\r")
+            elif mode == ProgressMode.PLAIN:
+                stream.write(f"{self.label + ' ' if self.label else ''}{stage} {percent_done:5.1f}%"
+                             f"{f' {speed:.1f}x' if speed else ''}"
+                             f"{f' eta {Utils.Format.to_human_time(eta)}' if eta is not None else ''}\n")
+            else:
+                stream.write(json.dumps({
+                    "event": "progress",
+                    **({"input": self.label} if self.label else {}),
+                    "stage": stage,
+                    "percent": percent_done,
+                    "seconds_passed": None if seconds_passed is None else round(seconds_passed, 3),
+                    "speed": None if speed is None else round(speed, 2),
+                    "eta": None if eta is None else round(eta, 1)
+                }) + "\n")
+            stream.flush()
+
+    # ------------------------------------------------------------------ #
+    #                              Helpers                               #
+    # ------------------------------------------------------------------ #
+    def _is_due(self, mode: str, now: float, percent_done: float) -> bool:
+        """True if an update of the current stage is to be output in mode."""
+        if percent_done >= 100:
+            return self._last_percent < 100
+        if mode == ProgressMode.JSON:
+            return now - self._last_time >= self.JSON_INTERVAL
+        if mode == ProgressMode.PLAIN:
+            return percent_done // self.PLAIN_STEP > self._last_percent // self.PLAIN_STEP
+        return now - self._last_time >= self.BAR_INTERVAL
+
+    @staticmethod
+    def _auto_mode(stream: TextIO) -> str:
+        """BAR on a terminal, PLAIN for pipes, files and captured output."""
+        try:
+            return ProgressMode.BAR if stream.isatty() else ProgressMode.PLAIN
+        except (AttributeError, ValueError):
+            return ProgressMode.PLAIN
+
+    def _render_bar(self, percent_done: float) -> str:
+        """
+        Colored bar with the percent label overlaid at PERCENT_POS.
+        Processed cells, the one being processed and the unprocessed ones get their own colors;
+        the line is only rebuilt when the filled length or the label changes.
+        """
+        filled_len = int(self.BAR_WIDTH * percent_done / 100)
+        undone_char = self.BAR_FILL['undone'][3]
+        percent_str = f"{percent_done:{undone_char}>5.1f}%"
+        if self._bar[:2] == (filled_len, percent_str):
+            return self._bar[2]
+
+        cells = []
+        for i in range(self.BAR_WIDTH):
+            if filled_len == self.BAR_WIDTH or i < filled_len - 1:
+                status = 'done'
+            elif i == filled_len - 1:
+                status = 'in_progress'
+            else:
+                status = 'undone'
+            char = self.BAR_FILL[status][3]
+            if 0 <= i - self.PERCENT_POS < len(percent_str) and percent_str[i - self.PERCENT_POS] != undone_char:
+                char = percent_str[i - self.PERCENT_POS]
+            cells.append(self._cell(status, char))
+        self._bar = (filled_len, percent_str, "".join(cells))
+        return self._bar[2]
+
+    def _cell(self, status: str, char: str) -> str:
+        """Colored bar cell, fill characters in their status color and label characters in its label color."""
+        if (status, char) not in self._cells:
+            fg, fg_label, bg, fill = self.BAR_FILL[status]
+            self._cells[(status, char)] = Utils.Format.colorize(char, color=fg if char == fill else fg_label,
+                                                                bg_color=bg)
+        return self._cells[(status, char)]
@@ -0,0 +1,83 @@
+import contextlib
+import json
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Union, Any, Iterator
+
+
+class RunReport:
+    """
+    Per-stage instrumentation of one AudioProcessor run.
+    Every stage records wall time, CPU time of this process (the native splitter runs in-process),
+    bytes in / out, audio seconds and the x-realtime factor, plus CPU time and peak RSS of each
+    child process where the platform reports them.
+    """
+
+    def __init__(self, input_file: Path, output_file: Path) -> None:
+        self.input_file: Path = input_file
+        self.output_file: Path = output_file
+        self.stages: List[Dict[str, Any]] = []
+        self.current: Optional[Dict[str, Any]] = None
+        self.started: float = time.time()
+
+    @contextlib.contextmanager
+    def stage(self, name: str, **fields) -> Iterator[Dict[str, Any]]:
+        """Time a stage; the yielded record can be updated with bytes_in / bytes_out / audio_seconds."""
+        record: Dict[str, Any] = {"stage": name, "wall_seconds": None, "cpu_seconds": None, "bytes_in": None,
+                                  "bytes_out": None, "audio_seconds": None, "x_realtime": None, "children": {},
+                                  **fields}
+        previous, self.current = self.current, record
+        start, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] = round(time.perf_counter() - start, 6)
+            record["cpu_seconds"] = round(time.process_time() - start_cpu, 6)
+            if record["audio_seconds"] and record["wall_seconds"]:
+                record["x_realtime"] = round(record["audio_seconds"] / record["wall_seconds"], 3)
+            self.current = previous
+            self.stages.append(record)
+
+    def child(self, name: str, usage: Optional[Dict[str, float]]) -> None:
+        """Attach the resource usage of a child process to the current stage."""
+        if self.current is not None:
+            self.current["children"][name] = usage
+
+    def note(self, **fields) -> None:
+        """Record further fields (e.g. a child's throughput) on the current stage."""
+        if self.current is not None:
+            self.current.update(fields)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "input_file": str(self.input_file),
+            "output_file": str(self.output_file),
+            "started": self.started,
+            "wall_seconds": round(sum(s["wall_seconds"] or 0 for s in self.stages), 6),
+            "stages": self.stages
+        }
+
+    def save(self, file: Optional[Path] = None) -> Optional[Path]:
+        """Write the report as JSON, by default next to the outputs as <output>.report.json."""
+        file = file or self.output_file.with_suffix(".report.json")
+        try:
+            file.write_text(json.dumps(self.as_dict(), indent=2), encoding="utf-8")
+        except OSError:
+            return None
+        return file
+
+    @staticmethod
+    def size(files: Union[Path, List[Path], None]) -> Optional[int]:
+        """Total size of existing files, None if there are none."""
+        files = [files] if isinstance(files, Path) else files or []
+        sizes = [f.stat().st_size for f in files if f.is_file()]
+        return sum(sizes) if sizes else None
+
+
+class RunResult(int):
+    """Return code of AudioProcessor.run, carrying the RunReport of the run as .report."""
+
+    def __new__(cls, code: int, report: Optional[RunReport] = None) -> "RunResult":
+        result = super().__new__(cls, code)
+        result.report = report
+        return result
@@ -0,0 +1,227 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Union, Any, Tuple
+
+from Utils import Utils
+
+
+class ToolRegistry:
+    """
+    Resolves external binaries (gst-launch, sox, ffmpeg, mediainfo, eac3to) once per process.
+    For every tool the resolved path, version string and capabilities (GStreamer elements,
+    SoX effects, FFmpeg filters / encoders) are recorded and persisted to a small JSON cache,
+    invalidated when the binary's size or mtime changes (for GStreamer also gst-inspect and the
+    gst-plugins directory), so repeated runs spawn nothing. Inconclusive probes are not persisted.
+    """
+
+    CACHE_VERSION = 3
+
+    # GStreamer elements used by the decode pipelines
+    GST_ELEMENTS = ("dlbtruehdparse", "dlbac3parse", "dlbaudiodecbin", "audioconvert", "fdsink", "filesink")
+
+    # Process-wide registry: requested path -> resolved tool (None if missing)
+    _tools: Dict[str, Optional["ToolRegistry.Tool"]] = {}
+    _lock = threading.Lock()
+    _cache_file: Optional[Path] = None
+
+    class Tool:
+        """A resolved external binary."""
+
+        def __init__(self,
+                     path: Path,
+                     kind: str,
+                     version: Optional[str] = None,
+                     capabilities: Optional[Dict[str, List[str]]] = None
+                     ) -> None:
+            self.path: Path = path
+            self.kind: str = kind
+            self.version: Optional[str] = version
+            self.capabilities: Dict[str, List[str]] = capabilities or {}
+
+        def has(self, group: str, name: str) -> Optional[bool]:
+            """True / False if the capability group was probed, None if it is unknown."""
+            return name in self.capabilities[group] if group in self.capabilities else None
+
+    # ------------------------------------------------------------------ #
+    #                           Public Methods                           #
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def resolve(cls, bin_file: Union[str, Path, None]) -> Optional["ToolRegistry.Tool"]:
+        """Resolve a binary (absolute path or PATH lookup), probing it only if it is not cached yet."""
+        if not bin_file:
+            return None
+        key = str(bin_file)
+        with cls._lock:
+            if key not in cls._tools:
+                cls._tools[key] = cls._resolve(Path(bin_file))
+            return cls._tools[key]
+
+    @classmethod
+    def exists(cls, bin_file: Union[str, Path, None]) -> bool:
+        return cls.resolve(bin_file) is not None
+
+    @classmethod
+    def has(cls, bin_file: Union[str, Path, None], group: str, name: str) -> Optional[bool]:
+        """
+        Whether a resolved tool has a capability, e.g. has(gst, "elements", "dlbtruehdparse").
+        None if the tool is missing or the capability group could not be probed.
+        """
+        tool = cls.resolve(bin_file)
+        return tool.has(group, name) if tool else None
+
+    @classmethod
+    def set_cache_file(cls, cache_file: Optional[Path]) -> None:
+        """Use another cache file (default: tools.json in the user cache directory)."""
+        with cls._lock:
+            cls._cache_file = cache_file
+            cls._tools.clear()
+
+    # ------------------------------------------------------------------ #
+    #                              Helpers                               #
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def _resolve(cls, bin_file: Path) -> Optional["ToolRegistry.Tool"]:
+        if bin_file.is_file():
+            path = bin_file.absolute()
+        elif resolved := shutil.which(str(bin_file)):
+            path = Path(resolved).absolute()
+        else:
+            return None
+
+        try:
+            identity = cls._identity(path)
+        except OSError:
+            return None
+
+        cache = cls._load_cache()
+        entry = cache.get(str(path))
+        if entry and entry.get("identity") == identity:
+            return cls.Tool(path, entry.get("kind"), entry.get("version"), entry.get("capabilities"))
+
+        tool, conclusive = cls._probe(path)
+        if conclusive:
+            cache[str(path)] = {"identity": identity, "kind": tool.kind, "version": tool.version,
+                                "capabilities": tool.capabilities}
+            cls._save_cache(cache)
+        return tool
+
+    @classmethod
+    def _identity(cls, path: Path) -> List[int]:
+        """
+        Size and mtime of the binary. GStreamer elements also depend on gst-inspect and on the
+        gst-plugins directory next to gst-launch, whose mtime and newest entry are added.
+        Raises:
+            OSError: The binary cannot be stat'ed
+        """
+        stat = path.stat()
+        identity = [stat.st_size, stat.st_mtime_ns]
+        if cls._kind(path) == "gst":
+            for file in (cls._gst_inspect(path), path.parent / "gst-plugins"):
+                try:
+                    stat = file.stat()
+                    identity += [stat.st_size, stat.st_mtime_ns]
+                    if file.is_dir():
+                        identity.append(max((entry.stat().st_mtime_ns for entry in os.scandir(file)), default=0))
+                except OSError:
+                    identity += [-1, -1]
+        return identity
+
+    @staticmethod
+    def _kind(path: Path) -> str:
+        name = path.stem.lower()
+        return next((k for k in ("gst", "sox", "ffmpeg", "mediainfo", "eac3to") if name.startswith(k)), name)
+
+    @staticmethod
+    def _gst_inspect(path: Path) -> Path:
+        return path.with_name(path.name.replace("launch", "inspect"))
+
+    @classmethod
+    def _probe(cls, path: Path) -> Tuple["ToolRegistry.Tool", bool]:
+        """
+        Spawn the binary to read its version and capabilities.
+        Returns:
+            The tool, and False if a probe failed or timed out so that the result must not be cached
+        """
+        kind = cls._kind(path)
+        conclusive = True
+
+        version_args = {"ffmpeg": ["-hide_banner", "-version"], "mediainfo": ["--Version"], "eac3to": []}
+        output = cls._run([path, *version_args.get(kind, ["--version"])])
+        version = next((line.strip() for line in (output or "").splitlines() if line.strip()), None)
+
+        capabilities: Dict[str, List[str]] = {}
+        if kind == "gst":
+            # the Dolby plugins are loaded from gst-plugins next to gst-launch, as in the decode pipelines
+            inspect = cls._gst_inspect(path)
+            if inspect.is_file():
+                plugin_path = ["--gst-plugin-path", path.parent / "gst-plugins"]
+                exists = {element: cls._exists([inspect, *plugin_path, "--exists", element])
+                          for element in cls.GST_ELEMENTS}
+                if None in exists.values():
+                    conclusive = False
+                else:
+                    capabilities["elements"] = [element for element, found in exists.items() if found]
+        elif kind == "sox":
+            if (output := cls._run([path, "--help"])) and (match := re.search(r"^EFFECTS:(.*)$", output, re.M)):
+                capabilities["effects"] = match.group(1).split()
+        elif kind == "ffmpeg":
+            for group, option in (("filters", "-filters"), ("encoders", "-encoders")):
+                if (output := cls._run([path, "-hide_banner", option])) is not None:
+                    # ' ... channelmap        A->A       Remap audio channels.' / ' A....D flac   FLAC ...'
+                    capabilities[group] = [match.group(1) for match in
+                                           re.finditer(r"^\s*[A-Z.|]{3,6}\s+(\S+)\s", output, re.M)]
+        return cls.Tool(path, kind, version, capabilities), conclusive
+
+    @staticmethod
+    def _exists(command: List[Union[str, Path]]) -> Optional[bool]:
+        """gst-inspect --exists: True / False by its exit code (0 / 1), None if it failed otherwise or timed out."""
+        try:
+            process = subprocess.run([str(c) for c in command], capture_output=True, timeout=30)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return {0: True, 1: False}.get(process.returncode)
+
+    @staticmethod
+    def _run(command: List[Union[str, Path]]) -> Optional[str]:
+        """Combined output of a successful command, None on failure."""
+        try:
+            process = subprocess.run([str(c) for c in command], capture_output=True, text=True,
+                                     errors="replace", timeout=30)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        # eac3to without arguments prints its banner with a non-zero code
+        return process.stdout + process.stderr if process.returncode == 0 or not command[1:] else None
+
+    @classmethod
+    def _cache_path(cls) -> Path:
+        if cls._cache_file is None:
+            cls._cache_file = Utils.IO.cache_dir() / "tools.json"
+        return cls._cache_file
+
+    @classmethod
+    def _load_cache(cls) -> Dict[str, Any]:
+        try:
+            data = json.loads(cls._cache_path().read_text(encoding="utf-8"))
+            return data.get("tools", {}) if data.get("version") == cls.CACHE_VERSION else {}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    @classmethod
+    def _save_cache(cls, tools: Dict[str, Any]) -> None:
+        """Write atomically, concurrent batch workers may save at the same time."""
+        cache_file = cls._cache_path()
+        temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            temp_file.write_text(json.dumps({"version": cls.CACHE_VERSION, "tools": tools}, indent=1),
+                                 encoding="utf-8")
+            os.replace(temp_file, cache_file)
+        except OSError:
+            try:
+                temp_file.unlink()
+            except OSError:
+                pass
@@ -1,12 +1,14 @@
+import importlib.util
 import os
 import re
 import shutil
 import subprocess
 import sys
 import time
+import zlib
 from pathlib import Path
+from types import ModuleType
 from typing import Optional, List, Dict, Union, Any
-import ctypes
 
 
 # ------------------ Utilities ------------------
@@ -26,6 +28,42 @@ class Utils:
             Utils.Console.cprint(f'\n\n{process_name} interrupted.', 'red')
             return 1
 
+        @staticmethod
+        def wait(proc: subprocess.Popen) -> Optional[Dict[str, float]]:
+            """
+            Wait for a child process and return its resource usage
+            (cpu_user, cpu_system in seconds, peak_rss_mb) via os.wait4 where available (POSIX).
+            The child must not have been reaped by poll() / wait() before, otherwise None is returned.
+            """
+            usage = None
+            if proc.returncode is None and hasattr(os, "wait4"):
+                try:
+                    _, status, rusage = os.wait4(proc.pid, 0)
+                    proc.returncode = os.waitstatus_to_exitcode(status)
+                    usage = Utils.Proc._usage_dict(rusage)
+                except ChildProcessError:
+                    pass
+            proc.wait()
+            return usage
+
+        @staticmethod
+        def usage() -> Optional[Dict[str, float]]:
+            """Resource usage of the calling process itself, same fields as wait(); None where unavailable."""
+            try:
+                import resource
+            except ImportError:
+                return None
+            return Utils.Proc._usage_dict(resource.getrusage(resource.RUSAGE_SELF))
+
+        @staticmethod
+        def _usage_dict(rusage: Any) -> Dict[str, float]:
+            return {
+                "cpu_user": round(rusage.ru_utime, 3),
+                "cpu_system": round(rusage.ru_stime, 3),
+                # kilobytes on Linux, bytes on macOS
+                "peak_rss_mb": round(rusage.ru_maxrss / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+            }
+
     class Console:
         @staticmethod
         def cprint(text: Any, color: str = "default", bg_color: Optional[str] = None) -> None:
@@ -107,7 +145,7 @@ class Utils:
                 match = re.search(
                     r"^(?P<khz>\d{1,3}(?:\.\d{1,3})?)\s*k(?:hz)?|(?P<hz>\d{4,6})(?:\s*hz)?$",
                     value, re.IGNORECASE,
-                )
+                ) if value else None
                 if match:
                     value = int(float(match.group("khz")) * 1000) if match.group("khz") else int(match.group("hz"))
                 else:
@@ -133,9 +171,9 @@ class Utils:
             """Format seconds as HH:MM:SS.ms"""
             if seconds is None:
                 return 'None'
-            hh = seconds // 3600
-            mm = (seconds % 3600) // 60
-            ss = seconds % 60
+            hh = int(seconds // 3600)
+            mm = int((seconds % 3600) // 60)
+            ss = int(seconds % 60)
             ms = f".{int((seconds % 1) * 1000):03d}" if with_ms else ""
             return f"{hh:02d}:{mm:02d}:{ss:02d}{ms}"
 
@@ -264,7 +302,7 @@ class Utils:
             """Delete  files in a Windows-safe way, fallback to unlink if needed."""
             if isinstance(files, Path):
                 files = [files]
-            for file_path in files:
+            for file_path in files or []:
                 if file_path.exists():
                     try:
                         subprocess.run(
@@ -272,7 +310,7 @@ class Utils:
                             check=True,
                             shell=False
                         )
-                    except subprocess.CalledProcessError:
+                    except (subprocess.CalledProcessError, OSError):
                         try:
                             file_path.unlink()
                         except OSError as e:
@@ -359,6 +397,7 @@ class Utils:
             FILE_SHARE_DELETE = 0x00000004
             OPEN_EXISTING = 3
 
+            import ctypes  # Windows only, kept off the startup path
             access = GENERIC_WRITE if mode == "write" else DELETE
             share_mode = FILE_SHARE_READ | FILE_SHARE_WRITE | FILE_SHARE_DELETE
             handle = ctypes.windll.kernel32.CreateFileW(
@@ -402,6 +441,34 @@ class Utils:
 
             return locked
 
+        @staticmethod
+        def cache_dir() -> Path:
+            """
+            Return the per-user cache directory of the tool (created if missing):
+            %LOCALAPPDATA%\\MultyAudioTool on Windows, $XDG_CACHE_HOME/multyaudiotool elsewhere.
+            """
+            if os.name == 'nt':
+                base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local") / "MultyAudioTool"
+            else:
+                base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "multyaudiotool"
+            try:
+                base.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                pass
+            return base
+
+        @staticmethod
+        def crc32(file: Path, chunk_size: int = 1 << 24) -> Optional[int]:
+            """CRC-32 of the file contents read in chunks, None if it cannot be read."""
+            crc = 0
+            try:
+                with file.open("rb") as f:
+                    while chunk := f.read(chunk_size):
+                        crc = zlib.crc32(chunk, crc)
+            except OSError:
+                return None
+            return crc
+
         @staticmethod
         def absolute_self(source: Union[str, Path]) -> Path:
             """
@@ -416,65 +483,28 @@ class Utils:
                 source_path = source
             return source_path
 
-    # ----------------- uncategorized methods -----------------
-
-    @staticmethod
-    def update_progress_bar(start_time: float,
-                            percent_done: float,
-                            seconds_passed: Optional[float] = None,
-                            total_duration: Optional[float] = None) -> None:
-        """
-        Update and print the progress bar with correct colors:
-        - Processed segment
-        - Processing segment
-        - Unprocessed segment
-        Percent is aligned at fixed position for stability.
-        """
-        BAR_WIDTH = 30
-        PERCENT_POS = 12
-
-        bar_fill = {
-            'done': {'fg': 'lightyellow', 'fg_label': 'lightyellow', 'bg': 'blue', 'char': ' '},
-            'in_progress': {'fg': 'black', 'fg_label': 'black', 'bg': 'yellow', 'char': '•'},
-            'undone': {'fg': 'lightyellow', 'fg_label': 'cyan', 'bg': 'black', 'char': '•'},
-        }
-
-        bar_chars = []
-        filled_len = int(BAR_WIDTH * percent_done / 100)
-
-        # Fixed position for percent text (0-indexed)
-        percent_str = "{0:{spec}}%".format(percent_done, spec=f"{bar_fill.get('undone').get('char')}>5.1f")
-        # percent_str = f"{percent_done:bar_fill.get('undone').get('bg')5.1f}% "
-
-        for i in range(BAR_WIDTH):
-            # Determine segment color
-            if filled_len == BAR_WIDTH:
-                status = 'done'
-            elif i < filled_len - 1:
-                status = 'done'
-            elif i == filled_len - 1:
-                status = 'in_progress'
-            else:
-                status = 'undone'
-
-            bg = bar_fill.get(status).get('bg')
-            char = bar_fill.get(status).get('char')
-            fg = bar_fill.get(status).get('fg')
-
-            # Overlay percent text if it falls at this position
-            idx_in_percent = i - PERCENT_POS
-            if 0 <= idx_in_percent < len(percent_str):
-                if bar_fill.get('undone').get('char') != percent_str[idx_in_percent]:
-                    char = percent_str[idx_in_percent]
-                    fg = bar_fill.get(status).get('fg_label')
-
-            bar_chars.append(Utils.Format.colorize(char, color=fg, bg_color=bg))
-
-        bar_line = f"{''.join(bar_chars)}"
-        elapsed_sec = time.time() - start_time
-        elapsed_fmt = Utils.Format.to_human_time(elapsed_sec)
-        current_fmt = Utils.Format.to_human_time(seconds_passed)
-        total_fmt = Utils.Format.to_human_time(total_duration)
-        sys.stdout.write(f"{elapsed_fmt} >> {bar_line} time={current_fmt} total={total_fmt}\r")
-        sys.stdout.flush()
-
+    class Import:
+        @staticmethod
+        def lazy(name: str) -> Optional[ModuleType]:
+            """
+            Module that is only executed on first attribute access, keeping heavy or rarely used
+            imports (NumPy, multiprocessing) off the startup path. None if it is not installed.
+            """
+            if (module := sys.modules.get(name)) is not None:
+                return module
+            try:
+                spec = importlib.util.find_spec(name)
+            except (ImportError, ValueError):
+                return None
+            if spec is None or spec.loader is None:
+                return None
+            loader = importlib.util.LazyLoader(spec.loader)
+            spec.loader = loader
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[name] = module
+            loader.exec_module(module)
+            parent, _, child = name.rpartition(".")
+            if parent:
+                # as the import system does, or 'import a.b' finds it in sys.modules but a.b stays unbound
+                setattr(importlib.import_module(parent), child, module)
+            return module
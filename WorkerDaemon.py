@@ -0,0 +1,224 @@
+import asyncio
+import itertools
+import json
+import os
+import signal
+import socket
+import stat
+import time
+import traceback
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable
+
+from AsyncAudioProcessor import AsyncAudioProcessor
+from InData import InData
+from JobSpec import JobSpec
+from ToolRegistry import ToolRegistry
+from Utils import Utils
+
+
+class WorkerDaemon:
+    """
+    Long-running job server on a local Unix socket.
+    The interpreter, resolved tools (GStreamer registry included), probe / PCM caches and
+    AudioProcessor instances stay warm between jobs, so a job only pays for its own audio.
+    Protocol, one JSON object per line in both directions:
+        request:  {"id": <any, optional>, "args": ["-i", "in.eac3", "-o", "out.wav", ...]}
+        events:   {"id": ..., "event": "queued" | "started" | "progress" | "finished" | "error", ...}
+    A job takes the options of the command line (tool paths and caches default to the daemon's),
+    jobs run with AsyncAudioProcessor on one event loop, at most `jobs` at a time, and their decode /
+    encode stages are limited across jobs as in BatchProcessor.
+    """
+
+    PROGRESS_STEP = 1.0  # percent between two progress events of the same stage
+
+    def __init__(self,
+                 socket_path: Path,
+                 base_args: Optional[List[str]] = None,
+                 jobs: int = 1,
+                 decode_jobs: int = 1,
+                 encode_jobs: int = 1
+                 ) -> None:
+        """
+        Args:
+            socket_path: Unix socket to listen on, replaced if a stale one exists
+            base_args: Command line options put in front of every job's own (e.g. tool paths)
+            jobs: Jobs run concurrently, the others wait in the queue
+            decode_jobs: Maximum concurrent GStreamer decodes
+            encode_jobs: Maximum concurrent split/encode stages
+        """
+        self.socket_path: Path = Path(socket_path)
+        self.base_args: List[str] = base_args or []
+        self.jobs: int = jobs
+        self.decode_jobs: int = decode_jobs
+        self.encode_jobs: int = encode_jobs
+
+        self._processors: Dict[tuple, AsyncAudioProcessor] = {}
+        self._ids: Any = itertools.count(1)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._gates: Dict[str, asyncio.Semaphore] = {}
+
+    @classmethod
+    def from_config(cls, config: Any) -> "WorkerDaemon":
+        """Build from the parsed InData configuration; jobs inherit its tool paths and caches."""
+        base_args = []
+        for name in config.BINS_REQ:
+            base_args.extend([f"--{name}_launch", str(getattr(config, f"{name}_launch"))])
+        base_args.extend(["--probe_cache", str(config.probe_cache or "")])
+        if config.pcm_cache:
+            base_args.extend(["--pcm_cache", str(config.pcm_cache), "--pcm_cache_size", str(config.pcm_cache_size)])
+        return cls(socket_path=config.daemon,
+                   base_args=base_args,
+                   jobs=config.daemon_jobs,
+                   decode_jobs=config.decode_jobs,
+                   encode_jobs=config.encode_jobs)
+
+    # ------------------------------------------------------------------ #
+    #                           Public Methods                           #
+    # ------------------------------------------------------------------ #
+    def serve(self) -> int:
+        """
+        Serve jobs until interrupted.
+        Returns:
+            int: 0 when stopped, 1 if the socket cannot be served
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            Utils.Console.cprint("\nDaemon mode needs Unix domain sockets.", 'red')
+            return 1
+        try:
+            asyncio.run(self._serve())
+        except KeyboardInterrupt:
+            Utils.Console.cprint('\n\nDaemon stopped.', 'green')
+        except OSError as e:
+            Utils.Console.cprint(f"\nDaemon failed on {self.socket_path}: {e}", 'red')
+            return 1
+        return 0
+
+    # ------------------------------------------------------------------ #
+    #                              Helpers                               #
+    # ------------------------------------------------------------------ #
+    async def _serve(self) -> None:
+        self._slots = asyncio.Semaphore(self.jobs)
+        self._gates = {"decode": asyncio.Semaphore(self.decode_jobs), "encode": asyncio.Semaphore(self.encode_jobs)}
+        await asyncio.to_thread(self._warm_up)
+
+        # a socket left behind by a killed daemon, never a regular file
+        if self.socket_path.exists() and stat.S_ISSOCK(self.socket_path.stat().st_mode):
+            self.socket_path.unlink()
+        server = await asyncio.start_unix_server(self._handle_client, path=str(self.socket_path))
+        # SIGTERM (service managers) stops like Ctrl+C, the socket file is removed either way
+        stopped = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+        try:
+            os.chmod(self.socket_path, 0o600)
+            Utils.Console.cprint(f"\nDaemon listening on {self.socket_path} (jobs={self.jobs} "
+                                 f"decode_jobs={self.decode_jobs} encode_jobs={self.encode_jobs})\n", 'green')
+            async with server:
+                await stopped.wait()
+            Utils.Console.cprint('\n\nDaemon stopped.', 'green')
+        finally:
+            Utils.IO.delete_files(self.socket_path)
+
+    def _warm_up(self) -> None:
+        """Resolve the tools and open the caches of the default job configuration once, before the first job."""
+        try:
+            # never run, the job only carries the default tools, channels and caches
+            job = JobSpec.from_args([*self.base_args, "-i", os.devnull])
+        except ValueError as e:
+            Utils.Console.cprint(f"Warning. Daemon options are invalid: {e}", 'blue')
+            return
+        for path in job.tools.values():
+            ToolRegistry.resolve(path)
+        self._processor(job)
+
+    def _processor(self, job: JobSpec) -> AsyncAudioProcessor:
+        """AsyncAudioProcessor of a job, shared by all jobs with the same tools, channels and caches."""
+        key = job.processor_key()
+        if key not in self._processors:
+            self._processors[key] = AsyncAudioProcessor.from_job(job)
+        return self._processors[key]
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Accept jobs from one connection and stream their events back until all of them have finished."""
+        events: asyncio.Queue = asyncio.Queue()
+        sender = asyncio.create_task(self._send_events(events, writer))
+        jobs = []
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    args = request["args"]
+                    if not isinstance(args, list):
+                        raise TypeError("'args' must be a list of command line options")
+                except (ValueError, KeyError, TypeError) as e:
+                    events.put_nowait({"id": None, "event": "error", "message": f"Invalid request: {e}"})
+                    continue
+                job_id = request.get("id", next(self._ids))
+                jobs.append(asyncio.create_task(self._run_job(job_id, [str(arg) for arg in args], events.put_nowait)))
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        # a client that stops sending still gets the events of its jobs
+        await asyncio.gather(*jobs)
+        events.put_nowait(None)
+        await sender
+
+    @staticmethod
+    async def _send_events(events: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        """Write queued events as JSON lines; once the client is gone they are dropped."""
+        connected = True
+        while (event := await events.get()) is not None:
+            if not connected:
+                continue
+            try:
+                writer.write((json.dumps(event, default=str) + "\n").encode())
+                await writer.drain()
+            except (ConnectionError, OSError):
+                connected = False
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    async def _run_job(self, job_id: Any, argv: List[str], emit: Callable[[Dict[str, Any]], None]) -> None:
+        try:
+            config = InData.parse_job([*self.base_args, *argv], bins_req=JobSpec.TOOLS)
+            if config.input_file is None or config.batch or config.daemon:
+                raise ValueError("a job needs -i/--input and no -batch / -daemon")
+            job = JobSpec.from_config(config)
+        except ValueError as e:
+            emit({"id": job_id, "event": "error", "message": str(e)})
+            return
+
+        emit({"id": job_id, "event": "queued"})
+        async with self._slots:
+            emit({"id": job_id, "event": "started", "input": job.input_file})
+            start_time = time.time()
+            try:
+                result = await self._processor(job).run_job(job, stage_gates=self._gates,
+                                                            progress=self._progress_emitter(job_id, emit))
+            except Exception as e:  # one broken job must not stop the daemon
+                Utils.Console.cprint(traceback.format_exc(), 'darkgray')
+                emit({"id": job_id, "event": "finished", "code": 1, "message": f"{type(e).__name__}: {e}",
+                      "elapsed": round(time.time() - start_time, 3)})
+                return
+            emit({"id": job_id, "event": "finished", "code": int(result),
+                  "elapsed": round(time.time() - start_time, 3), "report": result.report.as_dict()})
+
+    def _progress_emitter(self, job_id: Any, emit: Callable[[Dict[str, Any]], None]
+                          ) -> Callable[[str, float, Optional[float]], None]:
+        """Progress callback of a job, thread safe (split workers report from threads) and throttled per stage."""
+        loop = asyncio.get_running_loop()
+        last: Dict[str, float] = {}
+
+        def _progress(stage: str, percent_done: float, seconds_passed: Optional[float]) -> None:
+            percent_done = round(float(percent_done), 1)  # as sent, so 99.96 % counts as the final 100 %
+            if stage in last and (last[stage] >= 100
+                                  or percent_done < 100 and percent_done - last[stage] < self.PROGRESS_STEP):
+                return
+            last[stage] = percent_done
+            loop.call_soon_threadsafe(emit, {"id": job_id, "event": "progress", "stage": stage,
+                                             "percent": percent_done, "seconds": seconds_passed})
+        return _progress
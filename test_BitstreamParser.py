@@ -0,0 +1,125 @@
+"""Native stream header parsers on hand-packed AC-3 / E-AC-3, TrueHD and DTS frames."""
+import random
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from AudioInfo import AudioInfo, AudioFormat
+from BitstreamParser import BitstreamParser
+
+
+def _pack(*fields: Tuple[int, int], size: int) -> bytes:
+    """MSB-first bit fields (value, width), zero padded to size bytes."""
+    value, width = 0, 0
+    for field, bits in fields:
+        value = value << bits | field & ((1 << bits) - 1)
+        width += bits
+    data = (value << (-width % 8)).to_bytes((width + 7) // 8, "big")
+    return data + bytes(size - len(data))
+
+
+# AC-3 448 kbps 5.1 48 kHz, dialnorm 27: 1792 bytes and 1536 samples per frame
+AC3_FRAME = _pack((0x0B77, 16), (0, 16), (0, 2), (30, 6), (8, 5), (0, 3), (7, 3), (0, 2), (0, 2), (1, 1),
+                  (27, 5), size=1792)
+
+# E-AC-3 independent substream 5.1 48 kHz, 6 blocks (1536 samples), dialnorm 24, 768 bytes
+EAC3_FRAME = _pack((0x0B77, 16), (0, 2), (0, 3), (383, 11), (0, 2), (3, 2), (7, 3), (1, 1), (16, 5), (24, 5),
+                   (0, 1), size=768)
+# dependent substream adding the rear surround pair (chanmap location 6), 256 bytes
+EAC3_DEPENDENT = _pack((0x0B77, 16), (1, 2), (0, 3), (127, 11), (0, 2), (3, 2), (2, 3), (0, 1), (16, 5), (24, 5),
+                       (0, 1), (1, 1), (0x8000 >> 6, 16), size=256)
+
+# TrueHD 48 kHz, 3 substreams, 7.1 (6ch presentation 5.1), dialnorm 27; 40-byte access units of 40 samples
+THD_MAJOR = _pack((0x0014, 16), (0, 16), (0xF8726FBA, 32), (0, 4), (0, 4), (0, 2), (0, 2), (0b01111, 5),
+                  (0, 2), (0b0000001001111, 13), (0xB752, 16), (0, 48), (3, 4), (0, 4), (0, 8),
+                  (0, 17), (20, 6), (0, 6), (25, 5), (0, 11), (27, 5), size=40)
+THD_MINOR = _pack((0x0014, 16), size=40)
+
+# DTS core 5.1 48 kHz, 512 samples per 2013-byte frame (1509 kbps), version 7 dialnorm 4
+DTS_FRAME = _pack((0x7FFE8001, 32), (1, 1), (31, 5), (0, 1), (15, 7), (2012, 14), (9, 6), (13, 4), (24, 5),
+                  (0, 10), (1, 2), (0, 2), (7, 4), (0, 7), (4, 4), size=2013)
+
+
+def _write(tmp_path: Path, name: str, frames: List[bytes], count: int, tail: bytes = b"") -> Path:
+    file = tmp_path / name
+    file.write_bytes(b"".join(frames) * count + tail)
+    return file
+
+
+def _audio_info(file: Path) -> AudioInfo:
+    priority = {AudioFormat.AC3: [AudioInfo.Parser.AC3], AudioFormat.TRUEHD: [AudioInfo.Parser.TRUEHD],
+                AudioFormat.DTS: [AudioInfo.Parser.DTS]}
+    return AudioInfo(parsers={}, parser_priority=priority).parse(file)
+
+
+def test_ac3(tmp_path):
+    info = _audio_info(_write(tmp_path, "a.ac3", [AC3_FRAME], 250))
+    assert (info.format, info.channels, info.bitrate, info.freq, info.dialnorm) == ("AC3", "5.1", 448, 48000, -27)
+    assert info.duration == pytest.approx(250 * 1536 / 48000)
+    assert info.parser_used == AudioInfo.Parser.AC3
+
+
+def test_eac3_with_dependent_substream(tmp_path):
+    info = _audio_info(_write(tmp_path, "a.eac3", [EAC3_FRAME, EAC3_DEPENDENT], 250))
+    assert (info.format, info.channels, info.freq, info.dialnorm) == ("EAC3", "7.1", 48000, -24)
+    assert info.duration == pytest.approx(250 * 1536 / 48000)
+    assert info.bitrate == round((768 + 256) * 8 / (1536 / 48000) / 1000)  # 256 kbps
+
+
+def test_truehd(tmp_path):
+    info = _audio_info(_write(tmp_path, "a.thd", [THD_MAJOR] + [THD_MINOR] * 127, 20))
+    assert (info.format, info.channels, info.freq, info.dialnorm, info.atmos) == ("THD", "7.1", 48000, -27, False)
+    assert info.duration == pytest.approx(20 * 128 * 40 / 48000)
+    assert info.bitrate == 384  # 40 bytes per 40 samples
+
+
+def test_truehd_atmos(tmp_path):
+    major = bytearray(THD_MAJOR)
+    major[4 + 16] = 4 << 4  # 4 substreams
+    major[4 + 17] = 0x80  # 16-channel presentation present
+    info = BitstreamParser.TrueHD.parse(_write(tmp_path, "a.thd", [bytes(major)] + [THD_MINOR] * 127, 4))
+    assert info["atmos"] is True
+
+
+def test_dts(tmp_path):
+    info = _audio_info(_write(tmp_path, "a.dts", [DTS_FRAME], 100))
+    assert (info.format, info.channels, info.bitrate, info.freq, info.dialnorm) == ("DTS", "5.1", 1509, 48000, -4)
+    assert info.duration == pytest.approx(100 * 512 / 48000)
+    assert info.core == "DTS, 5.1 channels, 1509kbps, 48kHz"
+
+
+@pytest.mark.parametrize("frames, count, samples, parser", [
+    ([AC3_FRAME], 40, 1536, BitstreamParser.AC3),
+    ([THD_MAJOR] + [THD_MINOR] * 127, 2, 40 * 128, BitstreamParser.TrueHD),
+    ([DTS_FRAME], 40, 512, BitstreamParser.DTS),
+])
+def test_truncated_stream_counts_complete_frames(tmp_path, frames, count, samples, parser):
+    """A stream cut inside a frame is parsed, the partial frame does not add to the duration."""
+    half = b"".join(frames)[:len(frames[0]) // 2]
+    info = parser.parse(_write(tmp_path, "cut", frames, count, tail=half))
+    assert info is not None
+    assert info["duration"] == pytest.approx(count * samples / 48000)
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\x0B\x77\x00",  # AC-3 sync, header cut short
+    AC3_FRAME[:4] + b"\x3F" + AC3_FRAME[5:],  # AC-3 sync, invalid frame size code
+    THD_MAJOR[:8] + bytes(10),  # TrueHD major sync, no room for its fields
+    DTS_FRAME[:4] + bytes(20),  # DTS sync, zero frame size
+], ids=["empty", "ac3_short", "ac3_frame_size", "truehd_short", "dts_frame_size"])
+def test_broken_headers(tmp_path, data):
+    file = tmp_path / "broken"
+    file.write_bytes(data)
+    for parser in (BitstreamParser.AC3, BitstreamParser.TrueHD, BitstreamParser.DTS):
+        assert parser.parse(file) is None
+
+
+def test_garbage(tmp_path):
+    file = tmp_path / "garbage.ac3"
+    file.write_bytes(random.Random(0).randbytes(64 * 1024))
+    for parser in (BitstreamParser.AC3, BitstreamParser.TrueHD, BitstreamParser.DTS):
+        assert parser.parse(file) is None
+    info = _audio_info(file)
+    assert info.format is None and info.error is not None
@@ -0,0 +1,47 @@
+"""BS.1770 loudness meter: reference tone level and merging of meters of consecutive stream parts."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ChannelSplitter import RawFormat  # noqa: E402
+from Loudness import LoudnessMeter  # noqa: E402
+
+FREQUENCY = 48000
+CHANNELS = ["L", "R"]
+
+
+def _tone(seconds: float = 10.0) -> bytes:
+    """Interleaved F32LE 997 Hz sine, full scale on L and -6 dB on R."""
+    sine = np.sin(2 * np.pi * 997 * np.arange(round(seconds * FREQUENCY)) / FREQUENCY)
+    return np.stack([sine, sine / 2]).T.astype("<f4").tobytes()
+
+
+def test_full_scale_997_hz_sine():
+    """BS.1770-4: a 0 dBFS 997 Hz sine in one channel reads -3.01 LKFS."""
+    meter = LoudnessMeter(CHANNELS, FREQUENCY)
+    meter.add_bytes(_tone())
+    result = meter.result()
+    assert result["channels"]["L"][0] == pytest.approx(-3.01, abs=0.01)
+    assert result["channels"]["R"][0] == pytest.approx(-9.03, abs=0.01)
+    assert result["integrated"] == pytest.approx(10 * np.log10(0.5 + 0.125), abs=0.01)
+    assert result["true_peak"] == pytest.approx(0.0, abs=0.1)
+
+
+@pytest.mark.parametrize("split_seconds", [5.0, 5.0 + 123 / FREQUENCY])
+def test_merged_halves_equal_single_meter(split_seconds):
+    """Meters of two halves, the second primed with the audio before it, merge into the whole measurement."""
+    data = _tone()
+    frame_size = RawFormat.SIZES[RawFormat.F32LE] * len(CHANNELS)
+    split = round(split_seconds * FREQUENCY)
+
+    whole = LoudnessMeter(CHANNELS, FREQUENCY)
+    whole.add_bytes(data)
+
+    first = LoudnessMeter(CHANNELS, FREQUENCY)
+    first.add_bytes(data[:split * frame_size])
+    second = LoudnessMeter(CHANNELS, FREQUENCY, start=split)
+    second.add_bytes(data[(split - FREQUENCY) * frame_size:split * frame_size], measure=False)
+    second.add_bytes(data[split * frame_size:])
+    first.merge(second)
+
+    assert first.result() == whole.result()